@@ -0,0 +1,99 @@
+# 📁 benchmarks/admission_benchmark.py
+# Goodput under overload, with and without admission control
+#
+# Simulates a dependency (LLM/SerpAPI) whose latency degrades once more than
+# CAPACITY calls run at once, and drives it open-loop at OVERLOAD x capacity.
+# A request only counts as goodput if it finishes before the client deadline.
+#
+# Run: python -m benchmarks.admission_benchmark
+
+import asyncio
+import random
+import statistics
+import time
+
+from src.core.admission import AdmissionController, Priority
+from src.exceptions import TravelAgentError
+
+
+CAPACITY = 8            # concurrent calls the dependency handles at full speed
+BASE_LATENCY = 0.2      # seconds per call when under capacity
+CLIENT_DEADLINE = 2.0   # clients give up after this many seconds
+OVERLOAD = 3.0          # arrival rate as a multiple of capacity
+DURATION = 10.0         # seconds of traffic
+
+
+class Dependency:
+    """Fake upstream whose latency grows linearly past its capacity."""
+
+    def __init__(self):
+        self.in_flight = 0
+
+    async def call(self) -> None:
+        self.in_flight += 1
+        try:
+            slowdown = max(1.0, self.in_flight / CAPACITY)
+            await asyncio.sleep(BASE_LATENCY * slowdown * random.uniform(0.8, 1.2))
+        finally:
+            self.in_flight -= 1
+
+
+async def run(controller: AdmissionController | None) -> dict:
+    dependency = Dependency()
+    ok_latencies: list[float] = []
+    shed = late = 0
+
+    async def request() -> None:
+        nonlocal shed, late
+        started = time.perf_counter()
+        try:
+            if controller is None:
+                await dependency.call()
+            else:
+                async with controller.admit(Priority.CHAT):
+                    await dependency.call()
+        except TravelAgentError:
+            shed += 1
+            return
+        latency = time.perf_counter() - started
+        if latency <= CLIENT_DEADLINE:
+            ok_latencies.append(latency)
+        else:
+            late += 1
+
+    rate = OVERLOAD * CAPACITY / BASE_LATENCY
+    tasks = []
+    end = time.perf_counter() + DURATION
+    while time.perf_counter() < end:
+        tasks.append(asyncio.create_task(request()))
+        await asyncio.sleep(random.expovariate(rate))
+    await asyncio.gather(*tasks)
+
+    ok_latencies.sort()
+    return {
+        "requests": len(tasks),
+        "goodput_per_s": round(len(ok_latencies) / DURATION, 1),
+        "shed": shed,
+        "late": late,
+        "p50_ms": round(statistics.median(ok_latencies) * 1000) if ok_latencies else None,
+        "p99_ms": round(ok_latencies[int(len(ok_latencies) * 0.99) - 1] * 1000) if ok_latencies else None,
+    }
+
+
+async def main() -> None:
+    random.seed(42)
+    print("without admission control:", await run(None))
+    controller = AdmissionController(
+        initial_limit=CAPACITY * 2,
+        min_limit=2,
+        max_limit=CAPACITY * 8,
+        max_queue=CAPACITY * 2,
+        queue_timeout=CLIENT_DEADLINE / 4,
+        latency_target=BASE_LATENCY * 2,
+    )
+    print("with admission control:   ", await run(controller))
+    print("final limit:", controller.limit)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,353 @@
+# 📁 benchmarks/microbench.py
+# Microbenchmarks for the CPU work done on every chat turn
+#
+# Each case is timed (best per-call time over several rounds) and its
+# allocations are measured with tracemalloc (peak bytes for one call).
+# Times are compared relative to a fixed calibration workload timed in the
+# same run, which cancels out some CPU frequency/load drift. Results are
+# compared to benchmarks/baselines/microbench.json; the run fails when a
+# case is slower or allocates more than the tolerance allows. Timings are
+# only enforced against a baseline recorded on the same kind of machine and
+# Python version, with a wide tolerance (shared runners vary by ±50%);
+# allocations are deterministic and are the precise gate everywhere.
+#
+# Fixtures: benchmarks/fixtures/*.json are full-size SerpAPI responses
+# (Delhi → Amsterdam flights, Amsterdam hotels). Worst cases scale them up.
+#
+# Run:            python -m benchmarks.microbench
+# Filter:         python -m benchmarks.microbench -k parse
+# New baseline:   python -m benchmarks.microbench --save-baseline
+
+import argparse
+import copy
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict
+from uuid import uuid4
+
+from src.agents.summarize_agent import build_summarize_prompt
+from src.agents.travel_agent import build_travel_agent_prompt
+from src.models.schema import ChatResponse
+from src.services.travel_service import build_agent_messages
+from src.tools.parsers import parse_all_hotels, parse_flight_response, parse_hotel_response, result_columns
+from src.tools.results_cache import SearchResults
+
+
+BENCH_DIR = Path(__file__).parent
+FIXTURES_DIR = BENCH_DIR / "fixtures"
+BASELINE_PATH = BENCH_DIR / "baselines" / "microbench.json"
+
+TIME_TOLERANCE = 1.00    # fail when >2x slower than baseline (shared CI runners are noisy)
+ALLOC_TOLERANCE = 0.10   # fail when >10% more bytes allocated than baseline
+MIN_ROUND_TIME = 0.1     # seconds per timing round
+ROUNDS = 9
+ALLOC_FLOOR = 1024       # allocation changes below this many bytes are ignored
+
+
+# ------------------------------------------------------------------
+# 📦 Fixtures
+# ------------------------------------------------------------------
+
+def load_fixture(name: str) -> Dict:
+    with open(FIXTURES_DIR / name, encoding="utf-8") as f:
+        return json.load(f)
+
+
+FLIGHTS = load_fixture("serpapi_flights_del_ams.json")
+HOTELS = load_fixture("serpapi_hotels_amsterdam.json")
+
+
+def worst_case_flights() -> Dict:
+    """No best_flights, 300 three-leg options with long extension lists."""
+    raw = copy.deepcopy(FLIGHTS)
+    options = raw.pop("other_flights") + raw.pop("best_flights")
+    for option in options:
+        option["flights"] = option["flights"] * 3
+        for leg in option["flights"]:
+            leg["extensions"] = leg["extensions"] * 10
+    raw["best_flights"] = []
+    raw["other_flights"] = (options * 10)[:300]
+    return raw
+
+
+def worst_case_hotels() -> Dict:
+    """300 properties with many images and missing rates."""
+    raw = copy.deepcopy(HOTELS)
+    properties = raw["properties"]
+    for hotel in properties:
+        hotel["images"] = hotel["images"] * 10
+        hotel.pop("total_rate", None)
+    raw["properties"] = (properties * 15)[:300]
+    return raw
+
+
+def ai_response(response_type: str, data: Any) -> str:
+    return json.dumps({"response_type": response_type, "data": data})
+
+
+FLIGHTS_ANSWER = ai_response("flights", parse_flight_response(FLIGHTS))
+HOTELS_ANSWER = ai_response("hotels", parse_hotel_response(HOTELS))
+
+
+def conversation(turns: int) -> list:
+    """Alternating user/AI messages; AI turns carry real tool results."""
+    messages = []
+    for i in range(turns):
+        messages.append({"role": "user", "content": f"Show me options for trip {i} from Delhi to Amsterdam in November for 2 adults"})
+        messages.append({"role": "ai", "content": FLIGHTS_ANSWER if i % 2 else HOTELS_ANSWER})
+    return messages
+
+
+LONG_SUMMARY = " ".join(
+    ["User plans a family trip from Delhi to Amsterdam in mid-November, prefers non-stop flights under ₹60,000 and 4-star hotels near the canals."] * 20
+)
+
+
+# ------------------------------------------------------------------
+# 🧪 Cases
+# ------------------------------------------------------------------
+
+CASES: Dict[str, Callable[[], Callable[[], Any]]] = {}
+
+
+def case(name: str):
+    """Register a case; the decorated setup returns the zero-arg callable to measure."""
+    def register(setup: Callable[[], Callable[[], Any]]):
+        CASES[name] = setup
+        return setup
+    return register
+
+
+@case("parse_flight_response.realistic")
+def _():
+    return lambda: parse_flight_response(FLIGHTS)
+
+
+@case("parse_flight_response.worst")
+def _():
+    raw = worst_case_flights()
+    return lambda: parse_flight_response(raw)
+
+
+@case("parse_hotel_response.realistic")
+def _():
+    return lambda: parse_hotel_response(HOTELS)
+
+
+@case("parse_hotel_response.worst")
+def _():
+    raw = worst_case_hotels()
+    return lambda: parse_hotel_response(raw)
+
+
+@case("build_travel_agent_prompt.no_summary")
+def _():
+    messages = build_agent_messages("Find flights from Delhi to Amsterdam")
+    return lambda: build_travel_agent_prompt("", messages)
+
+
+@case("build_travel_agent_prompt.long_summary")
+def _():
+    messages = build_agent_messages("Any cheaper flights?", conversation(10))
+    return lambda: build_travel_agent_prompt(LONG_SUMMARY, messages)
+
+
+@case("build_summarize_prompt.20_messages")
+def _():
+    messages = conversation(10)
+    return lambda: build_summarize_prompt(LONG_SUMMARY, messages)
+
+
+@case("build_summarize_prompt.400_messages")
+def _():
+    messages = conversation(200)
+    return lambda: build_summarize_prompt(LONG_SUMMARY, messages)
+
+
+@case("build_agent_messages.20_messages")
+def _():
+    messages = conversation(10)
+    return lambda: build_agent_messages("Any cheaper flights?", messages)
+
+
+@case("build_agent_messages.400_messages")
+def _():
+    messages = conversation(200)
+    return lambda: build_agent_messages("Any cheaper flights?", messages)
+
+
+@case("json_loads.ai_flights_response")
+def _():
+    return lambda: json.loads(FLIGHTS_ANSWER)
+
+
+@case("json_loads.ai_hotels_response")
+def _():
+    return lambda: json.loads(HOTELS_ANSWER)
+
+
+@case("chat_response.serialize_flights")
+def _():
+    payload = {"response": json.loads(FLIGHTS_ANSWER), "session_id": uuid4()}
+    return lambda: ChatResponse(**payload).model_dump_json()
+
+
+@case("chat_response.serialize_hotels")
+def _():
+    payload = {"response": json.loads(HOTELS_ANSWER), "session_id": uuid4()}
+    return lambda: ChatResponse(**payload).model_dump_json()
+
+
+@case("refine.hotels_300")
+def _():
+    items = parse_all_hotels(worst_case_hotels())
+    for i, hotel in enumerate(items):
+        hotel["rate_per_night"] = f"₹{8000 + i * 97 % 20000:,}"
+    results = SearchResults("hotels", {}, items, shown=5, columns=result_columns("hotels", items))
+    return lambda: results.select({"price": 15000.0}, {"hotel_class": 4.0}, "rating", descending=True)
+
+
+# ------------------------------------------------------------------
+# ⏱️ Measurement
+# ------------------------------------------------------------------
+
+def measure_time(func: Callable[[], Any]) -> float:
+    """Best per-call time in nanoseconds over ROUNDS rounds."""
+    func()  # warm caches
+    calls = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(calls):
+            func()
+        if time.perf_counter() - started >= MIN_ROUND_TIME / 5:
+            break
+        calls *= 2
+    calls = max(1, int(calls * MIN_ROUND_TIME / max(time.perf_counter() - started, 1e-9)))
+
+    best = float("inf")
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(ROUNDS):
+            started = time.perf_counter_ns()
+            for _ in range(calls):
+                func()
+            best = min(best, (time.perf_counter_ns() - started) / calls)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return best
+
+
+def measure_allocations(func: Callable[[], Any]) -> int:
+    """Peak bytes allocated during one call (best of 3)."""
+    func()
+    best = None
+    tracemalloc.start()
+    try:
+        for _ in range(3):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            result = func()
+            _, peak = tracemalloc.get_traced_memory()
+            del result
+            best = peak - before if best is None else min(best, peak - before)
+    finally:
+        tracemalloc.stop()
+    return best
+
+
+def _calibration_workload() -> int:
+    """Fixed mix of dict, string and list work, similar to the cases."""
+    data = {f"key{i}": i for i in range(200)}
+    text = "".join(f"{key}={value};" for key, value in data.items())
+    return len(sorted(text.split(";")))
+
+
+def calibrate() -> float:
+    """Per-call time of the calibration workload in nanoseconds."""
+    return measure_time(_calibration_workload)
+
+
+def machine_id() -> str:
+    return f"{platform.system()}-{platform.machine()}|{os.cpu_count()} cpus|{platform.python_implementation()} {platform.python_version()}"
+
+
+def run(selected: Dict[str, Callable]) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for name, setup in selected.items():
+        func = setup()
+        ns_per_op = measure_time(func)
+        results[name] = {
+            "ns_per_op": round(ns_per_op, 1),
+            # Re-calibrate around every case so drift during the run cancels out
+            "relative": round(ns_per_op / min(calibrate(), calibrate()), 4),
+            "alloc_bytes": measure_allocations(func),
+        }
+    return results
+
+
+def compare(results: Dict, baseline: Dict, time_tolerance: float, alloc_tolerance: float) -> list:
+    """Print a comparison table and return the list of regressions."""
+    enforce_time = baseline.get("machine") == machine_id()
+    if not enforce_time:
+        print(f"note: baseline recorded on {baseline.get('machine')}; timings are informational only\n")
+
+    regressions = []
+    print(f"{'case':<48} {'µs/op':>10} {'Δtime':>8} {'KiB':>9} {'Δalloc':>8}")
+    for name, result in results.items():
+        base = baseline.get("cases", {}).get(name)
+        time_delta = alloc_delta = None
+        if base and "relative" in base:
+            time_delta = result["relative"] / base["relative"] - 1
+            alloc_delta = (result["alloc_bytes"] - base["alloc_bytes"]) / max(base["alloc_bytes"], ALLOC_FLOOR)
+            if enforce_time and time_delta > time_tolerance:
+                regressions.append(f"{name}: {time_delta:+.0%} time")
+            if alloc_delta > alloc_tolerance:
+                regressions.append(f"{name}: {alloc_delta:+.0%} allocations")
+        print(
+            f"{name:<48} {result['ns_per_op'] / 1000:>10.2f} "
+            f"{'new' if time_delta is None else f'{time_delta:+.0%}':>8} "
+            f"{result['alloc_bytes'] / 1024:>9.1f} "
+            f"{'new' if alloc_delta is None else f'{alloc_delta:+.0%}':>8}"
+        )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Hot-path microbenchmarks")
+    parser.add_argument("-k", dest="keyword", default="", help="Only run cases containing this text")
+    parser.add_argument("--save-baseline", action="store_true", help="Store results as the new baseline")
+    parser.add_argument("--time-tolerance", type=float, default=TIME_TOLERANCE)
+    parser.add_argument("--alloc-tolerance", type=float, default=ALLOC_TOLERANCE)
+    args = parser.parse_args()
+
+    selected = {name: setup for name, setup in CASES.items() if args.keyword in name}
+    results = run(selected)
+
+    baseline = {}
+    if BASELINE_PATH.exists():
+        baseline = json.loads(BASELINE_PATH.read_text())
+
+    regressions = compare(results, baseline, args.time_tolerance, args.alloc_tolerance)
+
+    if args.save_baseline:
+        cases = {**baseline.get("cases", {}), **results} if args.keyword else results
+        BASELINE_PATH.parent.mkdir(exist_ok=True)
+        BASELINE_PATH.write_text(json.dumps({"machine": machine_id(), "cases": cases}, indent=2) + "\n")
+        print(f"\nBaseline saved to {BASELINE_PATH}")
+        return
+
+    if regressions:
+        print("\nRegressions:\n  " + "\n  ".join(regressions))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
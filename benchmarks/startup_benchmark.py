@@ -0,0 +1,122 @@
+# 📁 benchmarks/startup_benchmark.py
+# Cold-start numbers: import time, time to first request, time to ready
+#
+# Each measurement runs in a fresh interpreter. Time to first request is
+# how long a fresh uvicorn worker takes to answer /health; time to ready is
+# how long until /ready returns 200 (warm-up finished). Without
+# DATABASE_URL a throwaway SQLite file is used (with DB_AUTO_CREATE=true).
+#
+# Run: python -m benchmarks.startup_benchmark [--runs 5] [--output startup.jsonl]
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+
+IMPORT_SNIPPET = (
+    "import time; started = time.perf_counter(); import {module}; "
+    "print(time.perf_counter() - started)"
+)
+
+
+def _env(tmp_dir: str) -> dict:
+    env = dict(os.environ)
+    env.setdefault("OPENAI_API_KEY", "benchmark")
+    if not env.get("DATABASE_URL"):
+        env["DATABASE_URL"] = f"sqlite:///{tmp_dir}/startup.db"
+        env["DB_AUTO_CREATE"] = "true"
+    return env
+
+
+def measure_import(module: str, env: dict) -> float:
+    output = subprocess.check_output(
+        [sys.executable, "-c", IMPORT_SNIPPET.format(module=module)],
+        env=env,
+        text=True,
+    )
+    return float(output.strip().splitlines()[-1])
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _status(url: str) -> int | None:
+    try:
+        with urllib.request.urlopen(url, timeout=1) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except OSError:
+        return None
+
+
+def measure_server(env: dict, timeout: float = 60.0) -> dict:
+    """Start a worker and time /health (first request) and /ready."""
+    port = _free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    result = {"first_request_s": None, "ready_s": None}
+    try:
+        while time.perf_counter() - started < timeout:
+            if result["first_request_s"] is None and _status(f"http://127.0.0.1:{port}/health") == 200:
+                result["first_request_s"] = time.perf_counter() - started
+            if result["first_request_s"] is not None and _status(f"http://127.0.0.1:{port}/ready") == 200:
+                result["ready_s"] = time.perf_counter() - started
+                break
+            time.sleep(0.02)
+    finally:
+        process.terminate()
+        process.wait()
+    return result
+
+
+def _median(values: list) -> float | None:
+    values = [v for v in values if v is not None]
+    return round(statistics.median(values), 3) if values else None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="Append the result as a JSON line to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        env = _env(tmp_dir)
+        app_imports = [measure_import("src.main", env) for _ in range(args.runs)]
+        agent_imports = [measure_import("src.agents", env) for _ in range(args.runs)]
+        servers = [measure_server(env) for _ in range(args.runs)]
+
+    result = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "runs": args.runs,
+        "import_app_s": _median(app_imports),
+        "import_agent_stack_s": _median(agent_imports),
+        "time_to_first_request_s": _median([s["first_request_s"] for s in servers]),
+        "time_to_ready_s": _median([s["ready_s"] for s in servers]),
+    }
+    print(json.dumps(result, indent=2))
+
+    if args.output:
+        with open(args.output, "a") as f:
+            f.write(json.dumps(result) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# 📁 benchmarks/tool_schema_benchmark.py
+# Size of the tool definitions sent with every agent turn
+#
+# Each case is a turn shape (first flights turn, unclear first turn, ...);
+# the tools select_tools binds for it are serialized the way they are sent
+# to OpenAI (convert_to_openai_tool, compact JSON) and measured in
+# characters. Tokens are estimated at 4 characters per token, since no
+# tokenizer vocabulary is needed that way; character counts are exact and
+# deterministic, so they are the gate. Results are compared to
+# benchmarks/baselines/tool_schema.json; the run fails when a case binds a
+# different tool set or grows by more than the tolerance.
+#
+# The baseline also keeps a fixed reference: the size of all tools before
+# the search schemas were flattened (params wrappers, required counts),
+# measured the same way on that tree.
+#
+# Run:            python -m benchmarks.tool_schema_benchmark
+# New baseline:   python -m benchmarks.tool_schema_benchmark --save-baseline
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence
+
+from langchain_core.tools import BaseTool
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from src.tools.registry import ALL_TOOLS, select_tools
+from src.tools.results_cache import SearchResults, search_results_cache
+
+
+BENCH_DIR = Path(__file__).parent
+BASELINE_PATH = BENCH_DIR / "baselines" / "tool_schema.json"
+
+SIZE_TOLERANCE = 0.02    # fail when a case grows by more than 2%
+CHARS_PER_TOKEN = 4
+CACHED_SESSION = "tool-schema-benchmark"
+
+
+# ------------------------------------------------------------------
+# 🧪 Cases
+# ------------------------------------------------------------------
+
+def _with_cached_search(message: str) -> Callable[[], Sequence[BaseTool]]:
+    def select() -> Sequence[BaseTool]:
+        search_results_cache.put(CACHED_SESSION, SearchResults("flights", {}, [], shown=0, columns={}))
+        return select_tools(message, CACHED_SESSION)
+    return select
+
+
+CASES: Dict[str, Callable[[], Sequence[BaseTool]]] = {
+    "all_tools": lambda: ALL_TOOLS,
+    "first_turn.flights": lambda: select_tools("Find flights from Delhi to Amsterdam on 12 November", None),
+    "first_turn.hotels": lambda: select_tools("Hotels in Amsterdam for 3 nights from 12 November", None),
+    "first_turn.unclear": lambda: select_tools("Plan my trip to Amsterdam in November", None),
+    "follow_up.flights": _with_cached_search("Any cheaper flights?"),
+}
+
+
+# ------------------------------------------------------------------
+# 📏 Measurement
+# ------------------------------------------------------------------
+
+def schema_chars(tools: Sequence[BaseTool]) -> int:
+    """Characters of the tools' OpenAI definitions as compact JSON."""
+    return sum(len(json.dumps(convert_to_openai_tool(tool), separators=(",", ":"))) for tool in tools)
+
+
+def run() -> Dict[str, Dict]:
+    results = {}
+    for name, select in CASES.items():
+        tools = select()
+        results[name] = {"tools": [tool.name for tool in tools], "chars": schema_chars(tools)}
+    return results
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Print a comparison table and return the list of regressions."""
+    all_chars = results["all_tools"]["chars"]
+    reference = baseline.get("reference", {}).get("all_tools_before_flattening")
+
+    regressions = []
+    print(f"{'case':<22} {'chars':>7} {'~tokens':>8} {'vs all':>8} {'vs ref':>8} {'Δbase':>7}  tools")
+    for name, result in results.items():
+        chars = result["chars"]
+        base = baseline.get("cases", {}).get(name)
+        delta = None
+        if base:
+            delta = chars / base["chars"] - 1
+            if delta > tolerance:
+                regressions.append(f"{name}: {delta:+.1%} schema size")
+            if result["tools"] != base["tools"]:
+                regressions.append(f"{name}: binds {result['tools']}, baseline {base['tools']}")
+        print(
+            f"{name:<22} {chars:>7} {chars // CHARS_PER_TOKEN:>8} "
+            f"{chars / all_chars - 1:>+8.0%} "
+            f"{'-' if not reference else f'{chars / reference - 1:+.0%}':>8} "
+            f"{'new' if delta is None else f'{delta:+.1%}':>7}  {', '.join(result['tools'])}"
+        )
+    if reference:
+        print(f"\nreference: all tools before flattening = {reference} chars")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Tool definition size per turn shape")
+    parser.add_argument("--save-baseline", action="store_true", help="Store results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=SIZE_TOLERANCE)
+    args = parser.parse_args()
+
+    results = run()
+
+    baseline = {}
+    if BASELINE_PATH.exists():
+        baseline = json.loads(BASELINE_PATH.read_text())
+
+    regressions = compare(results, baseline, args.tolerance)
+
+    if args.save_baseline:
+        BASELINE_PATH.parent.mkdir(exist_ok=True)
+        saved = {"reference": baseline.get("reference", {}), "cases": results}
+        BASELINE_PATH.write_text(json.dumps(saved, indent=2) + "\n")
+        print(f"\nBaseline saved to {BASELINE_PATH}")
+        return
+
+    if regressions:
+        print("\nRegressions:\n  " + "\n  ".join(regressions))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,500 @@
+# 📁 agents/checkpointer.py
+# Postgres-backed LangGraph checkpointer, so a turn resumes the session's
+# graph state instead of rebuilding it from the messages table
+
+import logging
+import threading
+import zlib
+from collections import OrderedDict
+from collections.abc import Iterator, Sequence
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from src.core import settings
+from src.core.bulkhead import bulkhead, bulkheaded
+from src.core.metrics import metrics
+from src.database import get_db_session
+from src.models.psql import AgentCheckpoint, AgentCheckpointBlob, AgentCheckpointWrite
+
+logger = logging.getLogger(__name__)
+
+
+# ------------------------------------------------------------------
+# 🗜️ Serialization
+# ------------------------------------------------------------------
+
+_COMPRESSED_PREFIX = "z:"
+
+
+class CompactSerializer:
+    """
+    LangGraph's msgpack serializer, zlib-compressed above a size threshold.
+
+    Compressed payloads are tagged by prefixing their type with "z:", so
+    small values (versions, flags, short strings) skip compression.
+    """
+
+    def __init__(self, min_bytes: int, level: int = 6):
+        self._inner = JsonPlusSerializer()
+        self._min_bytes = min_bytes
+        self._level = level
+
+    def dumps_typed(self, obj: Any) -> Tuple[str, bytes]:
+        type_, data = self._inner.dumps_typed(obj)
+        if len(data) >= self._min_bytes:
+            return _COMPRESSED_PREFIX + type_, zlib.compress(data, self._level)
+        return type_, data
+
+    def loads_typed(self, data: Tuple[str, bytes]) -> Any:
+        type_, payload = data
+        if type_.startswith(_COMPRESSED_PREFIX):
+            return self._inner.loads_typed((type_[len(_COMPRESSED_PREFIX):], zlib.decompress(payload)))
+        return self._inner.loads_typed(data)
+
+
+# ------------------------------------------------------------------
+# 🧷 Checkpointer
+# ------------------------------------------------------------------
+
+# Blob type of a channel that has no value at its version
+_EMPTY = "empty"
+
+# Marker for a channel with a new version but no value
+_MISSING = object()
+
+
+class SQLAlchemyCheckpointer(BaseCheckpointSaver):
+    """
+    Checkpoint saver on the application's database.
+
+    Writes are incremental: a checkpoint row holds no channel values, only
+    channels whose version changed get a blob row, and a list channel that
+    grew by appending (the message history) stores only the appended items
+    on top of its previous version. A full value is written again every
+    AGENT_CHECKPOINT_MAX_DELTAS versions to bound the replay on load.
+
+    The process remembers the last list it wrote or loaded per thread
+    (bounded LRU) to detect appends by identity; without it a full value
+    is written, so any worker can serve any session.
+
+    Synchronous only: the agent is invoked from worker threads.
+    """
+
+    def __init__(self, max_deltas: int, compress_min_bytes: int, cached_threads: int):
+        super().__init__(serde=CompactSerializer(compress_min_bytes))
+        self._max_deltas = max_deltas
+        self._cached_threads = cached_threads
+        # (thread_id, checkpoint_ns) -> {channel: (version, list value, depth)}
+        self._lists: "OrderedDict[Tuple[str, str], Dict[str, Tuple[str, list, int]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    # ---------------------------------------------------------------
+    # List cache
+    # ---------------------------------------------------------------
+
+    def _cached_list(self, key: Tuple[str, str], channel: str) -> Optional[Tuple[str, list, int]]:
+        with self._lock:
+            channels = self._lists.get(key)
+            if channels is None:
+                return None
+            self._lists.move_to_end(key)
+            return channels.get(channel)
+
+    def _remember_list(self, key: Tuple[str, str], channel: str, version: str, value: list, depth: int) -> None:
+        with self._lock:
+            self._lists.setdefault(key, {})[channel] = (version, value, depth)
+            self._lists.move_to_end(key)
+            while len(self._lists) > self._cached_threads:
+                self._lists.popitem(last=False)
+
+    def _forget_thread(self, thread_id: str) -> None:
+        with self._lock:
+            for key in [key for key in self._lists if key[0] == thread_id]:
+                del self._lists[key]
+
+    # ---------------------------------------------------------------
+    # Blobs
+    # ---------------------------------------------------------------
+
+    def _blob_row(self, key: Tuple[str, str], channel: str, version: str, value: Any) -> Dict[str, Any]:
+        """Row for one channel version: a delta when it extends the last list written."""
+        row = {
+            "thread_id": key[0],
+            "checkpoint_ns": key[1],
+            "channel": channel,
+            "version": version,
+            "base_version": None,
+            "depth": 0,
+        }
+        if value is _MISSING:
+            return {**row, "type": _EMPTY, "blob": None}
+
+        if isinstance(value, list):
+            base = self._cached_list(key, channel)
+            if base is not None:
+                base_version, base_value, base_depth = base
+                appended = len(value) - len(base_value)
+                if (
+                    appended >= 0
+                    and base_depth < self._max_deltas
+                    and all(old is new for old, new in zip(base_value, value))
+                ):
+                    row.update(base_version=base_version, depth=base_depth + 1)
+                    value_to_store = value[len(base_value):]
+                    metrics.counter("checkpoint.delta_blobs").inc()
+                else:
+                    value_to_store = value
+            else:
+                value_to_store = value
+            self._remember_list(key, channel, version, value, row["depth"])
+        else:
+            value_to_store = value
+
+        type_, blob = self.serde.dumps_typed(value_to_store)
+        metrics.counter("checkpoint.blob_bytes").inc(len(blob))
+        return {**row, "type": type_, "blob": blob}
+
+    def _load_channel_values(
+        self, session: Session, key: Tuple[str, str], versions: ChannelVersions
+    ) -> Dict[str, Any]:
+        """Channel values at the given versions, replaying list deltas onto their base."""
+        if not versions:
+            return {}
+
+        rows = session.execute(
+            select(
+                AgentCheckpointBlob.channel,
+                AgentCheckpointBlob.version,
+                AgentCheckpointBlob.type,
+                AgentCheckpointBlob.blob,
+                AgentCheckpointBlob.base_version,
+                AgentCheckpointBlob.depth,
+            ).where(
+                AgentCheckpointBlob.thread_id == key[0],
+                AgentCheckpointBlob.checkpoint_ns == key[1],
+                AgentCheckpointBlob.channel.in_(list(versions)),
+            )
+        ).all()
+        by_version = {(row.channel, row.version): row for row in rows}
+
+        values: Dict[str, Any] = {}
+        for channel, version in versions.items():
+            # Walk back to the full value, then apply the deltas in order
+            chain = []
+            row = by_version.get((channel, str(version)))
+            while row is not None:
+                chain.append(row)
+                if row.base_version is None:
+                    break
+                row = by_version.get((channel, row.base_version))
+            if not chain or chain[-1].base_version is not None:
+                # Missing base: the channel reads as empty, like an unknown version
+                if chain:
+                    logger.warning("Broken checkpoint delta chain for %s/%s", key[0], channel)
+                continue
+            if chain[0].type == _EMPTY:
+                continue
+
+            value = self.serde.loads_typed((chain[-1].type, chain[-1].blob))
+            for delta in reversed(chain[:-1]):
+                value = value + self.serde.loads_typed((delta.type, delta.blob))
+            values[channel] = value
+            if isinstance(value, list):
+                self._remember_list(key, channel, str(version), value, chain[0].depth)
+        return values
+
+    # ---------------------------------------------------------------
+    # BaseCheckpointSaver
+    # ---------------------------------------------------------------
+
+    def _to_tuple(self, session: Session, record: AgentCheckpoint) -> CheckpointTuple:
+        key = (record.thread_id, record.checkpoint_ns)
+        checkpoint = self.serde.loads_typed((record.type, record.checkpoint))
+        writes = session.execute(
+            select(AgentCheckpointWrite)
+            .where(
+                AgentCheckpointWrite.thread_id == record.thread_id,
+                AgentCheckpointWrite.checkpoint_ns == record.checkpoint_ns,
+                AgentCheckpointWrite.checkpoint_id == record.checkpoint_id,
+            )
+            .order_by(AgentCheckpointWrite.task_id, AgentCheckpointWrite.idx)
+        ).scalars().all()
+
+        def config_for(checkpoint_id: str) -> RunnableConfig:
+            return {
+                "configurable": {
+                    "thread_id": record.thread_id,
+                    "checkpoint_ns": record.checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            }
+
+        return CheckpointTuple(
+            config=config_for(record.checkpoint_id),
+            checkpoint={
+                **checkpoint,
+                "channel_values": self._load_channel_values(session, key, checkpoint["channel_versions"]),
+            },
+            metadata=self.serde.loads_typed((record.metadata_type, record.checkpoint_metadata)),
+            parent_config=config_for(record.parent_checkpoint_id) if record.parent_checkpoint_id else None,
+            pending_writes=[
+                (write.task_id, write.channel, self.serde.loads_typed((write.type, write.blob)))
+                for write in writes
+            ],
+        )
+
+    @bulkheaded("db")
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """Latest checkpoint of the thread, or the one named by `checkpoint_id`."""
+        configurable = config["configurable"]
+        query = select(AgentCheckpoint).where(
+            AgentCheckpoint.thread_id == configurable["thread_id"],
+            AgentCheckpoint.checkpoint_ns == configurable.get("checkpoint_ns", ""),
+        )
+        if checkpoint_id := get_checkpoint_id(config):
+            query = query.where(AgentCheckpoint.checkpoint_id == checkpoint_id)
+        else:
+            query = query.order_by(AgentCheckpoint.checkpoint_id.desc()).limit(1)
+
+        session = get_db_session()
+        try:
+            record = session.execute(query).scalars().first()
+            return self._to_tuple(session, record) if record is not None else None
+        finally:
+            session.close()
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        """
+        Checkpoints of a thread, newest first (used for state history).
+
+        Rows are read up front inside the "db" bulkhead (a generator cannot
+        use @bulkheaded), so no slot or connection is held while the caller
+        iterates.
+        """
+        query = select(AgentCheckpoint).order_by(AgentCheckpoint.checkpoint_id.desc())
+        if config is not None:
+            configurable = config["configurable"]
+            query = query.where(AgentCheckpoint.thread_id == configurable["thread_id"])
+            if "checkpoint_ns" in configurable:
+                query = query.where(AgentCheckpoint.checkpoint_ns == configurable["checkpoint_ns"])
+            if checkpoint_id := get_checkpoint_id(config):
+                query = query.where(AgentCheckpoint.checkpoint_id == checkpoint_id)
+        if before is not None and (before_id := get_checkpoint_id(before)):
+            query = query.where(AgentCheckpoint.checkpoint_id < before_id)
+
+        results: List[CheckpointTuple] = []
+        with bulkhead("db"):
+            session = get_db_session()
+            try:
+                for record in session.execute(query).scalars():
+                    result = self._to_tuple(session, record)
+                    if filter and not all(result.metadata.get(k) == v for k, v in filter.items()):
+                        continue
+                    results.append(result)
+                    if limit is not None and len(results) >= limit:
+                        break
+            finally:
+                session.close()
+        yield from results
+
+    @bulkheaded("db")
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Store a checkpoint and the blobs of the channels that changed."""
+        configurable = config["configurable"]
+        key = (configurable["thread_id"], configurable.get("checkpoint_ns", ""))
+
+        stored = checkpoint.copy()
+        values = stored.pop("channel_values")
+        blob_rows = [
+            self._blob_row(key, channel, str(version), values.get(channel, _MISSING))
+            for channel, version in new_versions.items()
+        ]
+        checkpoint_type, checkpoint_data = self.serde.dumps_typed(stored)
+        metadata_type, metadata_data = self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+
+        session = get_db_session()
+        try:
+            session.add_all(AgentCheckpointBlob(**row) for row in blob_rows)
+            session.merge(
+                AgentCheckpoint(
+                    thread_id=key[0],
+                    checkpoint_ns=key[1],
+                    checkpoint_id=checkpoint["id"],
+                    parent_checkpoint_id=configurable.get("checkpoint_id"),
+                    type=checkpoint_type,
+                    checkpoint=checkpoint_data,
+                    metadata_type=metadata_type,
+                    checkpoint_metadata=metadata_data,
+                )
+            )
+            session.commit()
+        except Exception:
+            session.rollback()
+            # The cached lists may reference versions that were not stored
+            self._forget_thread(key[0])
+            raise
+        finally:
+            session.close()
+
+        metrics.counter("checkpoint.puts").inc()
+        return {
+            "configurable": {
+                "thread_id": key[0],
+                "checkpoint_ns": key[1],
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    @bulkheaded("db")
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Store a task's pending writes; special channels overwrite, others are kept."""
+        configurable = config["configurable"]
+        identity = {
+            "thread_id": configurable["thread_id"],
+            "checkpoint_ns": configurable.get("checkpoint_ns", ""),
+            "checkpoint_id": configurable["checkpoint_id"],
+            "task_id": task_id,
+        }
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            type_, blob = self.serde.dumps_typed(value)
+            rows.append({
+                **identity,
+                "idx": WRITES_IDX_MAP.get(channel, idx),
+                "channel": channel,
+                "type": type_,
+                "blob": blob,
+                "task_path": task_path,
+            })
+        if not rows:
+            return
+
+        session = get_db_session()
+        try:
+            existing = set(session.execute(
+                select(AgentCheckpointWrite.idx).where(
+                    *(getattr(AgentCheckpointWrite, column) == value for column, value in identity.items()),
+                    AgentCheckpointWrite.idx.in_([row["idx"] for row in rows]),
+                )
+            ).scalars())
+            for row in rows:
+                if row["idx"] in existing:
+                    if row["idx"] >= 0:
+                        continue
+                    session.merge(AgentCheckpointWrite(**row))
+                else:
+                    session.add(AgentCheckpointWrite(**row))
+            session.commit()
+        finally:
+            session.close()
+
+    @bulkheaded("db")
+    def delete_thread(self, thread_id: str) -> None:
+        """Delete every checkpoint, blob and pending write of a thread."""
+        self._forget_thread(thread_id)
+        session = get_db_session()
+        try:
+            for model in (AgentCheckpointWrite, AgentCheckpointBlob, AgentCheckpoint):
+                session.execute(delete(model).where(model.thread_id == thread_id))
+            session.commit()
+        finally:
+            session.close()
+
+    # ---------------------------------------------------------------
+    # Helpers
+    # ---------------------------------------------------------------
+
+    @bulkheaded("db")
+    def has_thread(self, thread_id: str) -> bool:
+        """True when the thread has at least one checkpoint."""
+        session = get_db_session()
+        try:
+            return session.execute(
+                select(AgentCheckpoint.checkpoint_id)
+                .where(AgentCheckpoint.thread_id == thread_id)
+                .limit(1)
+            ).first() is not None
+        finally:
+            session.close()
+
+    def prune_stale_threads(self, older_than_days: int) -> int:
+        """
+        Delete threads whose latest checkpoint is older than the cutoff.
+
+        Their sessions resume from the stored messages and summary instead.
+
+        Returns:
+            Number of threads deleted
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+        session = get_db_session()
+        try:
+            stale: List[str] = session.execute(
+                select(AgentCheckpoint.thread_id)
+                .group_by(AgentCheckpoint.thread_id)
+                .having(func.max(AgentCheckpoint.created_at) < cutoff)
+            ).scalars().all()
+        finally:
+            session.close()
+
+        for thread_id in stale:
+            self.delete_thread(thread_id)
+        if stale:
+            metrics.counter("checkpoint.threads_pruned").inc(len(stale))
+            logger.info(f"Pruned {len(stale)} agent threads idle for {older_than_days} days")
+        return len(stale)
+
+
+# ------------------------------------------------------------------
+# 🧠 Lazy singleton
+# ------------------------------------------------------------------
+
+_CHECKPOINTER: Optional[SQLAlchemyCheckpointer] = None
+
+
+def get_checkpointer() -> Optional[SQLAlchemyCheckpointer]:
+    """Get the agent checkpointer, or None when AGENT_CHECKPOINTS_ENABLED is off."""
+    global _CHECKPOINTER
+    if not settings["AGENT_CHECKPOINTS_ENABLED"]:
+        return None
+    if _CHECKPOINTER is None:
+        _CHECKPOINTER = SQLAlchemyCheckpointer(
+            max_deltas=settings["AGENT_CHECKPOINT_MAX_DELTAS"],
+            compress_min_bytes=settings["AGENT_CHECKPOINT_COMPRESS_MIN_BYTES"],
+            cached_threads=settings["AGENT_CHECKPOINT_CACHED_THREADS"],
+        )
+    return _CHECKPOINTER
@@ -0,0 +1,94 @@
+import json
+from typing import Dict, List
+
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from src.agents.summarize_agent import compact_messages
+from src.llms import get_llm_route, get_task_model, invoke_llm
+
+
+# ------------------------------------------------------------------
+# 🧭 System Prompt
+# ------------------------------------------------------------------
+
+EXTRACT_FACTS_SYSTEM_PROMPT = """
+You extract long-term memory for a travel assistant.
+
+From the conversation below, list durable facts about the traveller that
+would help in future conversations:
+- Home city / usual departure airport
+- Travel companions (adults, children, infants)
+- Preferences (airlines, cabin class, non-stop, budget, hotel class, amenities)
+- Constraints (dates that never work, accessibility, loyalty programs)
+- Trips planned or booked (destination and dates)
+
+Rules:
+1. One self-contained fact per item, max 20 words, in the third person ("Prefers ...")
+2. Skip search results, prices of individual offers and small talk
+3. Skip anything that only mattered for a single search
+4. Return [] when there is nothing durable
+
+Return ONLY a JSON array of strings, nothing else.
+"""
+
+MAX_FACT_CHARS = 200  # facts are injected verbatim into the prompt
+MAX_FACTS_PER_EXTRACTION = 10
+
+
+# ------------------------------------------------------------------
+# 🧠 Extract Function
+# ------------------------------------------------------------------
+
+def parse_facts(content: str) -> List[str]:
+    """
+    Read the model's JSON array of facts, tolerating code fences.
+
+    Returns:
+        Unique, non-empty facts capped at MAX_FACT_CHARS each
+    """
+    content = content.strip()
+    if content.startswith("```"):
+        content = content.strip("`").removeprefix("json").strip()
+    try:
+        data = json.loads(content)
+    except json.JSONDecodeError:
+        return []
+    if not isinstance(data, list):
+        return []
+
+    facts: List[str] = []
+    for item in data:
+        if not isinstance(item, str):
+            continue
+        fact = " ".join(item.split())[:MAX_FACT_CHARS]
+        if fact and fact not in facts:
+            facts.append(fact)
+    return facts[:MAX_FACTS_PER_EXTRACTION]
+
+
+def extract_facts(messages: List[Dict[str, str]]) -> List[str]:
+    """
+    Extract durable traveller facts from conversation messages.
+
+    Messages are pre-compacted like for summarization, so search result
+    payloads do not reach the model.
+
+    Args:
+        messages: List of message dicts with 'role' and 'content'
+
+    Returns:
+        Facts worth remembering (possibly empty)
+    """
+    if not messages:
+        return []
+
+    conversation = "\n".join(
+        f"{msg['role'].upper()}: {msg['content']}" for msg in compact_messages(messages)
+    )
+    response = invoke_llm(
+        get_task_model("summarize"),
+        [SystemMessage(content=EXTRACT_FACTS_SYSTEM_PROMPT), HumanMessage(content=conversation)],
+        name="extract_facts",
+        timeout=get_llm_route("summarize").timeout,
+    )
+    return parse_facts(response.content)
@@ -1,7 +1,12 @@
-from typing import List, Dict
+import contextvars
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Tuple
 from langchain_core.messages import SystemMessage, HumanMessage
 
-from src.llms import get_openai_model
+from src.core import settings
+from src.core.metrics import metrics
+from src.llms import get_llm_route, get_task_model, invoke_llm
 
 
 # ------------------------------------------------------------------
@@ -34,17 +39,156 @@ Return ONLY the updated summary text, nothing else.
 """
 
 
+CHUNK_SYSTEM_PROMPT = """
+You are a conversation summarizer for a travel assistant.
+
+Summarize the following slice of a longer conversation into concise notes
+(max 80 words) that keep every factual travel detail: destinations, dates,
+passengers/guests, preferences, constraints, options shown and decisions made.
+
+Return ONLY the notes, nothing else.
+"""
+
+
 # ------------------------------------------------------------------
-# 🤖 LLM
+# 🗜️ Pre-compaction
 # ------------------------------------------------------------------
 
-llm = get_openai_model()
+MAX_MESSAGE_CHARS = 1500  # hard cap per message after compaction
+MIN_MESSAGE_CHARS = 200   # shortest a message is trimmed to when fitting a backlog
+MAX_LISTED_RESULTS = 3    # search results kept per tool payload
+
+
+def _compact_flights(flights: List[Dict]) -> str:
+    if not flights:
+        return "Showed no flights."
+    first = flights[0]
+    listed = "; ".join(
+        f"{f.get('airline', '?')} {f.get('price', '?')}, {f.get('duration', '?')}"
+        for f in flights[:MAX_LISTED_RESULTS]
+    )
+    return (
+        f"Showed {len(flights)} flights from {first.get('departure', '?')} "
+        f"to {first.get('arrival', '?')}: {listed}"
+    )
+
+
+def _compact_hotels(hotels: List[Dict]) -> str:
+    if not hotels:
+        return "Showed no hotels."
+    listed = "; ".join(
+        f"{h.get('name', '?')} ({h.get('hotel_class', '?')}, rating {h.get('rating', '?')}, "
+        f"{h.get('rate_per_night', '?')}/night)"
+        for h in hotels[:MAX_LISTED_RESULTS]
+    )
+    return f"Showed {len(hotels)} hotels: {listed}"
+
+
+def compact_message_content(content: str) -> str:
+    """
+    Reduce a stored message to the facts worth summarizing.
+    
+    AI responses are JSON; flight/hotel payloads are cut down to the route,
+    count and a few headline options, and plain message responses are
+    unwrapped. Everything is capped at MAX_MESSAGE_CHARS. Deterministic, so
+    the same backlog always produces the same prompt.
+    
+    Args:
+        content: Raw message content as stored in the database
+        
+    Returns:
+        Compacted content
+    """
+    try:
+        data = json.loads(content)
+    except (json.JSONDecodeError, TypeError):
+        data = None
+    
+    if isinstance(data, dict):
+        response_type = data.get("response_type")
+        payload = data.get("data")
+        if response_type == "flights" and isinstance(payload, list):
+            content = _compact_flights(payload)
+        elif response_type == "hotels" and isinstance(payload, list):
+            content = _compact_hotels(payload)
+        elif response_type == "message" and "message" in data:
+            content = str(data["message"])
+    
+    if len(content) > MAX_MESSAGE_CHARS:
+        content = content[:MAX_MESSAGE_CHARS] + " …"
+    return content
+
+
+def compact_messages(messages: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    """Apply compact_message_content to every message."""
+    return [
+        {"role": msg["role"], "content": compact_message_content(msg["content"])}
+        for msg in messages
+    ]
+
+
+def _shorten(content: str, limit: int) -> str:
+    return content if len(content) <= limit else content[:limit] + " …"
+
+
+def fit_backlog(messages: List[Dict[str, str]], max_chars: int) -> List[Dict[str, str]]:
+    """
+    Shorten compacted messages to fit into about max_chars characters.
+    
+    The longest messages are shortened first, down to a common cap of no
+    less than MIN_MESSAGE_CHARS. No message is dropped, so the result can
+    still exceed max_chars; it always matches `messages` one to one.
+    """
+    def overhead(msg: Dict[str, str]) -> int:
+        return len(msg["role"]) + 3
+    
+    def total(cap: int) -> int:
+        return sum(min(len(msg["content"]), cap) + overhead(msg) for msg in messages)
+    
+    longest = max((len(msg["content"]) for msg in messages), default=0)
+    if total(longest) <= max_chars:
+        return messages
+    
+    # Largest common cap that fits (lower bound MIN_MESSAGE_CHARS)
+    low, high = MIN_MESSAGE_CHARS, longest
+    while low < high:
+        cap = (low + high + 1) // 2
+        if total(cap) <= max_chars:
+            low = cap
+        else:
+            high = cap - 1
+    return [{"role": msg["role"], "content": _shorten(msg["content"], low)} for msg in messages]
+
+
+def chunk_messages(messages: List[Dict[str, str]], max_chars: int) -> List[List[Dict[str, str]]]:
+    """
+    Split messages into consecutive chunks of at most ~max_chars characters.
+    
+    A single message longer than max_chars gets a chunk of its own.
+    """
+    chunks: List[List[Dict[str, str]]] = []
+    current: List[Dict[str, str]] = []
+    size = 0
+    for msg in messages:
+        length = len(msg["content"]) + len(msg["role"]) + 3
+        if current and size + length > max_chars:
+            chunks.append(current)
+            current, size = [], 0
+        current.append(msg)
+        size += length
+    if current:
+        chunks.append(current)
+    return chunks
 
 
 # ------------------------------------------------------------------
 # 📝 Summarize Function
 # ------------------------------------------------------------------
 
+def _format_messages(messages: List[Dict[str, str]]) -> str:
+    return "\n".join(f"{msg['role'].upper()}: {msg['content']}" for msg in messages)
+
+
 def build_summarize_prompt(current_summary: str, new_messages: List[Dict[str, str]]) -> str:
     """
     Build the prompt for the summarize agent.
@@ -64,29 +208,98 @@ def build_summarize_prompt(current_summary: str, new_messages: List[Dict[str, st
         summary_section = "CURRENT SUMMARY:\n(No summary yet - this is the start of the conversation)\n"
     
     # Format new messages
-    messages_section = "NEW MESSAGES:\n"
-    for msg in new_messages:
-        role = msg["role"].upper()
-        content = msg["content"]
-        messages_section += f"{role}: {content}\n"
+    messages_section = f"NEW MESSAGES:\n{_format_messages(new_messages)}\n"
     
     return f"{summary_section}\n{messages_section}\n\nProvide the UPDATED SUMMARY:"
 
 
-def update_summary(current_summary: str, new_messages: List[Dict[str, str]]) -> str:
+def build_merge_prompt(current_summary: str, partial_summaries: List[str]) -> str:
+    """
+    Build the reduce-step prompt that folds chunk notes into the running summary.
+    
+    Args:
+        current_summary: Existing summary (can be empty)
+        partial_summaries: Notes for consecutive slices of the new messages
+        
+    Returns:
+        Formatted prompt string
+    """
+    new_messages = [
+        {"role": f"notes (part {i} of {len(partial_summaries)})", "content": partial}
+        for i, partial in enumerate(partial_summaries, start=1)
+    ]
+    return build_summarize_prompt(current_summary, new_messages)
+
+
+def update_summary(current_summary: str, new_messages: List[Dict[str, str]]) -> Tuple[str, int]:
     """
     Update the conversation summary with new messages.
     
+    Messages are pre-compacted first. A backlog that fits in one chunk is
+    summarized with a single call; a larger one is split into at most
+    SUMMARY_MAX_CHUNKS chunks that are summarized concurrently (map) and
+    then merged into the running summary (reduce). A backlog too large for
+    that many chunks has its long messages shortened first; if it still
+    does not fit, only the oldest SUMMARY_MAX_CHUNKS chunks are summarized
+    and the newer messages are left for the next update. However large the
+    backlog, wall time is ceil(SUMMARY_MAX_CHUNKS / SUMMARY_MAP_CONCURRENCY)
+    + 1 LLM calls (two with the defaults) and the reduce prompt holds at
+    most SUMMARY_MAX_CHUNKS short notes.
+    
     Args:
         current_summary: The current summary text (can be empty string)
         new_messages: List of new message dicts with 'role' and 'content'
         
     Returns:
-        Updated summary text
+        Tuple of (updated summary text, number of leading new_messages it
+        covers); only those may be marked as summarized
     """
     
-    # Build the prompt
-    user_prompt = build_summarize_prompt(current_summary, new_messages)
+    llm = get_task_model("summarize")
+    timeout = get_llm_route("summarize").timeout
+    
+    compacted = compact_messages(new_messages)
+    chunk_chars = settings["SUMMARY_CHUNK_CHARS"]
+    max_chunks = max(settings["SUMMARY_MAX_CHUNKS"], 1)
+    chunks = chunk_messages(compacted, chunk_chars)
+    covered = len(new_messages)
+    if len(chunks) > max_chunks:
+        metrics.counter("summary.backlog_fitted").inc()
+        # Chunks are packed greedily, so leave room for one message of slack per chunk
+        budget = max_chunks * chunk_chars
+        while len(chunks) > max_chunks and budget > 0:
+            fitted = fit_backlog(compacted, budget)
+            chunks = chunk_messages(fitted, chunk_chars)
+            budget -= chunk_chars // 4
+        if len(chunks) > max_chunks:
+            # Still too long: summarize the oldest part, the rest waits for the next update
+            chunks = chunks[:max_chunks]
+            covered = sum(len(chunk) for chunk in chunks)
+            metrics.counter("summary.messages_deferred").inc(len(new_messages) - covered)
+        compacted = [msg for chunk in chunks for msg in chunk]
+    
+    if len(chunks) <= 1:
+        # Build the prompt
+        user_prompt = build_summarize_prompt(current_summary, compacted)
+    else:
+        # Map: summarize each chunk concurrently
+        def summarize_chunk(chunk: List[Dict[str, str]]) -> str:
+            response = invoke_llm(
+                llm,
+                [SystemMessage(content=CHUNK_SYSTEM_PROMPT), HumanMessage(content=_format_messages(chunk))],
+                name="summarize_chunk",
+                timeout=timeout,
+            )
+            return response.content.strip()
+        
+        # Worker threads inherit the request deadline via the copied context
+        context = contextvars.copy_context()
+        with ThreadPoolExecutor(max_workers=settings["SUMMARY_MAP_CONCURRENCY"]) as executor:
+            futures = [executor.submit(context.copy().run, summarize_chunk, chunk) for chunk in chunks]
+            partial_summaries = [future.result() for future in futures]
+        
+        # Reduce: merge the chunk notes into the running summary
+        user_prompt = build_merge_prompt(current_summary, partial_summaries)
     
     # Create messages for LLM
     messages = [
@@ -95,9 +308,9 @@ def update_summary(current_summary: str, new_messages: List[Dict[str, str]]) ->
     ]
     
     # Get LLM response
-    response = llm.invoke(messages)
+    response = invoke_llm(llm, messages, name="summarize", timeout=timeout)
     
     # Extract and return the summary
     updated_summary = response.content.strip()
     
-    return updated_summary
+    return updated_summary, covered
@@ -1,12 +1,20 @@
+import json
 import operator
-from typing import Annotated, TypedDict, List
+from typing import Annotated, Callable, TypedDict, List, Optional
 
-from langchain_core.messages import AnyMessage, SystemMessage
+from langchain_core.messages import AIMessage, AnyMessage, HumanMessage, SystemMessage, ToolMessage
 from langgraph.graph import StateGraph, END
 from langgraph.prebuilt import ToolNode
+from langgraph.prebuilt.tool_node import ToolCallRequest
 
-from src.tools import flights_finder, hotels_finder
-from src.llms import get_openai_model
+from src.core import settings
+from src.core.deadline import time_remaining, use_deadline
+from src.core.metrics import metrics
+from src.exceptions import TravelAgentError
+
+from src.tools import ALL_TOOLS, select_tools, start_speculative_search
+from src.tools.results_cache import current_search_session
+from src.llms import get_llm_route, get_task_model, invoke_llm
 
 
 # ------------------------------------------------------------------
@@ -16,28 +24,29 @@ from src.llms import get_openai_model
 class AgentState(TypedDict):
     messages: Annotated[List[AnyMessage], operator.add]
     conversation_summary: str  # Add summary to state
+    memories: List[str]  # Long-term facts recalled for this turn
+    deadline: Optional[float]  # Absolute time.monotonic() deadline of the request
+    budget_exhausted: Optional[str]  # "deadline" once a step could not run in time
 
 
 # ------------------------------------------------------------------
 # 🧭 System Prompt
 # ------------------------------------------------------------------
 
-def build_travel_agent_system_prompt(conversation_summary: str = "") -> str:
-    """
-    Build the travel agent system prompt with optional conversation summary.
-    
-    Args:
-        conversation_summary: Summary of previous conversation context
-        
-    Returns:
-        Complete system prompt
-    """
-    
-    base_prompt = """You are a smart travel assistant that returns structured JSON responses.
+# The prompt is laid out for provider-side prefix caching: tool definitions
+# (one of a few fixed subsets, see select_tools) and this static system
+# message are byte-identical across calls and come first; everything
+# per-session (summary, history) follows. Do not format
+# anything dynamic into TRAVEL_AGENT_SYSTEM_PROMPT.
+
+TRAVEL_AGENT_SYSTEM_PROMPT = """You are a smart travel assistant that returns structured JSON responses.
 
 You can:
 - Search for flights using the flights_finder tool
 - Search for hotels using the hotels_finder tool
+- Show more results of the last search using the more_results tool (do not repeat the search)
+- Filter or re-sort the last search (non-stop, price limit, star class, rating, sort order) using the refine_results tool; search again only if it returns NEEDS_NEW_SEARCH
+- Watch the price of the last search using the watch_price tool when the user wants to hear about price drops (confirm with the "message" format)
 
 IMPORTANT Response Format Rules:
 
@@ -45,13 +54,13 @@ IMPORTANT Response Format Rules:
 
 2. After calling a tool, return ONLY valid JSON (no extra text, no markdown):
 
-For flights (after calling flights_finder):
+For flights (after calling flights_finder, or more_results/refine_results after a flights search):
 {
   "response_type": "flights",
   "data": [list of flights from tool]
 }
 
-For hotels (after calling hotels_finder):
+For hotels (after calling hotels_finder, or more_results/refine_results after a hotels search):
 {
   "response_type": "hotels", 
   "data": [list of hotels from tool]
@@ -63,70 +72,290 @@ For conversational responses (missing params, greetings, clarifications):
   "message": "your friendly response here"
 }
 
-3. If user is missing required parameters, ask for them using the "message" format
+3. If user is missing required parameters (places, dates), ask for them using the "message" format; do not ask for optional ones (passengers default to 1 adult, 1 room)
 4. Tool results are already cleaned - just wrap them in the appropriate response_type structure
-5. Always return valid JSON - no markdown, no code blocks, just pure JSON"""
+5. If a tool returns an "error" object, explain the listed problems to the user using the "message" format
+6. Always return valid JSON - no markdown, no code blocks, just pure JSON"""
+
+# Built once per process and shared by every call
+STATIC_SYSTEM_MESSAGE = SystemMessage(content=TRAVEL_AGENT_SYSTEM_PROMPT)
 
-    # Add conversation summary if provided
-    if conversation_summary and conversation_summary.strip():
-        summary_section = f"""
 
-CONVERSATION CONTEXT:
+def build_travel_agent_context(conversation_summary: str = "", memories: Optional[List[str]] = None) -> str:
+    """
+    Build the per-session context section that follows the static prompt.
+    
+    Args:
+        conversation_summary: Summary of previous conversation context
+        memories: Long-term facts relevant to the current message (top-k, so
+            the section stays the same size however long the history)
+        
+    Returns:
+        Context text, or "" when there is nothing to add
+    """
+    sections = []
+    if conversation_summary and conversation_summary.strip():
+        sections.append(f"""CONVERSATION CONTEXT:
 {conversation_summary}
 
-Use this context to understand the user's travel preferences and previous discussions."""
-        return base_prompt + summary_section
+Use this context to understand the user's travel preferences and previous discussions.""")
     
-    return base_prompt
+    if memories:
+        facts = "\n".join(f"- {fact}" for fact in memories)
+        sections.append(f"""REMEMBERED ABOUT THE USER:
+{facts}
+
+Apply these when relevant, unless the user says otherwise now.""")
+    
+    return "\n\n".join(sections)
+
+
+def build_travel_agent_prompt(
+    conversation_summary: str,
+    messages: List[AnyMessage],
+    memories: Optional[List[str]] = None,
+) -> List[AnyMessage]:
+    """
+    Assemble the model input: static prefix, then session context, then history.
+    
+    Args:
+        conversation_summary: Summary of previous conversation context
+        messages: Conversation messages for this turn
+        memories: Long-term facts recalled for this turn
+        
+    Returns:
+        Messages to send to the LLM
+    """
+    context = build_travel_agent_context(conversation_summary, memories)
+    if context:
+        return [STATIC_SYSTEM_MESSAGE, SystemMessage(content=context), *messages]
+    return [STATIC_SYSTEM_MESSAGE, *messages]
 
 
 # ------------------------------------------------------------------
 # 🔧 Tools
 # ------------------------------------------------------------------
 
-TOOLS = [flights_finder, hotels_finder]
+TOOLS = list(ALL_TOOLS)
+
+
+def latest_user_message(messages: List[AnyMessage]) -> Optional[str]:
+    """Text of the latest user message (the one this turn answers)."""
+    for message in reversed(messages):
+        if isinstance(message, HumanMessage):
+            return message.content if isinstance(message.content, str) else None
+    return None
+
+
+def tools_for_turn(messages: List[AnyMessage]) -> List:
+    """
+    Tools to bind for this model call.
+    
+    With AGENT_TOOL_SELECTION_ENABLED, only those relevant to the latest
+    user message (see select_tools); the tools node can still run all of them.
+    """
+    if not settings["AGENT_TOOL_SELECTION_ENABLED"]:
+        return TOOLS
+    tools = select_tools(latest_user_message(messages), current_search_session())
+    metrics.histogram("agent.bound_tools").observe(len(tools))
+    return tools
 
 
 # ------------------------------------------------------------------
-# 🤖 LLM (tool-enabled)
+# ⏳ Budgets
 # ------------------------------------------------------------------
 
-llm = get_openai_model().bind_tools(TOOLS)
+# Response type of each search tool's results
+_TOOL_RESPONSE_TYPES = {"flights_finder": "flights", "hotels_finder": "hotels"}
+
+PARTIAL_RESULT_MESSAGE = (
+    "Sorry, this is taking longer than expected. "
+    "Could you try again, or narrow down what you are looking for?"
+)
+
+
+def _out_of_time() -> bool:
+    """True when too little of the current deadline is left to start another step."""
+    remaining = time_remaining()
+    return remaining is not None and remaining < settings["AGENT_MIN_STEP_S"]
+
+
+def tool_iterations(messages: List[AnyMessage]) -> int:
+    """Tool-calling model turns since the latest user message."""
+    count = 0
+    for message in reversed(messages):
+        if isinstance(message, HumanMessage):
+            break
+        if isinstance(message, AIMessage) and message.tool_calls:
+            count += 1
+    return count
+
+
+def build_partial_response(messages: List[AnyMessage]) -> str:
+    """
+    Best answer available without another model call.
+    
+    The most recent non-empty search result of this turn, wrapped in the
+    usual response format; otherwise an apology message.
+    """
+    for message in reversed(messages):
+        if isinstance(message, HumanMessage):
+            break
+        if not isinstance(message, ToolMessage) or message.status == "error":
+            continue
+        data = message.content
+        if isinstance(data, str):
+            try:
+                data = json.loads(data)
+            except json.JSONDecodeError:
+                continue
+        if isinstance(data, list) and data and isinstance(data[0], dict):
+            response_type = _TOOL_RESPONSE_TYPES.get(message.name) or ("flights" if "airline" in data[0] else "hotels")
+            return json.dumps({"response_type": response_type, "data": data}, ensure_ascii=False)
+    
+    return json.dumps({"response_type": "message", "message": PARTIAL_RESULT_MESSAGE})
+
+
+def run_tool_within_budget(request: ToolCallRequest, execute: Callable) -> ToolMessage:
+    """
+    Run one tool call under the deadline carried in the agent state.
+    
+    A call that cannot start (or finish) in time, or finds its dependency's
+    bulkhead full, is answered with an error ToolMessage, so the graph can
+    still finalize with what it has.
+    """
+    with use_deadline(request.state.get("deadline")):
+        try:
+            if _out_of_time():
+                raise TravelAgentError(
+                    message="Request deadline exceeded before tool call",
+                    error_code="DEADLINE_EXCEEDED",
+                    status_code=504,
+                )
+            return execute(request)
+        except Exception as e:
+            error_code = e.error_code if isinstance(e, TravelAgentError) else None
+            if error_code == "DEPENDENCY_SATURATED":
+                # Let the model tell the user instead of failing the whole turn
+                return ToolMessage(
+                    content=json.dumps({"error": error_code, "details": ["The search service is busy; try again shortly."]}),
+                    name=request.tool_call["name"],
+                    tool_call_id=request.tool_call["id"],
+                    status="error",
+                )
+            if not (error_code == "DEADLINE_EXCEEDED" or _out_of_time()):
+                raise
+    
+    metrics.counter("agent.tool_calls_skipped").inc()
+    return ToolMessage(
+        content=json.dumps({"error": "DEADLINE_EXCEEDED", "details": ["The search ran out of time."]}),
+        name=request.tool_call["name"],
+        tool_call_id=request.tool_call["id"],
+        status="error",
+    )
 
 
 # ------------------------------------------------------------------
 # 🧩 Graph Nodes
 # ------------------------------------------------------------------
 
+def select_route(state: AgentState) -> str:
+    """
+    Pick the LLM route for this turn.
+
+    A turn that starts from tool results mostly wraps them into the JSON
+    answer ("respond"); every other turn decides which tools to call ("plan").
+    Both routes keep the tools bound so a follow-up search is still possible.
+    """
+    return "respond" if isinstance(state["messages"][-1], ToolMessage) else "plan"
+
+
 def call_llm(state: AgentState) -> AgentState:
     # Get conversation summary from state if available
     conversation_summary = state.get("conversation_summary", "")
     
-    # Build system prompt with summary context
-    system_prompt = build_travel_agent_system_prompt(conversation_summary)
+    # Static prefix first (cacheable), session context and history after
+    messages = build_travel_agent_prompt(conversation_summary, state["messages"], state.get("memories"))
+    route = select_route(state)
     
-    messages = [SystemMessage(content=system_prompt)] + state["messages"]
-    response = llm.invoke(messages)
+    with use_deadline(state.get("deadline")):
+        if _out_of_time():
+            return {"budget_exhausted": "deadline"}
+        last_message = state["messages"][-1]
+        if isinstance(last_message, HumanMessage) and isinstance(last_message.content, str):
+            # A follow-up that tweaks the last search: run the likely search while the model plans
+            start_speculative_search(last_message.content)
+        try:
+            response = invoke_llm(
+                get_task_model(route, tools=tools_for_turn(state["messages"])),
+                messages,
+                name=route,
+                timeout=get_llm_route(route).timeout,
+            )
+        except TravelAgentError as e:
+            if e.error_code == "DEADLINE_EXCEEDED" or (e.error_code == "LLM_TIMEOUT" and _out_of_time()):
+                return {"budget_exhausted": "deadline"}
+            raise
     return {"messages": [response]}
 
 
 def decide_next_node(state: AgentState) -> str:
+    if state.get("budget_exhausted"):
+        return "finalize"
+    
     last_message = state["messages"][-1]
     tool_calls = getattr(last_message, "tool_calls", None)
-    return "tools" if tool_calls else END
-
+    if not tool_calls:
+        return END
+    
+    with use_deadline(state.get("deadline")):
+        if tool_iterations(state["messages"]) > settings["AGENT_MAX_TOOL_ITERATIONS"] or _out_of_time():
+            return "finalize"
+    return "tools"
+
+
+def finalize_partial(state: AgentState) -> AgentState:
+    """Answer with the best result gathered so far once a budget is spent."""
+    reason = state.get("budget_exhausted")
+    if reason is None:
+        with use_deadline(state.get("deadline")):
+            reason = "deadline" if _out_of_time() else "tool_iterations"
+    
+    metrics.counter("agent.budget_exhausted").inc()
+    metrics.counter(f"agent.budget_exhausted.{reason}").inc()
+    
+    # Tool calls that will not run still need an answer, or the checkpointed
+    # history is rejected by the model on the next turn
+    last_message = state["messages"][-1]
+    skipped = [
+        ToolMessage(
+            content=json.dumps({"error": "SKIPPED", "details": ["The step budget ran out."]}),
+            name=tool_call["name"],
+            tool_call_id=tool_call["id"],
+            status="error",
+        )
+        for tool_call in getattr(last_message, "tool_calls", None) or []
+    ]
+    return {"messages": [*skipped, AIMessage(content=build_partial_response(state["messages"]))]}
 
 
 # ------------------------------------------------------------------
 # 🕸️ LangGraph Builder
 # ------------------------------------------------------------------
 
-def build_travel_agent():
-    """Build and compile the travel agent graph."""
+def build_travel_agent(checkpointer=None):
+    """
+    Build and compile the travel agent graph.
+    
+    Args:
+        checkpointer: Optional checkpoint saver; with one, each session's
+            state is resumed from its thread instead of rebuilt per turn
+    """
     graph = StateGraph(AgentState)
 
     graph.add_node("call_llm", call_llm)
-    graph.add_node("tools", ToolNode(TOOLS))
+    graph.add_node("tools", ToolNode(TOOLS, wrap_tool_call=run_tool_within_budget))
+    graph.add_node("finalize", finalize_partial)
 
     graph.set_entry_point("call_llm")
 
@@ -135,10 +364,12 @@ def build_travel_agent():
         decide_next_node,
         {
             "tools": "tools",
+            "finalize": "finalize",
             END: END,
         },
     )
 
     graph.add_edge("tools", "call_llm")
+    graph.add_edge("finalize", END)
 
-    return graph.compile()
+    return graph.compile(checkpointer=checkpointer)
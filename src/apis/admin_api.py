@@ -0,0 +1,175 @@
+# 📁 apis/admin_api.py
+# Operator-only endpoints (metrics, diagnostics)
+
+import asyncio
+import secrets
+from datetime import datetime
+from typing import Annotated, Literal, Optional
+
+from fastapi import APIRouter, Depends, Header, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse, StreamingResponse
+
+from src.core import settings
+from src.core.metrics import metrics
+from src.core.profiling import CpuSampler, MemoryTracer
+from src.database import create_db_engine
+from src.database.pool import pool_status
+from src.services.export import stream_export
+from src.exceptions import TravelAgentError
+
+
+# ------------------------------------------------------------------
+# 🔐 Admin guard
+# ------------------------------------------------------------------
+
+def require_admin(x_admin_key: Annotated[Optional[str], Header()] = None) -> None:
+    """Allow the request only with a valid X-Admin-Key header."""
+    expected = settings["ADMIN_API_KEY"]
+    if not expected or not x_admin_key or not secrets.compare_digest(x_admin_key, expected):
+        raise TravelAgentError(
+            message="Admin access required",
+            error_code="ADMIN_FORBIDDEN",
+            status_code=403,
+        )
+
+
+def require_profiling() -> None:
+    """Allow profiling only when PROFILING_ENABLED is set."""
+    if not settings["PROFILING_ENABLED"]:
+        raise TravelAgentError(
+            message="Profiling is disabled on this deployment",
+            error_code="PROFILING_DISABLED",
+            status_code=403,
+        )
+
+
+ProfileSeconds = Annotated[float, Query(gt=0, le=settings["PROFILING_MAX_SECONDS"])]
+
+
+# ------------------------------------------------------------------
+# 🌐 Router
+# ------------------------------------------------------------------
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["Admin"],
+    dependencies=[Depends(require_admin)],
+)
+
+
+# ------------------------------------------------------------------
+# 🚀 Endpoints
+# ------------------------------------------------------------------
+
+@router.get("/metrics")
+async def get_metrics(prefix: str = ""):
+    """
+    Get a snapshot of in-process metrics for this worker.
+    
+    Args:
+        prefix: Optional metric name prefix filter (e.g. "message_writer.")
+        
+    Returns:
+        Dict of metric name to current value / distribution
+    """
+    return metrics.snapshot(prefix)
+
+
+@router.get("/db/pool")
+async def get_db_pool():
+    """
+    Get the DB pool state for this worker.
+    
+    Returns:
+        Pool size/occupancy, adaptive limiter state (if enabled) and
+        db.pool.* metrics (wait/hold time, overflow, timeouts, invalidations)
+    """
+    return pool_status(create_db_engine(settings["DATABASE_URL"]))
+
+
+@router.get("/export")
+async def export_conversations(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    export_format: Annotated[Literal["ndjson", "columnar"], Query(alias="format")] = "ndjson",
+    chunk_size: Annotated[int, Query(ge=1, le=50000)] = 1000,
+):
+    """
+    Stream all conversations joined with their messages (hot and archived).
+    
+    Args:
+        since: Only messages created at or after this time
+        until: Only messages created before this time
+        format: "ndjson" (one message per line) or "columnar" (column chunks per line)
+        chunk_size: Rows per cursor fetch / columnar chunk
+        
+    Returns:
+        Streaming application/x-ndjson response (constant memory)
+    """
+    return StreamingResponse(
+        stream_export(since, until, export_format, chunk_size),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="conversations.{export_format}.ndjson"'},
+    )
+
+
+@router.get("/profile/cpu", response_class=PlainTextResponse, dependencies=[Depends(require_profiling)])
+async def profile_cpu(
+    seconds: ProfileSeconds = 10,
+    interval_ms: Annotated[float, Query(ge=1, le=1000)] = 10,
+    idle: bool = False,
+):
+    """
+    Sample the stacks of every thread of this worker for `seconds`.
+    
+    Args:
+        seconds: Sampling window (at most PROFILING_MAX_SECONDS)
+        interval_ms: Time between samples
+        idle: Keep samples of threads blocked waiting (lock, queue, selector)
+        
+    Returns:
+        Collapsed stacks ("thread:name;file:function;... count" per line),
+        ready for flamegraph.pl / speedscope
+    """
+    sampler = CpuSampler(interval_ms / 1000, include_idle=idle)
+    sampler.start()
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        sampler.stop()
+    return PlainTextResponse(
+        sampler.collapsed(),
+        headers={
+            "X-Profile-Samples": str(sampler.samples),
+            "X-Profile-Seconds": f"{sampler.elapsed:.3f}",
+        },
+    )
+
+
+@router.get("/profile/memory", dependencies=[Depends(require_profiling)])
+async def profile_memory(
+    seconds: ProfileSeconds = 10,
+    by: Literal["app", "allocator"] = "app",
+    top: Annotated[int, Query(ge=1, le=500)] = 30,
+):
+    """
+    Trace allocations for `seconds` and diff the snapshots by module.
+    
+    Args:
+        seconds: Tracing window (at most PROFILING_MAX_SECONDS)
+        by: Charge allocations to the innermost project file ("app") or
+            to the module that allocated ("allocator", e.g. "langgraph")
+        top: Modules to return, largest growth first
+        
+    Returns:
+        Dict with traced/peak memory, total growth and per-module
+        size/count diffs of memory allocated during the window and still alive
+    """
+    tracer = MemoryTracer(settings["PROFILING_TRACEMALLOC_FRAMES"])
+    await run_in_threadpool(tracer.start)
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        report = await run_in_threadpool(tracer.stop, by, top)
+    return report
@@ -0,0 +1,23 @@
+# 📁 apis/health_api.py
+# Liveness and readiness probes
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from src.services.warmup import get_warmup
+
+
+router = APIRouter(tags=["Health"])
+
+
+@router.get("/health")
+async def health():
+    """Liveness: the process is up and serving HTTP."""
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+async def ready():
+    """Readiness: 200 only after warm-up finished, 503 (with step status) before."""
+    status = get_warmup().status()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
@@ -1,12 +1,15 @@
 # 📁 apis/travel_api.py
 # API endpoints for travel agent
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
+from fastapi.concurrency import run_in_threadpool
 from uuid import UUID
 
+from src.core.admission import Priority, admit
 from src.core.deps import db_dependency
-from src.services import process_chat_message, get_all_messages, get_or_create_summary
-from src.models.schema import ChatRequest, ChatResponse, MessageHistoryResponse
+from src.services import process_chat_message, get_all_messages, get_more_results, get_or_create_summary
+from src.models.schema import ChatRequest, ChatResponse, MessageHistoryResponse, PriceWatchListResponse
+from src.services.price_watch import list_watches, remove_watch
 from src.exceptions import TravelAgentError
 
 
@@ -37,16 +40,21 @@ async def chat(request: ChatRequest, db: db_dependency):
         ChatResponse with AI response and session_id
     """
     try:
-        result, session_id = process_chat_message(
-            db, 
-            request.message, 
-            request.session_id
-        )
+        async with admit(Priority.CHAT):
+            # Run the blocking agent workflow off the event loop
+            result, session_id = await run_in_threadpool(
+                process_chat_message,
+                db, 
+                request.message, 
+                request.session_id
+            )
         return ChatResponse(
             response=result["response"],
             session_id=session_id
         )
         
+    except TravelAgentError:
+        raise
     except Exception as e:
         raise TravelAgentError(
             message=f"Error processing message: {str(e)}",
@@ -55,6 +63,36 @@ async def chat(request: ChatRequest, db: db_dependency):
         ) from e
 
 
+@router.get("/more/{session_id}", response_model=ChatResponse)
+async def get_more(session_id: UUID, count: int = Query(5, ge=1, le=20)):
+    """
+    Show more results of the session's last search ("Show more" button).
+    
+    Served from the per-session result cache or the next upstream page;
+    no LLM call and no repeated search.
+    
+    Args:
+        session_id: UUID of the conversation session
+        count: Number of results to return
+        
+    Returns:
+        ChatResponse with the next results in the chat response format
+    """
+    try:
+        async with admit(Priority.CHAT):
+            response = await run_in_threadpool(get_more_results, session_id, count)
+        return ChatResponse(response=response, session_id=session_id)
+        
+    except TravelAgentError:
+        raise
+    except Exception as e:
+        raise TravelAgentError(
+            message=f"Error fetching more results: {str(e)}",
+            error_code="MORE_RESULTS_ERROR",
+            status_code=500,
+        ) from e
+
+
 @router.get("/history/{session_id}", response_model=MessageHistoryResponse)
 async def get_history(session_id: UUID, db: db_dependency):
     """
@@ -68,17 +106,70 @@ async def get_history(session_id: UUID, db: db_dependency):
         MessageHistoryResponse with all messages for that session
     """
     try:
-        # Get the conversation summary record
-        summary = get_or_create_summary(db, session_id)
-        
-        # Get all messages for this conversation
-        messages = get_all_messages(db, summary.id)
+        async with admit(Priority.HISTORY):
+            # Get the conversation summary record
+            summary = await run_in_threadpool(get_or_create_summary, db, session_id)
+            
+            # Get all messages for this conversation
+            messages = await run_in_threadpool(get_all_messages, db, summary.id)
         
         return MessageHistoryResponse(messages=messages)
         
+    except TravelAgentError:
+        raise
     except Exception as e:
         raise TravelAgentError(
             message=f"Error fetching history: {str(e)}",
             error_code="HISTORY_FETCH_ERROR",
             status_code=500,
         ) from e
+
+
+@router.get("/watches/{session_id}", response_model=PriceWatchListResponse)
+async def get_watches(session_id: UUID, db: db_dependency):
+    """
+    List the active price watches of a conversation.
+    
+    Args:
+        session_id: UUID of the conversation session
+        db: Database session
+        
+    Returns:
+        PriceWatchListResponse with each watch and its latest known price
+    """
+    try:
+        async with admit(Priority.HISTORY):
+            watches = await run_in_threadpool(list_watches, db, session_id)
+        return PriceWatchListResponse(watches=watches)
+        
+    except TravelAgentError:
+        raise
+    except Exception as e:
+        raise TravelAgentError(
+            message=f"Error fetching price watches: {str(e)}",
+            error_code="PRICE_WATCH_FETCH_ERROR",
+            status_code=500,
+        ) from e
+
+
+@router.delete("/watches/{session_id}/{watch_id}", status_code=204)
+async def delete_watch(session_id: UUID, watch_id: int, db: db_dependency):
+    """
+    Stop a price watch of a conversation.
+    
+    Args:
+        session_id: UUID of the conversation session
+        watch_id: ID of the watch to stop
+        db: Database session
+    """
+    try:
+        await run_in_threadpool(remove_watch, db, session_id, watch_id)
+        
+    except TravelAgentError:
+        raise
+    except Exception as e:
+        raise TravelAgentError(
+            message=f"Error removing price watch: {str(e)}",
+            error_code="PRICE_WATCH_DELETE_ERROR",
+            status_code=500,
+        ) from e
@@ -0,0 +1,190 @@
+# 📁 core/admission.py
+# Adaptive admission control / load shedding for request handlers
+
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import AsyncIterator, List, Optional, Tuple
+
+from src.core import settings
+from src.core.aimd import AimdLimit
+from src.core.metrics import metrics
+from src.exceptions import TravelAgentError
+
+
+class Priority(IntEnum):
+    """Admission priority (lower value is served first)."""
+
+    HISTORY = 0
+    CHAT = 1
+
+
+class AdmissionController:
+    """
+    Bounded in-flight limit with a short priority queue (per worker).
+
+    Requests over the limit wait in a priority queue for at most
+    `queue_timeout` seconds; when the queue is full or the wait expires the
+    request is shed with a 503 and a Retry-After hint, instead of piling up
+    and holding DB connections.
+
+    The limit adapts AIMD-style (see AimdLimit): completions under
+    `latency_target` raise it, slow or failed ones cut it by `backoff`.
+
+    All methods run on the event loop thread, so no locking is needed.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        max_queue: int,
+        queue_timeout: float,
+        latency_target: float,
+        backoff: float = 0.8,
+    ):
+        self._aimd = AimdLimit(
+            initial_limit, min_limit, max_limit, latency_target, backoff, gauge="admission.limit"
+        )
+        self._max_queue = max_queue
+        self._queue_timeout = queue_timeout
+
+        self._in_flight = 0
+        self._queue: List[Tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._latency_ewma = 0.0
+
+    @property
+    def limit(self) -> int:
+        return self._aimd.limit
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for _, _, fut in self._queue if not fut.done())
+
+    # --------------------------------------------------------------
+    # Acquire / release
+    # --------------------------------------------------------------
+
+    def _reject(self, reason: str) -> TravelAgentError:
+        metrics.counter(f"admission.rejected.{reason}").inc()
+        retry_after = min(max(1, math.ceil(self._latency_ewma)), 30)
+        return TravelAgentError(
+            message="Server is busy, please retry shortly",
+            error_code="SERVER_OVERLOADED",
+            status_code=503,
+            headers={"Retry-After": str(retry_after)},
+        )
+
+    async def acquire(self, priority: Priority) -> None:
+        if self._in_flight < self.limit and not self.queued:
+            self._in_flight += 1
+            metrics.gauge("admission.in_flight").set(self._in_flight)
+            return
+
+        if self.queued >= self._max_queue:
+            raise self._reject("queue_full")
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (int(priority), next(self._seq), future))
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self._queue_timeout)
+        except asyncio.TimeoutError:
+            if future.done() and not future.cancelled():
+                # Granted at the same moment the wait expired: keep the slot
+                pass
+            else:
+                future.cancel()
+                raise self._reject("queue_timeout")
+        except asyncio.CancelledError:
+            # Client went away while queued; give back a slot if we got one
+            if future.done() and not future.cancelled():
+                self._release()
+            else:
+                future.cancel()
+            raise
+        finally:
+            metrics.histogram("admission.queue_wait_seconds").observe(time.perf_counter() - started)
+
+    def _release(self) -> None:
+        self._in_flight -= 1
+        while self._queue and self._in_flight < self.limit:
+            _, _, future = heapq.heappop(self._queue)
+            if future.done():
+                continue
+            future.set_result(None)
+            self._in_flight += 1
+        metrics.gauge("admission.in_flight").set(self._in_flight)
+
+    def _record(self, latency: float, ok: bool) -> None:
+        self._latency_ewma = latency if not self._latency_ewma else 0.8 * self._latency_ewma + 0.2 * latency
+        self._aimd.record(latency, ok)
+        metrics.histogram("admission.latency_seconds").observe(latency)
+
+    @asynccontextmanager
+    async def admit(self, priority: Priority) -> AsyncIterator[None]:
+        """
+        Hold an admission slot for the duration of the block.
+
+        Raises:
+            TravelAgentError: 503 SERVER_OVERLOADED when the request is shed
+        """
+        await self.acquire(priority)
+        metrics.counter(f"admission.admitted.{priority.name.lower()}").inc()
+        started = time.perf_counter()
+        ok = False
+        try:
+            yield
+            ok = True
+        except TravelAgentError as e:
+            # Client errors say nothing about server health
+            ok = (e.status_code or 400) < 500
+            raise
+        finally:
+            self._record(time.perf_counter() - started, ok)
+            self._release()
+
+
+# ------------------------------------------------------------------
+# 🚀 Lazy singleton
+# ------------------------------------------------------------------
+
+_ADMISSION_CONTROLLER: Optional[AdmissionController] = None
+
+
+def get_admission_controller() -> Optional[AdmissionController]:
+    """Get the worker's admission controller, or None when disabled."""
+    global _ADMISSION_CONTROLLER
+    if not settings["ADMISSION_ENABLED"]:
+        return None
+    if _ADMISSION_CONTROLLER is None:
+        _ADMISSION_CONTROLLER = AdmissionController(
+            initial_limit=settings["ADMISSION_INITIAL_LIMIT"],
+            min_limit=settings["ADMISSION_MIN_LIMIT"],
+            max_limit=settings["ADMISSION_MAX_LIMIT"],
+            max_queue=settings["ADMISSION_MAX_QUEUE"],
+            queue_timeout=settings["ADMISSION_QUEUE_TIMEOUT_MS"] / 1000,
+            latency_target=settings["ADMISSION_LATENCY_TARGET_MS"] / 1000,
+        )
+    return _ADMISSION_CONTROLLER
+
+
+@asynccontextmanager
+async def admit(priority: Priority) -> AsyncIterator[None]:
+    """Admission-controlled block (no-op when admission control is disabled)."""
+    controller = get_admission_controller()
+    if controller is None:
+        yield
+        return
+    async with controller.admit(priority):
+        yield
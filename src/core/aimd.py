@@ -0,0 +1,55 @@
+# 📁 core/aimd.py
+# Additive-increase / multiplicative-decrease concurrency limit
+
+from src.core.metrics import metrics
+
+
+class AimdLimit:
+    """
+    Concurrency limit that follows observed latency.
+
+    Every completion under `latency_target` adds 1/limit (about +1 per
+    round trip of the whole window), while a slow or failed completion cuts
+    the limit by `backoff`, at most once per window so one burst of slow
+    calls cannot collapse it. The limit stays within [min_limit, max_limit].
+
+    Not thread-safe: callers record completions under their own lock (or
+    on a single thread).
+    """
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        latency_target: float,
+        backoff: float = 0.8,
+        gauge: str = "",
+    ):
+        self._limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self._backoff = backoff
+        self._gauge = gauge
+        self._completions_since_decrease = 0
+
+        if gauge:
+            metrics.gauge(gauge).set(self._limit)
+
+    @property
+    def limit(self) -> int:
+        return max(int(self._limit), self.min_limit)
+
+    def record(self, latency: float, ok: bool = True) -> None:
+        """Adjust the limit for one completion that took `latency` seconds."""
+        self._completions_since_decrease += 1
+        if not ok or latency > self.latency_target:
+            if self._completions_since_decrease >= self.limit:
+                self._limit = max(self.min_limit, self._limit * self._backoff)
+                self._completions_since_decrease = 0
+        else:
+            self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+
+        if self._gauge:
+            metrics.gauge(self._gauge).set(self._limit)
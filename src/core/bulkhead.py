@@ -0,0 +1,197 @@
+# 📁 core/bulkhead.py
+# Per-dependency concurrency limits (bulkheads) for LLM, SerpAPI and DB work
+
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional, TypeVar
+
+from src.core import settings
+from src.core.deadline import time_remaining
+from src.core.metrics import metrics
+from src.exceptions import TravelAgentError
+
+F = TypeVar("F", bound=Callable)
+
+BULKHEADS = ("llm", "serpapi", "db")
+
+
+class Bulkhead:
+    """
+    Bounded concurrency into one dependency, with a short bounded queue (per worker).
+
+    Calls over `max_concurrent` wait at most `queue_timeout` seconds (or
+    what is left of the request deadline); when `max_queue` callers are
+    already waiting, or the wait expires, the call fails fast with a 503
+    instead of tying up another request thread. A slow SerpAPI can then
+    only occupy its own slots, while DB-only requests such as history
+    reads keep theirs.
+
+    Re-entrant per thread: a guarded function calling another guarded
+    function of the same dependency uses the slot it already holds.
+    """
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int, queue_timeout: float):
+        self.name = name
+        self._max_concurrent = max_concurrent
+        self._max_queue = max_queue
+        self._queue_timeout = queue_timeout
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._waiting = 0
+        self._held = threading.local()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        return self._waiting
+
+    def _publish(self) -> None:
+        metrics.gauge(f"bulkhead.{self.name}.in_flight").set(self._in_flight)
+        metrics.gauge(f"bulkhead.{self.name}.queued").set(self._waiting)
+        metrics.gauge(f"bulkhead.{self.name}.saturation").set(self._in_flight / self._max_concurrent)
+
+    def _reject(self, reason: str) -> TravelAgentError:
+        metrics.counter(f"bulkhead.{self.name}.rejected").inc()
+        metrics.counter(f"bulkhead.{self.name}.rejected.{reason}").inc()
+        return TravelAgentError(
+            message=f"Too many concurrent {self.name} calls, please retry shortly",
+            error_code="DEPENDENCY_SATURATED",
+            status_code=503,
+            headers={"Retry-After": "1"},
+        )
+
+    def acquire(self, blocking: bool = True) -> bool:
+        """
+        Take a slot outside a `with` block; pair with release().
+
+        Lets a call handed to another thread own the slot until it finishes.
+        Not re-entrant, unlike enter().
+
+        Args:
+            blocking: Wait in the queue for a slot; False returns at once
+
+        Returns:
+            True if a slot is held (always True when blocking), False if the
+            bulkhead is full and blocking is False
+
+        Raises:
+            TravelAgentError: 503 DEPENDENCY_SATURATED when no slot is free in time
+        """
+        with self._cond:
+            if self._in_flight < self._max_concurrent and not self._waiting:
+                self._in_flight += 1
+                self._publish()
+                metrics.counter(f"bulkhead.{self.name}.calls").inc()
+                return True
+            if not blocking:
+                return False
+            if self._waiting >= self._max_queue:
+                raise self._reject("queue_full")
+
+            timeout = self._queue_timeout
+            remaining = time_remaining()
+            if remaining is not None:
+                timeout = min(timeout, remaining)
+            started = time.perf_counter()
+            give_up_at = time.monotonic() + timeout
+
+            self._waiting += 1
+            self._publish()
+            try:
+                while self._in_flight >= self._max_concurrent:
+                    wait = give_up_at - time.monotonic()
+                    if wait <= 0:
+                        raise self._reject("queue_timeout")
+                    self._cond.wait(wait)
+                self._in_flight += 1
+            finally:
+                self._waiting -= 1
+                self._publish()
+                metrics.histogram(f"bulkhead.{self.name}.wait_seconds").observe(time.perf_counter() - started)
+        metrics.counter(f"bulkhead.{self.name}.calls").inc()
+        return True
+
+    def release(self) -> None:
+        """Give back a slot taken with acquire()."""
+        with self._cond:
+            self._in_flight -= 1
+            self._publish()
+            self._cond.notify()
+
+    @contextmanager
+    def enter(self) -> Iterator[None]:
+        """
+        Hold a slot for the duration of the block.
+
+        Raises:
+            TravelAgentError: 503 DEPENDENCY_SATURATED when no slot is free in time
+        """
+        depth = getattr(self._held, "depth", 0)
+        if depth:
+            self._held.depth = depth + 1
+            try:
+                yield
+            finally:
+                self._held.depth = depth
+            return
+
+        self.acquire()
+        self._held.depth = 1
+        try:
+            yield
+        finally:
+            self._held.depth = 0
+            self.release()
+
+
+# ------------------------------------------------------------------
+# 🚀 Lazy singletons
+# ------------------------------------------------------------------
+
+_BULKHEADS: Dict[str, Bulkhead] = {}
+_bulkheads_lock = threading.Lock()
+
+
+def get_bulkhead(name: str) -> Optional[Bulkhead]:
+    """Get the bulkhead of a dependency ("llm", "serpapi" or "db"), or None when disabled."""
+    if name not in BULKHEADS:
+        raise ValueError(f"Unknown bulkhead '{name}', expected one of {BULKHEADS}")
+    if not settings["BULKHEAD_ENABLED"]:
+        return None
+    with _bulkheads_lock:
+        if name not in _BULKHEADS:
+            key = name.upper()
+            _BULKHEADS[name] = Bulkhead(
+                name,
+                max_concurrent=settings[f"BULKHEAD_{key}_MAX_CONCURRENT"],
+                max_queue=settings[f"BULKHEAD_{key}_MAX_QUEUE"],
+                queue_timeout=settings["BULKHEAD_QUEUE_TIMEOUT_MS"] / 1000,
+            )
+        return _BULKHEADS[name]
+
+
+@contextmanager
+def bulkhead(name: str) -> Iterator[None]:
+    """Bulkheaded block (no-op when bulkheads are disabled)."""
+    guard = get_bulkhead(name)
+    if guard is None:
+        yield
+        return
+    with guard.enter():
+        yield
+
+
+def bulkheaded(name: str) -> Callable[[F], F]:
+    """Decorator running the whole function inside the `name` bulkhead."""
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with bulkhead(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
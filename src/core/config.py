@@ -21,11 +21,57 @@ def get_settings():
         "DB_MAX_OVERFLOW": int(os.getenv("DB_MAX_OVERFLOW", 10)),
         "DB_POOL_TIMEOUT": int(os.getenv("DB_POOL_TIMEOUT", 30)),
         "DB_POOL_RECYCLE": int(os.getenv("DB_POOL_RECYCLE", 1800)),
+        "DB_ADAPTIVE_POOL": os.getenv("DB_ADAPTIVE_POOL", "false").lower() == "true",
+        "DB_ADAPTIVE_MIN_CONCURRENCY": int(os.getenv("DB_ADAPTIVE_MIN_CONCURRENCY", 2)),
+        "DB_ADAPTIVE_LATENCY_TARGET_MS": int(os.getenv("DB_ADAPTIVE_LATENCY_TARGET_MS", 100)),
+        "DB_AUTO_CREATE": os.getenv("DB_AUTO_CREATE", "false").lower() == "true",
+        "MESSAGE_WRITE_BEHIND": os.getenv("MESSAGE_WRITE_BEHIND", "false").lower() == "true",
+        "MESSAGE_FLUSH_INTERVAL_MS": int(os.getenv("MESSAGE_FLUSH_INTERVAL_MS", 200)),
+        "MESSAGE_FLUSH_BATCH_SIZE": int(os.getenv("MESSAGE_FLUSH_BATCH_SIZE", 200)),
+        "MESSAGE_MAX_PENDING": int(os.getenv("MESSAGE_MAX_PENDING", 2000)),
+        "MESSAGE_ARCHIVE_ENABLED": os.getenv("MESSAGE_ARCHIVE_ENABLED", "false").lower() == "true",
+        "MESSAGE_ARCHIVE_AFTER_DAYS": int(os.getenv("MESSAGE_ARCHIVE_AFTER_DAYS", 30)),
+        "MESSAGE_ARCHIVE_INTERVAL_MINUTES": int(os.getenv("MESSAGE_ARCHIVE_INTERVAL_MINUTES", 60)),
+        "MESSAGE_ARCHIVE_BATCH_SIZE": int(os.getenv("MESSAGE_ARCHIVE_BATCH_SIZE", 1000)),
 
         # 🌐 Server
         "SERVER_HOST": os.getenv("SERVER_HOST", "localhost"),
         "SERVER_PORT": int(os.getenv("SERVER_PORT", 8080)),
         "SERVER_DEBUG": os.getenv("SERVER_DEBUG", "false").lower() == "true",
+        "ADMIN_API_KEY": os.getenv("ADMIN_API_KEY"),
+
+        # 🔥 Warm-up
+        "WARMUP_ENABLED": os.getenv("WARMUP_ENABLED", "true").lower() == "true",
+        "WARMUP_DB_CONNECTIONS": int(os.getenv("WARMUP_DB_CONNECTIONS", os.getenv("DB_POOL_SIZE", 5))),
+        "WARMUP_TIMEOUT_S": float(os.getenv("WARMUP_TIMEOUT_S", 5)),
+        "WARMUP_RETRY_INTERVAL_S": float(os.getenv("WARMUP_RETRY_INTERVAL_S", 5)),
+
+        # 🚦 Admission Control (per worker)
+        "ADMISSION_ENABLED": os.getenv("ADMISSION_ENABLED", "false").lower() == "true",
+        "ADMISSION_INITIAL_LIMIT": int(os.getenv("ADMISSION_INITIAL_LIMIT", 16)),
+        "ADMISSION_MIN_LIMIT": int(os.getenv("ADMISSION_MIN_LIMIT", 2)),
+        "ADMISSION_MAX_LIMIT": int(os.getenv("ADMISSION_MAX_LIMIT", 64)),
+        "ADMISSION_MAX_QUEUE": int(os.getenv("ADMISSION_MAX_QUEUE", 32)),
+        "ADMISSION_QUEUE_TIMEOUT_MS": int(os.getenv("ADMISSION_QUEUE_TIMEOUT_MS", 2000)),
+        "ADMISSION_LATENCY_TARGET_MS": int(os.getenv("ADMISSION_LATENCY_TARGET_MS", 20000)),
+
+        # 🧱 Bulkheads (per worker, per dependency)
+        "BULKHEAD_ENABLED": os.getenv("BULKHEAD_ENABLED", "false").lower() == "true",
+        "BULKHEAD_LLM_MAX_CONCURRENT": int(os.getenv("BULKHEAD_LLM_MAX_CONCURRENT", 32)),
+        "BULKHEAD_LLM_MAX_QUEUE": int(os.getenv("BULKHEAD_LLM_MAX_QUEUE", 32)),
+        "BULKHEAD_SERPAPI_MAX_CONCURRENT": int(os.getenv("BULKHEAD_SERPAPI_MAX_CONCURRENT", 16)),
+        "BULKHEAD_SERPAPI_MAX_QUEUE": int(os.getenv("BULKHEAD_SERPAPI_MAX_QUEUE", 16)),
+        "BULKHEAD_DB_MAX_CONCURRENT": int(os.getenv(
+            "BULKHEAD_DB_MAX_CONCURRENT",
+            int(os.getenv("DB_POOL_SIZE", 5)) + int(os.getenv("DB_MAX_OVERFLOW", 10)),
+        )),
+        "BULKHEAD_DB_MAX_QUEUE": int(os.getenv("BULKHEAD_DB_MAX_QUEUE", 32)),
+        "BULKHEAD_QUEUE_TIMEOUT_MS": int(os.getenv("BULKHEAD_QUEUE_TIMEOUT_MS", 1000)),
+
+        # 🔬 Profiling (admin endpoints)
+        "PROFILING_ENABLED": os.getenv("PROFILING_ENABLED", "false").lower() == "true",
+        "PROFILING_MAX_SECONDS": int(os.getenv("PROFILING_MAX_SECONDS", 60)),
+        "PROFILING_TRACEMALLOC_FRAMES": int(os.getenv("PROFILING_TRACEMALLOC_FRAMES", 16)),
 
         # 📦 Application
         "APP_NAME": os.getenv("APP_NAME", "Travel Agent"),
@@ -36,7 +82,73 @@ def get_settings():
         ),
         
         # 🤖 Agent Configuration
+        "REQUEST_TIMEOUT_S": float(os.getenv("REQUEST_TIMEOUT_S", 60)),
+        "AGENT_MAX_TOOL_ITERATIONS": int(os.getenv("AGENT_MAX_TOOL_ITERATIONS", 4)),
+        "AGENT_MIN_STEP_S": float(os.getenv("AGENT_MIN_STEP_S", 1)),
+        "AGENT_DEADLINE_RESERVE_S": float(os.getenv("AGENT_DEADLINE_RESERVE_S", 2)),
+        "AGENT_TOOL_SELECTION_ENABLED": os.getenv("AGENT_TOOL_SELECTION_ENABLED", "false").lower() == "true",
+        "AGENT_CHECKPOINTS_ENABLED": os.getenv("AGENT_CHECKPOINTS_ENABLED", "false").lower() == "true",
+        "AGENT_CHECKPOINT_MAX_DELTAS": int(os.getenv("AGENT_CHECKPOINT_MAX_DELTAS", 16)),
+        "AGENT_CHECKPOINT_COMPRESS_MIN_BYTES": int(os.getenv("AGENT_CHECKPOINT_COMPRESS_MIN_BYTES", 1024)),
+        "AGENT_CHECKPOINT_CACHED_THREADS": int(os.getenv("AGENT_CHECKPOINT_CACHED_THREADS", 1000)),
+        "AGENT_CHECKPOINT_RETENTION_DAYS": int(os.getenv("AGENT_CHECKPOINT_RETENTION_DAYS", 7)),
+        "AGENT_CHECKPOINT_PRUNE_INTERVAL_MINUTES": int(os.getenv("AGENT_CHECKPOINT_PRUNE_INTERVAL_MINUTES", 60)),
+        "SERPAPI_TIMEOUT_S": float(os.getenv("SERPAPI_TIMEOUT_S", 20)),
+        "LLM_TIMEOUT_S": float(os.getenv("LLM_TIMEOUT_S", 30)),
+        "LLM_MAX_RETRIES": int(os.getenv("LLM_MAX_RETRIES", 2)),
+        "LLM_RETRY_BACKOFF_MS": int(os.getenv("LLM_RETRY_BACKOFF_MS", 250)),
+        "LLM_HEDGING_ENABLED": os.getenv("LLM_HEDGING_ENABLED", "false").lower() == "true",
+        "LLM_HEDGE_MIN_DELAY_MS": int(os.getenv("LLM_HEDGE_MIN_DELAY_MS", 2000)),
+        "LLM_HEDGE_MAX_RATE": float(os.getenv("LLM_HEDGE_MAX_RATE", 0.05)),
+        "LLM_HEDGE_MAX_WORKERS": int(os.getenv("LLM_HEDGE_MAX_WORKERS", 16)),
+
+        # 🧭 LLM Routing (per task; max tokens 0 = model default)
+        "LLM_PLAN_MODEL": os.getenv("LLM_PLAN_MODEL", "gpt-5-mini"),
+        "LLM_PLAN_MAX_TOKENS": int(os.getenv("LLM_PLAN_MAX_TOKENS", 0)),
+        "LLM_PLAN_TIMEOUT_S": float(os.getenv("LLM_PLAN_TIMEOUT_S", 30)),
+        "LLM_RESPOND_MODEL": os.getenv("LLM_RESPOND_MODEL", "gpt-5-mini"),
+        "LLM_RESPOND_MAX_TOKENS": int(os.getenv("LLM_RESPOND_MAX_TOKENS", 0)),
+        "LLM_RESPOND_TIMEOUT_S": float(os.getenv("LLM_RESPOND_TIMEOUT_S", 30)),
+        "LLM_SUMMARIZE_MODEL": os.getenv("LLM_SUMMARIZE_MODEL", "gpt-5-nano"),
+        "LLM_SUMMARIZE_MAX_TOKENS": int(os.getenv("LLM_SUMMARIZE_MAX_TOKENS", 0)),
+        "LLM_SUMMARIZE_TIMEOUT_S": float(os.getenv("LLM_SUMMARIZE_TIMEOUT_S", 30)),
+        "LLM_PROMPT_CACHE_KEY": os.getenv("LLM_PROMPT_CACHE_KEY", "travel-agent"),
         "SUMMARY_UPDATE_THRESHOLD": int(os.getenv("SUMMARY_UPDATE_THRESHOLD", 20)),
+        "SESSION_LOCK_TIMEOUT": float(os.getenv("SESSION_LOCK_TIMEOUT", 120)),
+        "SUMMARY_CHUNK_CHARS": int(os.getenv("SUMMARY_CHUNK_CHARS", 6000)),
+        "SUMMARY_MAP_CONCURRENCY": int(os.getenv("SUMMARY_MAP_CONCURRENCY", 4)),
+        "SUMMARY_MAX_CHUNKS": int(os.getenv("SUMMARY_MAX_CHUNKS", os.getenv("SUMMARY_MAP_CONCURRENCY", 4))),
+
+        # 🧠 Long-term Memory
+        "MEMORY_ENABLED": os.getenv("MEMORY_ENABLED", "false").lower() == "true",
+        "MEMORY_BACKEND": os.getenv("MEMORY_BACKEND", "local"),
+        "MEMORY_TOP_K": int(os.getenv("MEMORY_TOP_K", 5)),
+        "MEMORY_MIN_SCORE": float(os.getenv("MEMORY_MIN_SCORE", 0.3)),
+        "MEMORY_MAX_FACTS_PER_SESSION": int(os.getenv("MEMORY_MAX_FACTS_PER_SESSION", 200)),
+        "MEMORY_EMBEDDING_DIMENSIONS": int(os.getenv("MEMORY_EMBEDDING_DIMENSIONS", 256)),
+        "MEMORY_RECALL_TIMEOUT_S": float(os.getenv("MEMORY_RECALL_TIMEOUT_S", 3)),
+        "MEMORY_PINECONE_INDEX": os.getenv("MEMORY_PINECONE_INDEX", "travel-agent-memory"),
+
+        # ✈️ Search
+        "NEARBY_AIRPORTS_RADIUS_KM": float(os.getenv("NEARBY_AIRPORTS_RADIUS_KM", 150)),
+        "NEARBY_AIRPORTS_MAX_SEARCHES": int(os.getenv("NEARBY_AIRPORTS_MAX_SEARCHES", 4)),
+        "SEARCH_RESULTS_TTL_S": int(os.getenv("SEARCH_RESULTS_TTL_S", 900)),
+        "SEARCH_RESULTS_MAX_SESSIONS": int(os.getenv("SEARCH_RESULTS_MAX_SESSIONS", 1000)),
+        "SEARCH_PAGE_SIZE": int(os.getenv("SEARCH_PAGE_SIZE", 5)),
+        "SPECULATIVE_SEARCH_ENABLED": os.getenv("SPECULATIVE_SEARCH_ENABLED", "false").lower() == "true",
+        "SPECULATIVE_SEARCH_MAX_IN_FLIGHT": int(os.getenv("SPECULATIVE_SEARCH_MAX_IN_FLIGHT", 8)),
+        "SPECULATIVE_SEARCH_TTL_S": float(os.getenv("SPECULATIVE_SEARCH_TTL_S", 300)),
+
+        # 🔔 Price Watch
+        "PRICE_WATCH_ENABLED": os.getenv("PRICE_WATCH_ENABLED", "false").lower() == "true",
+        "PRICE_WATCH_INTERVAL_MINUTES": float(os.getenv("PRICE_WATCH_INTERVAL_MINUTES", 360)),
+        "PRICE_WATCH_JITTER_MINUTES": float(os.getenv("PRICE_WATCH_JITTER_MINUTES", 30)),
+        "PRICE_WATCH_TICK_SECONDS": float(os.getenv("PRICE_WATCH_TICK_SECONDS", 60)),
+        "PRICE_WATCH_MAX_POLLS_PER_HOUR": int(os.getenv("PRICE_WATCH_MAX_POLLS_PER_HOUR", 60)),
+        "PRICE_WATCH_MAX_PER_SESSION": int(os.getenv("PRICE_WATCH_MAX_PER_SESSION", 10)),
+        "PRICE_WATCH_SNAPSHOT_RETENTION_DAYS": int(os.getenv("PRICE_WATCH_SNAPSHOT_RETENTION_DAYS", 7)),
+        "PRICE_WATCH_SINK": os.getenv("PRICE_WATCH_SINK", "log"),
+        "PRICE_WATCH_WEBHOOK_URL": os.getenv("PRICE_WATCH_WEBHOOK_URL"),
     }
 
 # Load settings once
@@ -0,0 +1,82 @@
+# 📁 core/deadline.py
+# Per-request deadline carried in a context variable
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from src.exceptions import TravelAgentError
+
+
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+@contextmanager
+def request_deadline(seconds: float) -> Iterator[float]:
+    """
+    Set a deadline `seconds` from now for everything run inside the block.
+
+    Nested deadlines never extend an outer one.
+
+    Yields:
+        The absolute deadline (time.monotonic() based)
+    """
+    with use_deadline(time.monotonic() + seconds) as deadline:
+        yield deadline
+
+
+@contextmanager
+def use_deadline(deadline: Optional[float]) -> Iterator[Optional[float]]:
+    """
+    Run the block under an absolute deadline, e.g. one carried in agent state.
+
+    Never extends an outer deadline; None keeps the current one.
+
+    Yields:
+        The effective absolute deadline (None if unbounded)
+    """
+    outer = _deadline.get()
+    if deadline is None:
+        deadline = outer
+    elif outer is not None:
+        deadline = min(deadline, outer)
+
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+def get_deadline() -> Optional[float]:
+    """Absolute deadline of the current request, or None if unbounded."""
+    return _deadline.get()
+
+
+def time_remaining() -> Optional[float]:
+    """Seconds left before the current request's deadline, or None if unbounded."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def check_deadline(operation: str) -> Optional[float]:
+    """
+    Ensure the request still has time left before starting an operation.
+
+    Returns:
+        Seconds remaining (None if unbounded)
+
+    Raises:
+        TravelAgentError: 504 DEADLINE_EXCEEDED if the budget is spent
+    """
+    remaining = time_remaining()
+    if remaining is not None and remaining <= 0:
+        raise TravelAgentError(
+            message=f"Request deadline exceeded before {operation}",
+            error_code="DEADLINE_EXCEEDED",
+            status_code=504,
+        )
+    return remaining
@@ -2,11 +2,14 @@ from typing import Annotated
 from fastapi import Depends
 from sqlalchemy.orm import Session
 
-from src.database import get_db_session
-
 
 # DB Dependency
+# The session is request-scoped, but services commit between steps so the
+# underlying pooled connection is only checked out while queries run.
 def get_db():
+    # Imported here: src.database imports src.core, which re-exports this module
+    from src.database import get_db_session
+
     db = get_db_session()
     try:
         yield db
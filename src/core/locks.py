@@ -0,0 +1,74 @@
+# 📁 core/locks.py
+# In-process keyed locks for serializing work per conversation session
+
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Hashable, Iterator
+
+from src.exceptions import TravelAgentError
+
+
+class KeyedLock:
+    """
+    FIFO lock per key.
+
+    Callers for the same key are queued and run one at a time in arrival
+    order; callers for different keys never wait on each other. Queues are
+    dropped as soon as they drain, so memory tracks active keys only.
+    """
+
+    def __init__(self):
+        self._mutex = threading.Lock()
+        self._queues: Dict[Hashable, Deque[threading.Event]] = {}
+
+    def _release(self, key: Hashable, ticket: threading.Event) -> None:
+        with self._mutex:
+            queue = self._queues[key]
+            was_head = queue[0] is ticket
+            queue.remove(ticket)
+            if not queue:
+                del self._queues[key]
+            elif was_head:
+                queue[0].set()
+
+    @contextmanager
+    def hold(self, key: Hashable, timeout: float | None = None) -> Iterator[None]:
+        """
+        Hold the lock for `key` for the duration of the block.
+
+        Args:
+            key: Key to serialize on (e.g. a session id)
+            timeout: Max seconds to wait in the queue (None waits forever)
+
+        Raises:
+            TravelAgentError: If the lock could not be acquired in time
+        """
+        ticket = threading.Event()
+        with self._mutex:
+            queue = self._queues.setdefault(key, deque())
+            queue.append(ticket)
+            if len(queue) == 1:
+                ticket.set()
+
+        if not ticket.wait(timeout):
+            self._release(key, ticket)
+            raise TravelAgentError(
+                message="Another message for this session is still being processed. Please retry.",
+                error_code="SESSION_BUSY",
+                status_code=409,
+            )
+
+        try:
+            yield
+        finally:
+            self._release(key, ticket)
+
+    def waiting(self, key: Hashable) -> int:
+        """Number of callers holding or queued for `key`."""
+        with self._mutex:
+            return len(self._queues.get(key, ()))
+
+
+# Shared lock serializing chat turns per session_id
+session_locks = KeyedLock()
@@ -0,0 +1,147 @@
+# 📁 core/metrics.py
+# Lightweight in-process metrics (counters, gauges, histograms)
+
+import threading
+from collections import deque
+from typing import Any, Deque, Dict
+
+
+RESERVOIR_SIZE = 1024  # recent observations kept per histogram for percentiles
+
+
+# ------------------------------------------------------------------
+# 📈 Metric types
+# ------------------------------------------------------------------
+
+class Counter:
+    """Monotonically increasing count."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._value = 0.0
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def snapshot(self) -> float:
+        return self._value
+
+
+class Gauge:
+    """Value that can go up and down."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._value = 0.0
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self._value = value
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        with self._lock:
+            self._value -= amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def snapshot(self) -> float:
+        return self._value
+
+
+class Histogram:
+    """
+    Distribution of observed values.
+
+    Keeps exact count/sum/min/max and a bounded window of recent
+    observations for percentile estimates.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._count = 0
+        self._sum = 0.0
+        self._min = float("inf")
+        self._max = float("-inf")
+        self._recent: Deque[float] = deque(maxlen=RESERVOIR_SIZE)
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self._count += 1
+            self._sum += value
+            self._min = min(self._min, value)
+            self._max = max(self._max, value)
+            self._recent.append(value)
+
+    def percentile(self, q: float) -> float | None:
+        """Percentile (0-100) over the recent window, or None if empty."""
+        with self._lock:
+            values = sorted(self._recent)
+        if not values:
+            return None
+        rank = min(int(round(q / 100 * (len(values) - 1))), len(values) - 1)
+        return values[rank]
+
+    def snapshot(self) -> Dict[str, Any]:
+        if not self._count:
+            return {"count": 0}
+        return {
+            "count": self._count,
+            "sum": round(self._sum, 6),
+            "avg": round(self._sum / self._count, 6),
+            "min": self._min,
+            "max": self._max,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
+
+
+# ------------------------------------------------------------------
+# 🗂️ Registry
+# ------------------------------------------------------------------
+
+class MetricsRegistry:
+    """Named metrics, created on first use."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Counter | Gauge | Histogram] = {}
+
+    def _get(self, name: str, kind: type):
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.setdefault(name, kind())
+        if not isinstance(metric, kind):
+            raise TypeError(f"Metric '{name}' is a {type(metric).__name__}, not a {kind.__name__}")
+        return metric
+
+    def counter(self, name: str) -> Counter:
+        return self._get(name, Counter)
+
+    def gauge(self, name: str) -> Gauge:
+        return self._get(name, Gauge)
+
+    def histogram(self, name: str) -> Histogram:
+        return self._get(name, Histogram)
+
+    def snapshot(self, prefix: str = "") -> Dict[str, Any]:
+        """Current value of every metric (optionally filtered by name prefix)."""
+        with self._lock:
+            items = sorted(self._metrics.items())
+        return {name: metric.snapshot() for name, metric in items if name.startswith(prefix)}
+
+
+# Process-wide registry
+metrics = MetricsRegistry()
@@ -0,0 +1,297 @@
+# 📁 core/profiling.py
+# On-demand CPU sampling and allocation tracing for the live process
+
+import sys
+import sysconfig
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.core.metrics import metrics
+from src.exceptions import TravelAgentError
+
+
+# ------------------------------------------------------------------
+# 🏷️ Code locations
+# ------------------------------------------------------------------
+
+_PROJECT_ROOT = Path(__file__).resolve().parents[2]
+_STDLIB = Path(sysconfig.get_paths()["stdlib"]).resolve()
+
+_labels: Dict[str, Tuple[str, str]] = {}
+
+
+def _locate(filename: str) -> Tuple[str, str]:
+    """
+    Short path and owning module of a source file.
+
+    Project files are attributed per file (e.g. "src/tools/parsers.py"),
+    installed packages per top-level package (e.g. "langgraph") and the
+    standard library as "stdlib".
+
+    Returns:
+        Tuple of (short path, module)
+    """
+    label = _labels.get(filename)
+    if label is not None:
+        return label
+
+    path = Path(filename)
+    parts = path.parts
+    for marker in ("site-packages", "dist-packages"):
+        if marker in parts:
+            package = parts[parts.index(marker) + 1:]
+            short = "/".join(package)
+            label = (short, package[0].removesuffix(".py") if package else marker)
+            break
+    else:
+        resolved = path.resolve() if path.is_absolute() else path
+        if resolved.is_relative_to(_PROJECT_ROOT):
+            short = resolved.relative_to(_PROJECT_ROOT).as_posix()
+            label = (short, short)
+        elif resolved.is_relative_to(_STDLIB):
+            label = (resolved.relative_to(_STDLIB).as_posix(), "stdlib")
+        elif filename.startswith("<frozen "):
+            label = (filename, "stdlib")
+        else:
+            # <string>, scripts outside the project, ...
+            label = (filename, filename)
+
+    _labels[filename] = label
+    return label
+
+
+def _try_start(lock: threading.Lock, kind: str) -> None:
+    if not lock.acquire(blocking=False):
+        raise TravelAgentError(
+            message=f"A {kind} profile is already running on this worker",
+            error_code="PROFILER_BUSY",
+            status_code=409,
+        )
+
+
+# ------------------------------------------------------------------
+# 🔥 CPU sampling
+# ------------------------------------------------------------------
+
+# Leaf frames of threads that are blocked, not working
+_IDLE_LEAVES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+    ("concurrent/futures/thread.py", "_worker"),
+}
+
+_cpu_lock = threading.Lock()
+
+
+class CpuSampler:
+    """
+    Sampling profiler over every thread of the process.
+
+    A background thread snapshots all Python stacks every `interval`
+    seconds (sys._current_frames) and counts identical stacks. Nothing is
+    hooked into the interpreter, so the process runs unchanged between
+    profiles and the cost while sampling is one stack walk per thread per
+    interval. Only one sampler runs per worker at a time.
+    """
+
+    def __init__(self, interval: float, include_idle: bool = False):
+        self._interval = interval
+        self._include_idle = include_idle
+        self._stacks: Counter = Counter()
+        self._samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started = 0.0
+        self._elapsed = 0.0
+
+    @property
+    def samples(self) -> int:
+        return self._samples
+
+    @property
+    def elapsed(self) -> float:
+        return self._elapsed
+
+    def _sample(self) -> None:
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            stack: List[str] = []
+            leaf: Optional[Tuple[str, str]] = None
+            while frame is not None:
+                short, _module = _locate(frame.f_code.co_filename)
+                if leaf is None:
+                    leaf = (short, frame.f_code.co_name)
+                stack.append(f"{short}:{frame.f_code.co_name}")
+                frame = frame.f_back
+            if not self._include_idle and leaf in _IDLE_LEAVES:
+                continue
+            stack.append(f"thread:{names.get(ident, ident)}")
+            self._stacks[";".join(reversed(stack))] += 1
+        self._samples += 1
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            self._sample()
+
+    def start(self) -> None:
+        """
+        Start sampling in a background thread.
+
+        Raises:
+            TravelAgentError: 409 PROFILER_BUSY when a CPU profile is already running
+        """
+        _try_start(_cpu_lock, "CPU")
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="cpu-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling (idempotent)."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self._elapsed = time.perf_counter() - self._started
+        metrics.counter("profiling.cpu.runs").inc()
+        metrics.counter("profiling.cpu.samples").inc(self._samples)
+        _cpu_lock.release()
+
+    def collapsed(self) -> str:
+        """
+        Samples in collapsed-stack format ("root;...;leaf count" per line).
+
+        Readable by flamegraph.pl, speedscope and inferno; the root frame
+        of every stack is its thread.
+        """
+        return "".join(f"{stack} {count}\n" for stack, count in self._stacks.most_common())
+
+
+# ------------------------------------------------------------------
+# 🧮 Allocation tracing
+# ------------------------------------------------------------------
+
+_memory_lock = threading.Lock()
+
+_TRACE_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def _attribute(traceback: tracemalloc.Traceback, by: str) -> str:
+    """
+    Module charged with an allocation.
+
+    "allocator" charges the frame that allocated; "app" charges the
+    innermost project frame on the traceback (falling back to the
+    allocator), so e.g. memory held by pydantic models built in
+    src/tools/parsers.py is charged to parsers.py.
+    """
+    if by == "app":
+        for frame in reversed(traceback):
+            _short, module = _locate(frame.filename)
+            if module.startswith("src/"):
+                return module
+    # Frames are ordered oldest first
+    return _locate(traceback[-1].filename)[1]
+
+
+class MemoryTracer:
+    """
+    Allocation diff over a time window, grouped by module.
+
+    tracemalloc is started for the window only (unless it was already
+    running, e.g. via PYTHONTRACEMALLOC), so allocations are not traced
+    between profiles. The diff lists memory allocated during the window
+    that is still alive at its end, per module. Only one tracer runs per
+    worker at a time.
+    """
+
+    def __init__(self, frames: int):
+        self._frames = frames
+        self._owns_tracing = False
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._started = 0.0
+
+    def start(self) -> None:
+        """
+        Start tracing and take the baseline snapshot.
+
+        Raises:
+            TravelAgentError: 409 PROFILER_BUSY when a memory profile is already running
+        """
+        _try_start(_memory_lock, "memory")
+        try:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(self._frames)
+                self._owns_tracing = True
+            self._baseline = tracemalloc.take_snapshot().filter_traces(_TRACE_FILTERS)
+            self._started = time.perf_counter()
+        except BaseException:
+            self._release()
+            raise
+
+    def _release(self) -> None:
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+        _memory_lock.release()
+
+    def stop(self, by: str = "app", top: int = 30) -> Dict[str, Any]:
+        """
+        Take the closing snapshot, diff it against the baseline and stop tracing.
+
+        Args:
+            by: "app" (innermost project frame) or "allocator" (allocating frame)
+            top: Modules to return, largest growth first
+
+        Returns:
+            Dict with the window length, traced/peak memory, the total
+            growth and per-module size/count diffs
+        """
+        try:
+            snapshot = tracemalloc.take_snapshot().filter_traces(_TRACE_FILTERS)
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            elapsed = time.perf_counter() - self._started
+            self._release()
+
+        size_diff: Counter = Counter()
+        count_diff: Counter = Counter()
+        size: Counter = Counter()
+        for stat in snapshot.compare_to(self._baseline, "traceback"):
+            module = _attribute(stat.traceback, by)
+            size_diff[module] += stat.size_diff
+            count_diff[module] += stat.count_diff
+            size[module] += stat.size
+        metrics.counter("profiling.memory.runs").inc()
+
+        ranked = sorted(size_diff, key=lambda module: size_diff[module], reverse=True)[:top]
+        return {
+            "seconds": round(elapsed, 3),
+            "attributed_by": by,
+            "traced_bytes": current,
+            "traced_peak_bytes": peak,
+            "size_diff_bytes": sum(size_diff.values()),
+            "modules": [
+                {
+                    "module": module,
+                    "size_diff_bytes": size_diff[module],
+                    "count_diff": count_diff[module],
+                    "size_bytes": size[module],
+                }
+                for module in ranked
+            ],
+        }
@@ -0,0 +1,60 @@
+# 📁 core/scheduler.py
+# Minimal background scheduler for periodic maintenance jobs
+
+import logging
+import random
+import threading
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicJob:
+    """
+    Run a function on a daemon thread every `interval` seconds.
+
+    A random jitter of up to `jitter` seconds is added to each wait so
+    several workers running the same job do not fire in lockstep. Errors
+    are logged and the job keeps its schedule.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[], object],
+        interval: float,
+        jitter: float = 0.0,
+        run_immediately: bool = False,
+    ):
+        self.name = name
+        self._func = func
+        self._interval = interval
+        self._jitter = jitter
+        self._run_immediately = run_immediately
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        if self._run_immediately:
+            self._run_once()
+        while not self._stop.wait(self._interval + random.uniform(0, self._jitter)):
+            self._run_once()
+
+    def _run_once(self) -> None:
+        try:
+            self._func()
+        except Exception:
+            logger.exception("Scheduled job '%s' failed", self.name)
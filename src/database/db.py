@@ -1,10 +1,12 @@
 from collections.abc import Callable
 from typing import Any
 
-from sqlalchemy import Engine, create_engine
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import Connection, Engine, create_engine, event
+from sqlalchemy.orm import Session, SessionTransaction, sessionmaker
 
 from src.core import settings
+from src.core.deadline import check_deadline
+from src.database.pool import AdaptiveLimiter, InstrumentedQueuePool, instrument_pool
 from src.exceptions import TravelAgentError
 
 
@@ -17,6 +19,9 @@ DB_CONFIG = {
     "MAX_OVERFLOW": settings["DB_MAX_OVERFLOW"],
     "POOL_TIMEOUT": settings["DB_POOL_TIMEOUT"],
     "POOL_RECYCLE": settings["DB_POOL_RECYCLE"],
+    "ADAPTIVE": settings["DB_ADAPTIVE_POOL"],
+    "ADAPTIVE_MIN_CONCURRENCY": settings["DB_ADAPTIVE_MIN_CONCURRENCY"],
+    "ADAPTIVE_LATENCY_TARGET_MS": settings["DB_ADAPTIVE_LATENCY_TARGET_MS"],
 }
 
 
@@ -47,6 +52,7 @@ def create_db_engine(
 
     try:
         default_settings = {
+            "poolclass": InstrumentedQueuePool,
             "pool_pre_ping": True,
             "pool_size": DB_CONFIG["POOL_SIZE"],
             "max_overflow": DB_CONFIG["MAX_OVERFLOW"],
@@ -61,6 +67,18 @@ def create_db_engine(
             echo=echo,
             **engine_settings,
         )
+        instrument_pool(engine)
+        if isinstance(engine.pool, InstrumentedQueuePool):
+            engine.pool.max_overflow = engine_settings["max_overflow"]
+
+        if DB_CONFIG["ADAPTIVE"] and isinstance(engine.pool, InstrumentedQueuePool):
+            max_connections = engine.pool.size() + max(engine_settings["max_overflow"], 0)
+            engine.pool.limiter = AdaptiveLimiter(
+                initial_limit=engine.pool.size(),
+                min_limit=min(DB_CONFIG["ADAPTIVE_MIN_CONCURRENCY"], max_connections),
+                max_limit=max_connections,
+                latency_target=DB_CONFIG["ADAPTIVE_LATENCY_TARGET_MS"] / 1000,
+            )
 
         _engine_cache[db_conn_string] = engine
         return engine
@@ -73,6 +91,24 @@ def create_db_engine(
         ) from e
 
 
+# ------------------------------------------------------------------
+# ⏳ Request deadline
+# ------------------------------------------------------------------
+
+def apply_request_deadline(session: Session, transaction: SessionTransaction, connection: Connection) -> None:
+    """
+    Bound each transaction started inside a request by the request's deadline.
+
+    Fails fast once the budget is spent; on Postgres the remaining time also
+    becomes the transaction's statement_timeout. A no-op outside requests
+    (background jobs have no deadline).
+    """
+    remaining = check_deadline("database call")
+    if remaining is not None and connection.dialect.name == "postgresql":
+        # SET LOCAL ends with the transaction
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {max(int(remaining * 1000), 1)}")
+
+
 # ------------------------------------------------------------------
 # 🧵 Session factory (cached sessionmaker)
 # ------------------------------------------------------------------
@@ -95,6 +131,7 @@ def create_db_session(
                 expire_on_commit=expire_on_commit,
                 autoflush=autoflush,
             )
+            event.listen(_sessionmaker_cache[cache_key], "after_begin", apply_request_deadline)
 
         SessionLocal = _sessionmaker_cache[cache_key]
         return SessionLocal()
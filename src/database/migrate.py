@@ -0,0 +1,77 @@
+# 📁 database/migrate.py
+# Schema creation, run as a deploy step instead of on every boot
+
+import logging
+from typing import List, Optional
+
+from sqlalchemy import Engine, inspect, text
+from sqlalchemy.schema import CreateColumn, CreateIndex
+
+from src.core import settings
+from src.database.db import create_db_engine
+
+logger = logging.getLogger(__name__)
+
+
+def _add_missing_columns(connection, metadata) -> List[str]:
+    """
+    Add model columns that existing tables lack (idempotent).
+
+    Tables created by an older release keep their old columns under
+    create_all; e.g. `conversation_summaries.version` (optimistic
+    concurrency) must exist before any summary query runs.
+    """
+    dialect = connection.dialect
+    inspector = inspect(connection)
+    if_not_exists = "IF NOT EXISTS " if dialect.name == "postgresql" else ""
+
+    added = []
+    for table in metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            if not column.nullable and column.server_default is None:
+                raise RuntimeError(
+                    f"Cannot add NOT NULL column {table.name}.{column.name} without a server default"
+                )
+            spec = CreateColumn(column).compile(dialect=dialect)
+            connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {if_not_exists}{spec}"))
+            added.append(f"{table.name}.{column.name}")
+    return added
+
+
+def _create_missing_indexes(connection, metadata) -> None:
+    """Create model indexes that existing tables lack (CREATE INDEX IF NOT EXISTS)."""
+    for table in metadata.sorted_tables:
+        for index in table.indexes:
+            connection.execute(CreateIndex(index, if_not_exists=True))
+
+
+def create_tables(engine: Optional[Engine] = None) -> None:
+    """
+    Create missing tables, then add missing columns and indexes to existing ones.
+
+    Every step is idempotent, so a database created by any earlier
+    release is brought up to the current models. Run once per deploy with
+    `python -m src.database.migrate`, or set DB_AUTO_CREATE=true to run it
+    during warm-up (local development).
+    """
+    from src.models.psql import Base
+
+    engine = engine or create_db_engine(settings["DATABASE_URL"])
+    with engine.begin() as connection:
+        Base.metadata.create_all(bind=connection)
+        added = _add_missing_columns(connection, Base.metadata)
+        _create_missing_indexes(connection, Base.metadata)
+
+    if added:
+        logger.info("Added columns: %s", ", ".join(added))
+    logger.info("Database tables are up to date")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    create_tables()
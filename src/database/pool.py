@@ -0,0 +1,195 @@
+# 📁 database/pool.py
+# Connection pool instrumentation and adaptive DB concurrency
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import Engine, event, exc
+from sqlalchemy.pool import QueuePool
+
+from src.core.aimd import AimdLimit
+from src.core.deadline import time_remaining
+from src.core.metrics import metrics
+
+
+# ------------------------------------------------------------------
+# 🎚️ Adaptive concurrency
+# ------------------------------------------------------------------
+
+class AdaptiveLimiter:
+    """
+    Cap on concurrent DB connection checkouts that follows DB latency.
+
+    The limit is an AimdLimit over connection hold time, the same rule as
+    the admission controller uses for requests. When Postgres slows down, fewer
+    requests hold connections at once and the rest wait here, instead of
+    all of them piling onto the database.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        latency_target: float,
+        backoff: float = 0.8,
+    ):
+        self._cond = threading.Condition()
+        self._aimd = AimdLimit(
+            initial_limit, min_limit, max_limit, latency_target, backoff, gauge="db.pool.adaptive_limit"
+        )
+        self._in_use = 0
+
+    @property
+    def limit(self) -> int:
+        return self._aimd.limit
+
+    def acquire(self, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._in_use >= self.limit:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            self._in_use += 1
+            return True
+
+    def release(self) -> None:
+        with self._cond:
+            self._in_use -= 1
+            self._cond.notify()
+
+    def record(self, latency: float) -> None:
+        with self._cond:
+            previous = self.limit
+            self._aimd.record(latency)
+            if self.limit > previous:
+                self._cond.notify()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "in_use": self._in_use,
+            "min_limit": self._aimd.min_limit,
+            "max_limit": self._aimd.max_limit,
+            "latency_target_ms": self._aimd.latency_target * 1000,
+        }
+
+
+# ------------------------------------------------------------------
+# 🏊 Instrumented pool
+# ------------------------------------------------------------------
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that records checkout wait time, overflow use and timeouts.
+
+    With a `limiter` attached, checkouts also wait for an adaptive
+    concurrency slot (released on checkin, see `instrument_pool`).
+    `max_overflow` keeps the configured overflow for `pool_status`.
+    """
+
+    limiter: Optional[AdaptiveLimiter] = None
+    max_overflow: Optional[int] = None
+
+    def connect(self):
+        started = time.perf_counter()
+        limiter = self.limiter
+        timeout = self._timeout
+        remaining = time_remaining()
+        if remaining is not None:
+            # Do not queue for a slot past the request's deadline
+            timeout = min(timeout, max(remaining, 0))
+        if limiter is not None and not limiter.acquire(timeout):
+            metrics.counter("db.pool.timeouts").inc()
+            raise exc.TimeoutError(
+                f"Adaptive DB concurrency limit of {limiter.limit} reached, "
+                f"connection timed out, timeout {timeout:.2f}"
+            )
+
+        try:
+            connection = super().connect()
+        except BaseException as e:
+            if limiter is not None:
+                limiter.release()
+            if isinstance(e, exc.TimeoutError):
+                metrics.counter("db.pool.timeouts").inc()
+            raise
+
+        if limiter is not None:
+            connection._connection_record.info["limiter_slot"] = True
+        metrics.histogram("db.pool.wait_seconds").observe(time.perf_counter() - started)
+        if self.checkedout() > self.size():
+            metrics.counter("db.pool.overflow_checkouts").inc()
+        metrics.gauge("db.pool.overflow").set(max(self.overflow(), 0))
+        return connection
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        pool = super().recreate()
+        pool.limiter = self.limiter
+        pool.max_overflow = self.max_overflow
+        return pool
+
+
+def instrument_pool(engine: Engine) -> None:
+    """
+    Record pool checkouts, hold time, new connections and invalidations.
+
+    Hold time is measured from checkout to checkin, i.e. how long a request
+    keeps a pooled connection away from everyone else. Failed pre-pings
+    show up as invalidations caused by InvalidatePoolError.
+    """
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        metrics.counter("db.pool.connects").inc()
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checked_out_at"] = time.perf_counter()
+        metrics.counter("db.pool.checkouts").inc()
+        metrics.gauge("db.pool.checked_out").inc()
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        limiter = getattr(engine.pool, "limiter", None)
+        checked_out_at = connection_record.info.pop("checked_out_at", None)
+        if checked_out_at is not None:
+            hold = time.perf_counter() - checked_out_at
+            metrics.histogram("db.pool.hold_seconds").observe(hold)
+            metrics.gauge("db.pool.checked_out").dec()
+            if limiter is not None:
+                limiter.record(hold)
+        if connection_record.info.pop("limiter_slot", False) and limiter is not None:
+            limiter.release()
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.counter("db.pool.invalidations").inc()
+        if isinstance(exception, exc.InvalidatePoolError):
+            metrics.counter("db.pool.pre_ping_failures").inc()
+
+    @event.listens_for(engine, "soft_invalidate")
+    def _on_soft_invalidate(dbapi_connection, connection_record, exception):
+        metrics.counter("db.pool.soft_invalidations").inc()
+
+
+def pool_status(engine: Engine) -> Dict[str, Any]:
+    """Current pool occupancy, adaptive limiter state and pool metrics."""
+    pool = engine.pool
+    limiter = getattr(pool, "limiter", None)
+    status: Dict[str, Any] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": getattr(pool, "max_overflow", None),
+            "timeout": pool.timeout(),
+        })
+    status["adaptive"] = limiter.snapshot() if limiter is not None else None
+    status["metrics"] = metrics.snapshot("db.pool.")
+    return status
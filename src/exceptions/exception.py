@@ -9,10 +9,12 @@ class TravelAgentError(Exception):
         message: str,
         error_code: str | None = None,
         status_code: int | None = None,
+        headers: dict[str, str] | None = None,
     ):
         super().__init__(message)
         self.message = message
         self.error_code = error_code
         self.status_code = status_code
+        self.headers = headers
 
 
@@ -21,4 +21,5 @@ def register_exception_handlers(app: FastAPI) -> None:
                 "errorCode": exc.error_code,
                 "item": [],
             },
+            headers=exc.headers,
         )
@@ -1,2 +1,3 @@
-from .factory import get_openai_model
-_all__ = ["get_openai_model"]
\ No newline at end of file
+from .factory import get_llm_route, get_openai_model, get_task_model
+from .resilience import invoke_llm
+_all__ = ["get_llm_route", "get_openai_model", "get_task_model", "invoke_llm"]
\ No newline at end of file
@@ -1,9 +1,91 @@
 # llms/openai.py
 
+from dataclasses import dataclass
+from typing import Any, Optional, Sequence
+
 from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from src.core import settings
 
 
+# ------------------------------------------------------------------
+# 🧭 Task routing table
+# ------------------------------------------------------------------
+
+LLM_TASKS = ("plan", "respond", "summarize")
+
+
+@dataclass(frozen=True)
+class LLMRoute:
+    """Model settings for one task (see LLM_<TASK>_* settings)."""
+
+    task: str
+    model: str
+    max_tokens: Optional[int]
+    timeout: float
+
+
+def get_llm_route(task: str) -> LLMRoute:
+    """
+    Return the configured route for a task.
+
+    Tasks:
+        plan: tool-calling turn of the travel agent
+        respond: wrapping tool results into the final JSON answer
+        summarize: conversation summarization
+    """
+    if task not in LLM_TASKS:
+        raise ValueError(f"Unknown LLM task '{task}', expected one of {LLM_TASKS}")
+
+    key = task.upper()
+    return LLMRoute(
+        task=task,
+        model=settings[f"LLM_{key}_MODEL"],
+        max_tokens=settings[f"LLM_{key}_MAX_TOKENS"] or None,
+        timeout=settings[f"LLM_{key}_TIMEOUT_S"],
+    )
+
+
+_task_model_cache: dict[tuple, Any] = {}
+
+
+def get_task_model(task: str, tools: Optional[Sequence[Any]] = None):
+    """
+    Create or return a cached chat model for a task, optionally with tools bound.
+
+    Clients are built on first use, so importing an agent does not
+    construct any OpenAI client.
+    """
+    cache_key = (task, tuple(tool.name for tool in tools or ()))
+    if cache_key in _task_model_cache:
+        return _task_model_cache[cache_key]
+
+    route = get_llm_route(task)
+    model_kwargs = {}
+    if settings["LLM_PROMPT_CACHE_KEY"]:
+        # Routes requests sharing a prompt prefix to the same cache
+        model_kwargs["prompt_cache_key"] = f"{settings['LLM_PROMPT_CACHE_KEY']}:{task}"
+
+    model = ChatOpenAI(
+        model=route.model,
+        temperature=0,
+        api_key=settings["OPENAI_API_KEY"],
+        timeout=route.timeout,
+        max_tokens=route.max_tokens,
+        # Retries are handled by src.llms.resilience.invoke_llm
+        max_retries=0,
+        model_kwargs=model_kwargs,
+    )
+    if tools:
+        model = model.bind_tools(list(tools))
+
+    _task_model_cache[cache_key] = model
+    return model
+
+
+# ------------------------------------------------------------------
+# 🤖 Default models
+# ------------------------------------------------------------------
+
 def get_openai_model():
     """
     Create and return an OpenAI chat model instance using ChatOpenAI.
@@ -15,16 +97,26 @@ def get_openai_model():
     return ChatOpenAI(
         model="gpt-5-mini",
         temperature=0,
-        api_key=settings["OPENAI_API_KEY"]
+        api_key=settings["OPENAI_API_KEY"],
+        timeout=settings["LLM_TIMEOUT_S"],
+        # Retries are handled by src.llms.resilience.invoke_llm
+        max_retries=0,
     )
 
 
-def get_openai_embedding_model():
+def get_openai_embedding_model(dimensions: Optional[int] = None, timeout: Optional[float] = None):
     """
     Returns an OpenAI embedding model.
     Used for converting text into vectors in RAG.
+
+    Args:
+        dimensions: Shortened output size (text-embedding-3 models), or the full 1536
+        timeout: Request timeout in seconds
     """
     return OpenAIEmbeddings(
         model="text-embedding-3-small",
-        api_key=settings["OPENAI_API_KEY"]
+        api_key=settings["OPENAI_API_KEY"],
+        dimensions=dimensions,
+        timeout=timeout,
+        max_retries=1,
     )
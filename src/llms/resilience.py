@@ -0,0 +1,300 @@
+# 📁 llms/resilience.py
+# Deadline-aware LLM invocation with retries and optional hedged requests
+
+import contextvars
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Optional
+
+import openai
+
+from src.core import settings
+from src.core.bulkhead import bulkhead, get_bulkhead
+from src.core.deadline import check_deadline, time_remaining
+from src.core.metrics import metrics
+from src.exceptions import TravelAgentError
+
+
+RETRYABLE_ERRORS = (
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+    TimeoutError,
+)
+
+DEADLINE_MARGIN = 0.25  # seconds kept back for work after the LLM call
+
+
+# ------------------------------------------------------------------
+# 🪣 Hedge budget
+# ------------------------------------------------------------------
+
+class HedgeBudget:
+    """
+    Token bucket capping hedged requests to a fraction of all calls.
+
+    Every call deposits `max_rate` tokens (up to `burst`); a hedge spends
+    one. With max_rate=0.05 at most ~5% of calls are duplicated.
+    """
+
+    def __init__(self, max_rate: float, burst: float = 5.0):
+        self._lock = threading.Lock()
+        self._max_rate = max_rate
+        self._burst = burst
+        self._tokens = burst
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._tokens = min(self._burst, self._tokens + self._max_rate)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+
+_hedge_budget = HedgeBudget(settings["LLM_HEDGE_MAX_RATE"])
+
+# Runs both requests of a hedged call. Every task holds an "llm" bulkhead
+# slot while it runs, so with bulkheads on a task never waits for a thread
+_hedge_executor = ThreadPoolExecutor(
+    max_workers=(
+        settings["BULKHEAD_LLM_MAX_CONCURRENT"]
+        if settings["BULKHEAD_ENABLED"]
+        else settings["LLM_HEDGE_MAX_WORKERS"]
+    ),
+    thread_name_prefix="llm-hedge",
+)
+
+
+# ------------------------------------------------------------------
+# 🧰 Helpers
+# ------------------------------------------------------------------
+
+def _call_timeout(operation: str, cap: Optional[float] = None) -> float:
+    """Per-attempt timeout: the configured cap, shrunk to the request's remaining budget."""
+    remaining = check_deadline(operation)
+    timeout = cap or settings["LLM_TIMEOUT_S"]
+    if remaining is not None:
+        timeout = min(timeout, remaining - DEADLINE_MARGIN)
+    if timeout <= 0:
+        raise TravelAgentError(
+            message=f"Request deadline exceeded before {operation}",
+            error_code="DEADLINE_EXCEEDED",
+            status_code=504,
+        )
+    return timeout
+
+
+def _hedge_delay(name: str) -> float:
+    """Delay before hedging: recent p95 latency of this route, floored by config."""
+    p95 = metrics.histogram(f"llm.{name}.latency_seconds").percentile(95)
+    floor = settings["LLM_HEDGE_MIN_DELAY_MS"] / 1000
+    return max(p95 or floor, floor)
+
+
+def _record_usage(name: str, response: Any) -> None:
+    """Count input (cached/uncached) and output tokens reported for this call site."""
+    usage = getattr(response, "usage_metadata", None)
+    if not usage:
+        return
+    input_tokens = usage.get("input_tokens", 0)
+    cached_tokens = (usage.get("input_token_details") or {}).get("cache_read") or 0
+    metrics.counter(f"llm.{name}.input_tokens").inc(input_tokens)
+    metrics.counter(f"llm.{name}.cached_input_tokens").inc(cached_tokens)
+    metrics.counter(f"llm.{name}.uncached_input_tokens").inc(input_tokens - cached_tokens)
+    metrics.counter(f"llm.{name}.output_tokens").inc(usage.get("output_tokens", 0))
+    if input_tokens:
+        metrics.histogram(f"llm.{name}.cache_hit_ratio").observe(cached_tokens / input_tokens)
+
+
+def _take_slot(blocking: bool) -> Optional[Callable[[], None]]:
+    """Take an "llm" bulkhead slot for a task on the hedge executor; returns its release, None if full."""
+    guard = get_bulkhead("llm")
+    if guard is None:
+        return lambda: None
+    if not guard.acquire(blocking):
+        return None
+    return guard.release
+
+
+def _submit(llm: Any, messages: Any, timeout: float, kwargs: dict, release: Callable[[], None]) -> Future:
+    """Run llm.invoke on the hedge executor; the task gives back its slot when it finishes."""
+    def run() -> Any:
+        try:
+            return llm.invoke(messages, timeout=timeout, **kwargs)
+        finally:
+            release()
+
+    def on_done(future: Future) -> None:
+        if future.cancelled():
+            # Cancelled before it started, so run() never gives the slot back
+            release()
+
+    ctx = contextvars.copy_context()
+    try:
+        future = _hedge_executor.submit(ctx.run, run)
+    except BaseException:
+        release()
+        raise
+    future.add_done_callback(on_done)
+    return future
+
+
+def _send_hedge(llm: Any, messages: Any, cap: Optional[float], name: str, kwargs: dict) -> Optional[Future]:
+    """Send the duplicate request if an "llm" slot is free right now and the hedge budget allows it."""
+    release = _take_slot(blocking=False)
+    if release is None:
+        metrics.counter(f"llm.{name}.hedges_skipped").inc()
+        return None
+    if not _hedge_budget.try_spend():
+        release()
+        return None
+    try:
+        # A fresh per-attempt timeout, so the hedge is not cut off with the primary
+        timeout = _call_timeout(f"LLM call '{name}'", cap)
+    except TravelAgentError:
+        release()
+        return None
+    metrics.counter(f"llm.{name}.hedges").inc()
+    return _submit(llm, messages, timeout, kwargs, release)
+
+
+def _record_hedge_win(name: str, primary: Future) -> None:
+    """Count a hedge win; the saved latency is observed when the losing primary ends."""
+    metrics.counter(f"llm.{name}.hedge_wins").inc()
+    if primary.done():
+        return
+    won_at = time.monotonic()
+    primary.add_done_callback(
+        lambda _: metrics.histogram(f"llm.{name}.hedge_saved_seconds").observe(time.monotonic() - won_at)
+    )
+
+
+def _invoke_hedged(llm: Any, messages: Any, cap: Optional[float], name: str, kwargs: dict) -> Any:
+    """
+    Send the call, and a duplicate if it is slower than p95; the first success wins.
+
+    Both requests run on the hedge executor, each holding its own "llm"
+    bulkhead slot until it finishes (the primary queues for one, the hedge
+    is skipped if none is free). The loser is cancelled if it has not
+    started, otherwise left to finish in the background.
+    """
+    release = _take_slot(blocking=True)
+    try:
+        timeout = _call_timeout(f"LLM call '{name}'", cap)
+    except BaseException:
+        release()
+        raise
+    primary = _submit(llm, messages, timeout, kwargs, release)
+    started = time.monotonic()
+    deadline = started + timeout
+
+    pending = {primary}
+    hedge = None
+    done, _ = wait(pending, timeout=min(_hedge_delay(name), timeout))
+    if not done:
+        hedge = _send_hedge(llm, messages, cap, name, kwargs)
+        if hedge is not None:
+            pending.add(hedge)
+            deadline = max(deadline, time.monotonic() + timeout)
+
+    errors = []
+    while pending:
+        done, pending = wait(pending, timeout=max(deadline - time.monotonic(), 0), return_when=FIRST_COMPLETED)
+        if not done:
+            raise TimeoutError(f"LLM call '{name}' timed out after {time.monotonic() - started:.1f}s")
+        for future in done:
+            if future.exception() is None:
+                if future is hedge:
+                    _record_hedge_win(name, primary)
+                for loser in pending:
+                    loser.cancel()
+                return future.result()
+            errors.append(future.exception())
+    raise errors[0]
+
+
+# ------------------------------------------------------------------
+# 🚀 Public entry point
+# ------------------------------------------------------------------
+
+def invoke_llm(
+    llm: Any,
+    messages: Any,
+    name: str,
+    hedge: Optional[bool] = None,
+    timeout: Optional[float] = None,
+    **kwargs: Any,
+) -> Any:
+    """
+    Invoke a chat model with a deadline-derived timeout, retries and hedging.
+
+    Each attempt gets min(timeout, time left in the request). Retryable
+    errors (timeouts, connection errors, 429/5xx) are retried up to
+    LLM_MAX_RETRIES times with full-jitter exponential backoff, as long as the
+    request budget allows. With hedging enabled, a duplicate request is sent
+    when the first is slower than the recent p95 for this call site and the
+    first success answers (see _invoke_hedged).
+
+    Args:
+        llm: Chat model (or bound runnable) to invoke
+        messages: Input messages
+        name: Call-site name used for metrics (e.g. "plan", "summarize")
+        hedge: Override LLM_HEDGING_ENABLED for this call
+        timeout: Per-attempt cap (defaults to LLM_TIMEOUT_S)
+        **kwargs: Extra invoke kwargs
+
+    Returns:
+        Model response
+
+    Raises:
+        TravelAgentError: 504 DEADLINE_EXCEEDED when the budget runs out
+    """
+    hedge = settings["LLM_HEDGING_ENABLED"] if hedge is None else hedge
+    cap = timeout
+    max_retries = settings["LLM_MAX_RETRIES"]
+    base_backoff = settings["LLM_RETRY_BACKOFF_MS"] / 1000
+    metrics.counter(f"llm.{name}.calls").inc()
+    _hedge_budget.deposit()
+
+    attempt = 0
+    while True:
+        try:
+            started = time.perf_counter()
+            if hedge:
+                # Each request of the pair holds its own LLM slot (see _invoke_hedged)
+                response = _invoke_hedged(llm, messages, cap, name, kwargs)
+            else:
+                # One LLM slot per attempt; none is held during backoff
+                with bulkhead("llm"):
+                    timeout = _call_timeout(f"LLM call '{name}'", cap)
+                    started = time.perf_counter()
+                    response = llm.invoke(messages, timeout=timeout, **kwargs)
+        except RETRYABLE_ERRORS as e:
+            metrics.counter(f"llm.{name}.errors").inc()
+            if attempt >= max_retries:
+                if isinstance(e, (TimeoutError, openai.APITimeoutError)):
+                    raise TravelAgentError(
+                        message=f"LLM call '{name}' timed out",
+                        error_code="LLM_TIMEOUT",
+                        status_code=504,
+                    ) from e
+                raise
+            attempt += 1
+            metrics.counter(f"llm.{name}.retries").inc()
+            backoff = random.uniform(0, base_backoff * 2 ** attempt)
+            remaining = time_remaining()
+            if remaining is not None:
+                backoff = min(backoff, max(remaining - DEADLINE_MARGIN, 0))
+            time.sleep(backoff)
+            continue
+
+        metrics.histogram(f"llm.{name}.latency_seconds").observe(time.perf_counter() - started)
+        _record_usage(name, response)
+        return response
@@ -8,17 +8,59 @@ from fastapi import APIRouter, FastAPI
 from src.exceptions import register_exception_handlers
 from src.core import settings
 from src.database import create_db_engine
-from src.models.psql import Base
+from src.services.message_writer import get_message_writer
+from src.services.message_archive import get_archive_job
+from src.services.checkpoint_prune import get_checkpoint_prune_job
+from src.services.price_watch import get_price_watch_job
+from src.services.warmup import get_warmup
 from src.apis.travel_api import router as travel_router
+from src.apis.admin_api import router as admin_router
+from src.apis.health_api import router as health_router
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Manage application lifecycle events."""
-    # Get engine and create database tables on startup
-    engine = create_db_engine(settings["DATABASE_URL"])
-    Base.metadata.create_all(bind=engine)
+    # Create the engine (connections open lazily); DDL runs via
+    # `python -m src.database.migrate`, or in warm-up with DB_AUTO_CREATE
+    create_db_engine(settings["DATABASE_URL"])
+    
+    # Fill the DB pool, compile the agent and open API connections in the
+    # background; /ready returns 503 until this finishes
+    warmup = get_warmup()
+    warmup.start()
+    
+    # Start write-behind message persistence (flushes on shutdown)
+    writer = get_message_writer()
+    if writer is not None:
+        writer.start()
+    
+    # Periodically move summarized messages to the archive tier
+    archive_job = get_archive_job()
+    if archive_job is not None:
+        archive_job.start()
+    
+    # Drop agent checkpoint threads of sessions that have gone idle
+    prune_job = get_checkpoint_prune_job()
+    if prune_job is not None:
+        prune_job.start()
+    
+    # Poll watched searches for price drops (one poll per distinct search)
+    price_watch_job = get_price_watch_job()
+    if price_watch_job is not None:
+        price_watch_job.start()
+    
     yield
+    
+    if price_watch_job is not None:
+        price_watch_job.stop()
+    if prune_job is not None:
+        prune_job.stop()
+    if archive_job is not None:
+        archive_job.stop()
+    if writer is not None:
+        writer.stop()
+    warmup.stop()
 
 
 # Create FastAPI app instance
@@ -35,7 +77,9 @@ app = FastAPI(
 register_exception_handlers(app)
 
 # Register routers
+app.include_router(health_router)
 app.include_router(travel_router)
+app.include_router(admin_router)
 
 
 
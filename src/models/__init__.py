@@ -1,3 +1,3 @@
-from .schema import FlightsInput,FlightsInputSchema,HotelsInput,HotelsInputSchema
+from .schema import FlightsInput,HotelsInput,MoreResultsInput,RefineResultsInput,WatchPriceInput
 
-_all__ = ["FlightsInput","FlightsInputSchema","HotelsInput","HotelsInputSchema"]
\ No newline at end of file
+_all__ = ["FlightsInput","HotelsInput","MoreResultsInput","RefineResultsInput","WatchPriceInput"]
\ No newline at end of file
@@ -1,7 +1,7 @@
 # 📁 models/psql.py
 # SQLAlchemy models for PostgreSQL database
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean
+from sqlalchemy import JSON, Column, Integer, LargeBinary, String, Text, DateTime, Boolean, Float, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.sql import func
@@ -47,6 +47,57 @@ class Message(Base):
         server_default=func.now(),
         nullable=False
     )
+    
+    __table_args__ = (
+        # Per-turn reads only touch the unsummarized tail of a conversation
+        Index(
+            "ix_messages_unsummarized",
+            "conversation_summary_id",
+            "created_at",
+            postgresql_where=text("is_summarized = false"),
+        ),
+        Index("ix_messages_conversation", "conversation_summary_id", "created_at"),
+    )
+
+
+# ------------------------------------------------------------------
+# 🗄️ Archived Messages Table (partitioned by month)
+# ------------------------------------------------------------------
+
+class MessageArchive(Base):
+    """
+    Cold tier for summarized messages.
+    
+    Rows are moved here from `messages` by the archive job once they are
+    summarized and older than MESSAGE_ARCHIVE_AFTER_DAYS. The table is
+    range-partitioned by month on created_at; partitions are created by the
+    job on demand.
+    """
+    
+    __tablename__ = "messages_archive"
+    
+    # Same id as the original row in `messages`
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    
+    conversation_summary_id = Column(Integer, nullable=False)
+    
+    role = Column(String(20), nullable=False)
+    
+    content = Column(Text, nullable=False)
+    
+    # Partition key, so it must be part of the primary key
+    created_at = Column(DateTime(timezone=True), primary_key=True, nullable=False)
+    
+    archived_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+    
+    __table_args__ = (
+        Index("ix_messages_archive_conversation", "conversation_summary_id", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
 
 # ------------------------------------------------------------------
@@ -93,3 +144,273 @@ class ConversationSummary(Base):
         onupdate=func.now(),
         nullable=False
     )
+    
+    version = Column(
+        Integer,
+        nullable=False,
+        default=1,
+        server_default="1",
+        comment="Optimistic concurrency version, bumped on every update"
+    )
+    
+    __mapper_args__ = {"version_id_col": version}
+
+
+# ------------------------------------------------------------------
+# 🔔 Price Watch Tables
+# ------------------------------------------------------------------
+
+class PriceWatch(Base):
+    """
+    One user's request to be told when the price of a search drops.
+    
+    Watchers of the same normalized search share one `price_watch_searches`
+    row, so upstream polls grow with distinct searches, not with watchers.
+    """
+    
+    __tablename__ = "price_watches"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    
+    session_id = Column(UUID(as_uuid=True), nullable=False)
+    
+    search_key = Column(String(64), nullable=False)
+    
+    # Notify when the lowest price is at or below this (None = on any drop)
+    target_price = Column(Float, nullable=True)
+    
+    last_notified_price = Column(Float, nullable=True)
+    
+    active = Column(Boolean, default=True, nullable=False)
+    
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+    
+    __table_args__ = (
+        Index("ix_price_watches_search", "search_key", postgresql_where=text("active = true")),
+        Index("ix_price_watches_session", "session_id"),
+    )
+
+
+class PriceWatchSearch(Base):
+    """
+    A distinct watched search and its polling schedule.
+    
+    `search_key` is a hash of the normalized search parameters.
+    `claimed_until` marks a poll in progress so other workers skip it.
+    """
+    
+    __tablename__ = "price_watch_searches"
+    
+    search_key = Column(String(64), primary_key=True)
+    
+    kind = Column(String(20), nullable=False)
+    
+    search_params = Column(JSON, nullable=False)
+    
+    next_poll_at = Column(DateTime(timezone=True), nullable=False)
+    
+    claimed_until = Column(DateTime(timezone=True), nullable=True)
+    
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+    
+    __table_args__ = (
+        Index("ix_price_watch_searches_due", "next_poll_at"),
+    )
+
+
+class PriceWatchSnapshot(Base):
+    """
+    Prices seen by one poll of a watched search.
+    
+    `prices` maps a result label to its price for the cheapest results;
+    each poll is compared with the previous snapshot.
+    """
+    
+    __tablename__ = "price_watch_snapshots"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    
+    search_key = Column(String(64), nullable=False)
+    
+    min_price = Column(Float, nullable=True)
+    
+    prices = Column(JSON, nullable=False)
+    
+    polled_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+    
+    __table_args__ = (
+        Index("ix_price_watch_snapshots_search", "search_key", "polled_at"),
+        Index("ix_price_watch_snapshots_polled", "polled_at"),
+    )
+
+
+class PriceWatchPoll(Base):
+    """
+    One upstream call made by a price watch poll, successful or not.
+    
+    The global poll budget counts these rows (last hour), so seed snapshots
+    stored without an upstream call are not counted and failed polls are.
+    Rows older than an hour are pruned by the poll job.
+    """
+    
+    __tablename__ = "price_watch_polls"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    
+    search_key = Column(String(64), nullable=False)
+    
+    succeeded = Column(Boolean, nullable=False)
+    
+    polled_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+    
+    __table_args__ = (
+        Index("ix_price_watch_polls_polled", "polled_at"),
+    )
+
+
+# ------------------------------------------------------------------
+# 🧷 Agent Checkpoint Tables
+# ------------------------------------------------------------------
+
+class AgentCheckpoint(Base):
+    """
+    One LangGraph checkpoint of a session's agent thread.
+    
+    Channel values are not stored here but in `agent_checkpoint_blobs`,
+    one row per channel version, so a checkpoint only writes the channels
+    that changed since its parent.
+    """
+    
+    __tablename__ = "agent_checkpoints"
+    
+    thread_id = Column(String(64), primary_key=True)
+    
+    checkpoint_ns = Column(String(255), primary_key=True, default="")
+    
+    checkpoint_id = Column(String(64), primary_key=True)
+    
+    parent_checkpoint_id = Column(String(64), nullable=True)
+    
+    type = Column(String(32), nullable=False)
+    
+    checkpoint = Column(LargeBinary, nullable=False)
+    
+    metadata_type = Column(String(32), nullable=False)
+    
+    # `metadata` is reserved on declarative models
+    checkpoint_metadata = Column("metadata", LargeBinary, nullable=False)
+    
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+    
+    __table_args__ = (
+        Index("ix_agent_checkpoints_created", "created_at"),
+    )
+
+
+class AgentCheckpointBlob(Base):
+    """
+    A serialized channel value at one version.
+    
+    List channels (the message history) are stored as deltas: `base_version`
+    names the version this row extends and `blob` holds only the appended
+    items. `depth` counts the deltas back to a full value.
+    """
+    
+    __tablename__ = "agent_checkpoint_blobs"
+    
+    thread_id = Column(String(64), primary_key=True)
+    
+    checkpoint_ns = Column(String(255), primary_key=True, default="")
+    
+    channel = Column(String(255), primary_key=True)
+    
+    version = Column(String(64), primary_key=True)
+    
+    type = Column(String(32), nullable=False)
+    
+    blob = Column(LargeBinary, nullable=True)
+    
+    base_version = Column(String(64), nullable=True)
+    
+    depth = Column(Integer, nullable=False, default=0)
+
+
+class AgentCheckpointWrite(Base):
+    """Pending writes of a checkpoint's tasks (for resuming an interrupted step)."""
+    
+    __tablename__ = "agent_checkpoint_writes"
+    
+    thread_id = Column(String(64), primary_key=True)
+    
+    checkpoint_ns = Column(String(255), primary_key=True, default="")
+    
+    checkpoint_id = Column(String(64), primary_key=True)
+    
+    task_id = Column(String(64), primary_key=True)
+    
+    idx = Column(Integer, primary_key=True)
+    
+    channel = Column(String(255), nullable=False)
+    
+    type = Column(String(32), nullable=False)
+    
+    blob = Column(LargeBinary, nullable=True)
+    
+    task_path = Column(String(255), nullable=False, default="")
+
+
+# ------------------------------------------------------------------
+# 🧠 Long-term Memory Table
+# ------------------------------------------------------------------
+
+class MemoryFact(Base):
+    """
+    A durable fact about a session's traveller, with its embedding.
+    
+    Used by the "local" memory backend (MEMORY_BACKEND); the Pinecone
+    backend keeps the same facts in one namespace per session instead.
+    """
+    
+    __tablename__ = "memory_facts"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    
+    session_id = Column(UUID(as_uuid=True), nullable=False)
+    
+    # SHA-256 of the normalized text, so a fact is stored once per session
+    fact_key = Column(String(64), nullable=False)
+    
+    text = Column(Text, nullable=False)
+    
+    # Unit-length float32 vector
+    embedding = Column(LargeBinary, nullable=False)
+    
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+    
+    __table_args__ = (
+        Index("ix_memory_facts_session_key", "session_id", "fact_key", unique=True),
+    )
@@ -1,94 +1,145 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Any, Dict, List, Literal, Optional
 from uuid import UUID
 
 
 # -------------------- Flights Models --------------------
 
 class FlightsInput(BaseModel):
-    """Input parameters for Google Flights search via SerpAPI."""
+    """Input parameters for Google Flights search via SerpAPI (also the tool's argument schema)."""
 
     departure_airport: str = Field(
         ...,
-        description="Departure airport IATA code (e.g., DEL, BOM)"
+        description="IATA code or city (e.g. DEL, Mumbai)"
     )
     arrival_airport: str = Field(
         ...,
-        description="Arrival airport IATA code (e.g., AMS, JFK)"
+        description="IATA code or city"
     )
     outbound_date: str = Field(
         ...,
-        description="Outbound date in YYYY-MM-DD format (e.g., 2024-10-01)"
+        description="YYYY-MM-DD"
     )
     return_date: str = Field(
         ...,
-        description="Return date in YYYY-MM-DD format (e.g., 2024-10-07)"
+        description="YYYY-MM-DD"
     )
-    adults: int = Field(
-        ...,
-        description="Number of adult passengers"
-    )
-    children: int = Field(
-        ...,
-        description="Number of child passengers"
-    )
-    infants_in_seat: int = Field(
-        ...,
-        description="Number of infants with a reserved seat"
+    adults: int = 1
+    children: int = 0
+    infants_in_seat: int = 0
+    infants_on_lap: int = 0
+    include_nearby_airports: bool = Field(
+        False,
+        description="Also search neighbouring airports (only if asked)"
     )
-    infants_on_lap: int = Field(
-        ...,
-        description="Number of infants traveling on an adult's lap"
-    )
-
-
-class FlightsInputSchema(BaseModel):
-    """Wrapper schema required for LangChain tool invocation."""
-    params: FlightsInput
 
 
 # -------------------- Hotels Models --------------------
 
 class HotelsInput(BaseModel):
-    """Input parameters for Google Hotels search via SerpAPI."""
+    """Input parameters for Google Hotels search via SerpAPI (also the tool's argument schema)."""
 
     q: str = Field(
         ...,
-        description="City or location to search hotels (e.g., Bengaluru, Goa)"
+        description="City or location (e.g. Goa)"
     )
     check_in_date: str = Field(
         ...,
-        description="Check-in date in YYYY-MM-DD format (e.g., 2026-03-10)"
+        description="YYYY-MM-DD"
     )
     check_out_date: str = Field(
         ...,
-        description="Check-out date in YYYY-MM-DD format (e.g., 2026-03-12)"
+        description="YYYY-MM-DD"
     )
-    adults: int = Field(
-        ...,
-        description="Number of adult guests"
+    adults: int = 1
+    children: int = 0
+    rooms: int = 1
+    sort_by: Optional[int] = Field(
+        None,
+        description="3 = lowest price, 8 = highest rating, 13 = most reviewed; omit for relevance"
     )
-    children: int = Field(
-        ...,
-        description="Number of child guests"
+    hotel_class: Optional[str] = Field(
+        None,
+        description="Star classes, comma-separated (e.g. 4,5); omit for any"
     )
-    rooms: int = Field(
-        ...,
-        description="Number of rooms required"
+
+
+# -------------------- Result Paging Models --------------------
+
+class MoreResultsInput(BaseModel):
+    """Input for showing more results of the previous search."""
+
+    count: int = Field(
+        5,
+        ge=1,
+        le=20,
+        description="Results to show"
     )
-    sort_by: int = Field(
-        ...,
-        description="Sort order (e.g., 8 = highest rating)"
+
+
+class RefineResultsInput(BaseModel):
+    """Input for filtering / re-sorting the previous search's results."""
+
+    max_price: Optional[float] = Field(
+        None,
+        gt=0,
+        description="Max flight price or hotel nightly rate (INR)"
     )
-    hotel_class: str = Field(
-        ...,
-        description="Hotel star class (e.g., 3, 4, 5)"
+    max_stops: Optional[int] = Field(
+        None,
+        ge=0,
+        description="Flights: max stops (0 = non-stop)"
+    )
+    min_rating: Optional[float] = Field(
+        None,
+        ge=0,
+        le=5,
+        description="Hotels: min guest rating"
+    )
+    min_hotel_class: Optional[int] = Field(
+        None,
+        ge=1,
+        le=5,
+        description="Hotels: min star class"
+    )
+    sort_by: Optional[Literal["price", "duration", "stops", "rating", "hotel_class"]] = Field(
+        None,
+        description="price, duration, stops: lowest first; rating, hotel_class: highest first"
+    )
+    count: int = Field(
+        5,
+        ge=1,
+        le=20,
+        description="Results to show"
+    )
+
+
+# -------------------- Price Watch Models --------------------
+
+class WatchPriceInput(BaseModel):
+    """Input for watching the previous search's price."""
+
+    target_price: Optional[float] = Field(
+        None,
+        gt=0,
+        description="Notify at or below this price (INR); omit for any drop"
     )
 
 
-class HotelsInputSchema(BaseModel):
-    """Wrapper schema required for LangChain tool invocation."""
-    params: HotelsInput
+class PriceWatchInfo(BaseModel):
+    """One active price watch of a conversation."""
+    watch_id: int
+    kind: str
+    search_params: Dict[str, Any]
+    target_price: Optional[float] = None
+    current_price: Optional[float] = None
+    last_notified_price: Optional[float] = None
+    created_at: str
+
+
+class PriceWatchListResponse(BaseModel):
+    """Response model for a conversation's price watches."""
+    watches: List[PriceWatchInfo]
 
 
 # -------------------- API Request/Response Models --------------------
@@ -1,6 +1,7 @@
 from .travel_service import (
     process_chat_message, 
     get_all_messages, 
+    get_more_results,
     run_travel_agent,
     get_or_create_summary
 )
@@ -8,6 +9,7 @@ from .travel_service import (
 __all__ = [
     "process_chat_message", 
     "get_all_messages", 
+    "get_more_results",
     "run_travel_agent",
     "get_or_create_summary"
 ]
@@ -0,0 +1,59 @@
+# 📁 services/checkpoint_prune.py
+# Drops agent checkpoint threads of sessions that have gone idle
+
+import logging
+from typing import Optional
+
+from src.core import settings
+from src.core.scheduler import PeriodicJob
+
+logger = logging.getLogger(__name__)
+
+
+def run_checkpoint_prune() -> int:
+    """
+    Delete agent threads idle for longer than AGENT_CHECKPOINT_RETENTION_DAYS.
+
+    Their sessions resume from the stored messages and summary instead.
+    Running it from several workers at once is harmless (deletes are
+    idempotent).
+
+    Returns:
+        Number of threads deleted
+    """
+    # Imported here so the API process only loads LangGraph when the agent is built
+    from src.agents.checkpointer import get_checkpointer
+
+    checkpointer = get_checkpointer()
+    if checkpointer is None:
+        return 0
+    return checkpointer.prune_stale_threads(settings["AGENT_CHECKPOINT_RETENTION_DAYS"])
+
+
+# ------------------------------------------------------------------
+# ⏰ Scheduling
+# ------------------------------------------------------------------
+
+_PRUNE_JOB: Optional[PeriodicJob] = None
+
+
+def get_checkpoint_prune_job() -> Optional[PeriodicJob]:
+    """Get the scheduled checkpoint prune job, or None when checkpoints are disabled."""
+    global _PRUNE_JOB
+    if not settings["AGENT_CHECKPOINTS_ENABLED"]:
+        return None
+    if _PRUNE_JOB is None:
+        interval = settings["AGENT_CHECKPOINT_PRUNE_INTERVAL_MINUTES"] * 60
+        _PRUNE_JOB = PeriodicJob(
+            name="checkpoint-prune",
+            func=run_checkpoint_prune,
+            interval=interval,
+            jitter=interval * 0.1,
+        )
+    return _PRUNE_JOB
+
+
+if __name__ == "__main__":
+    # One-off run, e.g. from cron: python -m src.services.checkpoint_prune
+    logging.basicConfig(level=logging.INFO)
+    run_checkpoint_prune()
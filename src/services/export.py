@@ -0,0 +1,197 @@
+# 📁 services/export.py
+# Streaming bulk export of conversations (summaries joined with messages)
+
+import argparse
+import json
+import sys
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy import literal, select, union_all
+from sqlalchemy.orm import Session
+
+from src.database import get_db_session
+from src.models.psql import ConversationSummary, Message, MessageArchive
+
+
+EXPORT_FORMATS = ("ndjson", "columnar")
+
+EXPORT_COLUMNS = (
+    "session_id",
+    "conversation_summary_id",
+    "summary",
+    "summary_updated_at",
+    "message_id",
+    "role",
+    "content",
+    "created_at",
+    "tier",
+)
+
+
+# ------------------------------------------------------------------
+# 🔎 Query
+# ------------------------------------------------------------------
+
+def _time_filter(column, since: Optional[datetime], until: Optional[datetime]) -> list:
+    conditions = []
+    if since is not None:
+        conditions.append(column >= since)
+    if until is not None:
+        conditions.append(column < until)
+    return conditions
+
+
+def iter_export_rows(
+    session: Session,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    batch_size: int = 1000,
+) -> Iterator[Dict]:
+    """
+    Stream every message (hot and archived) joined with its conversation.
+    
+    Uses a server-side cursor (`stream_results` + `yield_per`), so only
+    `batch_size` rows are held in memory at a time, whatever the dataset size.
+    
+    Args:
+        session: Database session (kept busy until the iterator is exhausted)
+        since: Only messages created at or after this time
+        until: Only messages created before this time
+        batch_size: Rows fetched from the cursor per round trip
+        
+    Yields:
+        One dict per message with the columns in EXPORT_COLUMNS
+    """
+    hot = select(
+        Message.id, Message.conversation_summary_id, Message.role,
+        Message.content, Message.created_at, literal("hot").label("tier"),
+    ).where(*_time_filter(Message.created_at, since, until))
+    
+    cold = select(
+        MessageArchive.id, MessageArchive.conversation_summary_id, MessageArchive.role,
+        MessageArchive.content, MessageArchive.created_at, literal("archive").label("tier"),
+    ).where(*_time_filter(MessageArchive.created_at, since, until))
+    
+    messages = union_all(hot, cold).subquery()
+    
+    stmt = select(
+        ConversationSummary.session_id,
+        ConversationSummary.id.label("conversation_summary_id"),
+        ConversationSummary.summary,
+        ConversationSummary.updated_at.label("summary_updated_at"),
+        messages.c.id.label("message_id"),
+        messages.c.role,
+        messages.c.content,
+        messages.c.created_at,
+        messages.c.tier,
+    ).join(
+        messages, messages.c.conversation_summary_id == ConversationSummary.id
+    ).order_by(
+        ConversationSummary.id, messages.c.created_at, messages.c.id
+    )
+    
+    result = session.execute(
+        stmt,
+        execution_options={"stream_results": True, "yield_per": batch_size},
+    )
+    for row in result.mappings():
+        yield {
+            "session_id": str(row["session_id"]),
+            "conversation_summary_id": row["conversation_summary_id"],
+            "summary": row["summary"],
+            "summary_updated_at": row["summary_updated_at"].isoformat() if row["summary_updated_at"] else None,
+            "message_id": row["message_id"],
+            "role": row["role"],
+            "content": row["content"],
+            "created_at": row["created_at"].isoformat() if row["created_at"] else None,
+            "tier": row["tier"],
+        }
+
+
+# ------------------------------------------------------------------
+# 🧾 Encoders
+# ------------------------------------------------------------------
+
+def encode_ndjson(rows: Iterator[Dict]) -> Iterator[bytes]:
+    """One JSON object per message per line."""
+    for row in rows:
+        yield (json.dumps(row, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def encode_columnar(rows: Iterator[Dict], chunk_size: int = 1000) -> Iterator[bytes]:
+    """
+    Column-oriented chunks, one JSON object per line.
+    
+    Each line is {"rows": n, "columns": {name: [values...]}} for up to
+    `chunk_size` messages, which loads straight into a DataFrame or Arrow
+    table per chunk.
+    """
+    def flush(columns: Dict[str, List], count: int) -> bytes:
+        return (json.dumps({"rows": count, "columns": columns}, ensure_ascii=False) + "\n").encode("utf-8")
+    
+    columns: Dict[str, List] = {name: [] for name in EXPORT_COLUMNS}
+    count = 0
+    for row in rows:
+        for name in EXPORT_COLUMNS:
+            columns[name].append(row[name])
+        count += 1
+        if count >= chunk_size:
+            yield flush(columns, count)
+            columns = {name: [] for name in EXPORT_COLUMNS}
+            count = 0
+    if count:
+        yield flush(columns, count)
+
+
+def stream_export(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    export_format: str = "ndjson",
+    chunk_size: int = 1000,
+) -> Iterator[bytes]:
+    """
+    Export conversations as an encoded byte stream using a dedicated session.
+    
+    The session lives as long as the stream, so the export does not depend
+    on the lifetime of a request-scoped session.
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{export_format}', expected one of {EXPORT_FORMATS}")
+    
+    session = get_db_session()
+    try:
+        rows = iter_export_rows(session, since=since, until=until, batch_size=chunk_size)
+        if export_format == "columnar":
+            yield from encode_columnar(rows, chunk_size)
+        else:
+            yield from encode_ndjson(rows)
+    finally:
+        session.close()
+
+
+# ------------------------------------------------------------------
+# 🖥️ CLI
+# ------------------------------------------------------------------
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export conversations and messages")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="ISO timestamp (inclusive)")
+    parser.add_argument("--until", type=datetime.fromisoformat, help="ISO timestamp (exclusive)")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="ndjson")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--output", default="-", help="Output file (default: stdout)")
+    args = parser.parse_args()
+    
+    out = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    try:
+        for chunk in stream_export(args.since, args.until, args.format, args.chunk_size):
+            out.write(chunk)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+
+
+if __name__ == "__main__":
+    # e.g. python -m src.services.export --since 2026-01-01 --format columnar --output export.ndjson
+    main()
@@ -0,0 +1,128 @@
+# 📁 services/memory.py
+# Long-term memory: facts extracted from summarized turns, recalled by similarity
+
+import logging
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+from uuid import UUID
+
+from src.core import settings
+from src.core.deadline import time_remaining
+from src.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Extraction runs off the request path
+_memory_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="memory")
+
+_EMBEDDINGS = None
+
+
+def _get_embeddings():
+    """Embedding client for memory (created on first use)."""
+    global _EMBEDDINGS
+    if _EMBEDDINGS is None:
+        from src.llms.factory import get_openai_embedding_model
+        _EMBEDDINGS = get_openai_embedding_model(
+            dimensions=settings["MEMORY_EMBEDDING_DIMENSIONS"],
+            timeout=settings["MEMORY_RECALL_TIMEOUT_S"],
+        )
+    return _EMBEDDINGS
+
+
+def _unit(vector: List[float]) -> List[float]:
+    norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+    return [value / norm for value in vector]
+
+
+def _get_store():
+    from src.vectorstore.memory import get_memory_store
+    return get_memory_store()
+
+
+# ------------------------------------------------------------------
+# 🔎 Recall
+# ------------------------------------------------------------------
+
+def recall_facts(session_id: UUID, query: str) -> List[str]:
+    """
+    Facts about the session most relevant to `query`.
+
+    At most MEMORY_TOP_K facts scoring MEMORY_MIN_SCORE or more, best
+    first. Best effort: returns [] when memory is disabled, the session
+    has no facts, too little of the request budget is left, or the
+    embedding/store call fails.
+    """
+    if not settings["MEMORY_ENABLED"]:
+        return []
+
+    remaining = time_remaining()
+    if remaining is not None and remaining < settings["MEMORY_RECALL_TIMEOUT_S"] + settings["AGENT_MIN_STEP_S"]:
+        metrics.counter("memory.recall_skipped").inc()
+        return []
+
+    started = time.perf_counter()
+    try:
+        store = _get_store()
+        if not store.has_facts(session_id):
+            return []
+        vector = _unit(_get_embeddings().embed_query(query))
+        matches = store.search(
+            session_id,
+            vector,
+            top_k=settings["MEMORY_TOP_K"],
+            min_score=settings["MEMORY_MIN_SCORE"],
+        )
+    except Exception:
+        logger.exception("Memory recall failed for session %s", session_id)
+        metrics.counter("memory.recall_errors").inc()
+        return []
+
+    metrics.histogram("memory.recall_seconds").observe(time.perf_counter() - started)
+    metrics.counter("memory.recalled_facts").inc(len(matches))
+    return [text for text, _score in matches]
+
+
+# ------------------------------------------------------------------
+# 💾 Remember
+# ------------------------------------------------------------------
+
+def remember_messages(session_id: UUID, messages: List[Dict[str, str]]) -> int:
+    """
+    Extract durable facts from messages and store them with their embeddings.
+
+    Returns:
+        Number of facts stored
+    """
+    from src.agents.memory_agent import extract_facts
+
+    facts = extract_facts(messages)
+    if not facts:
+        return 0
+    vectors = [_unit(vector) for vector in _get_embeddings().embed_documents(facts)]
+    stored = _get_store().add(session_id, facts, vectors)
+    metrics.counter("memory.facts_stored").inc(stored)
+    return stored
+
+
+def _remember_in_background(session_id: UUID, messages: List[Dict[str, str]]) -> None:
+    try:
+        remember_messages(session_id, messages)
+    except Exception:
+        logger.exception("Fact extraction failed for session %s", session_id)
+        metrics.counter("memory.extract_errors").inc()
+
+
+def schedule_fact_extraction(session_id: UUID, messages: List[Dict[str, str]]) -> None:
+    """
+    Extract facts from messages that are being summarized, off the request path.
+
+    Runs without the request's deadline; facts reach the store a few
+    seconds later and are recalled from the next turn on.
+    """
+    if not settings["MEMORY_ENABLED"] or not messages:
+        return
+    _memory_executor.submit(_remember_in_background, session_id, list(messages))
+
@@ -0,0 +1,181 @@
+# 📁 services/message_archive.py
+# Hot/cold tiering: moves summarized messages into the monthly-partitioned archive
+
+import logging
+import time
+import zlib
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.core import settings
+from src.core.metrics import metrics
+from src.core.scheduler import PeriodicJob
+from src.database import get_db_session
+
+logger = logging.getLogger(__name__)
+
+# Advisory lock key so only one worker archives at a time
+ARCHIVE_LOCK_KEY = zlib.crc32(b"messages_archive")
+
+
+# ------------------------------------------------------------------
+# 🧱 Partitions
+# ------------------------------------------------------------------
+
+def _month_start(value: date) -> date:
+    return value.replace(day=1)
+
+
+def _next_month(value: date) -> date:
+    return (value.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def _try_archive_lock(session: Session) -> bool:
+    """Take the archive advisory lock for the current transaction, without waiting."""
+    return session.execute(
+        text("SELECT pg_try_advisory_xact_lock(:key)"),
+        {"key": ARCHIVE_LOCK_KEY},
+    ).scalar()
+
+
+def ensure_archive_partitions(session: Session, months: Iterable[date]) -> List[str]:
+    """
+    Create the monthly archive partitions for the given months (idempotent).
+
+    Runs in the caller's transaction, which must hold the archive advisory
+    lock (see `_try_archive_lock`), so concurrent workers never race on the
+    same CREATE TABLE.
+
+    Args:
+        session: Database session
+        months: Any date within each month that needs a partition
+
+    Returns:
+        Names of the partitions for those months
+    """
+    partitions = []
+    for start in sorted({_month_start(month) for month in months}):
+        end = _next_month(start)
+        name = f"messages_archive_{start:%Y_%m}"
+        session.execute(text(f"""
+            CREATE TABLE IF NOT EXISTS {name}
+            PARTITION OF messages_archive
+            FOR VALUES FROM ('{start.isoformat()} 00:00:00+00') TO ('{end.isoformat()} 00:00:00+00')
+        """))
+        partitions.append(name)
+    return partitions
+
+
+# ------------------------------------------------------------------
+# 🚚 Archive job
+# ------------------------------------------------------------------
+
+def archive_summarized_messages(
+    session: Session,
+    older_than_days: int,
+    batch_size: int = 1000,
+) -> int:
+    """
+    Move summarized messages older than N days from `messages` to `messages_archive`.
+
+    Each batch is one transaction under an advisory lock: it locks its rows
+    (SKIP LOCKED), creates the partitions for their months, then moves them
+    with a single DELETE ... RETURNING feeding an INSERT, so a row is always
+    in exactly one tier and always has a partition to land in. Concurrent
+    runs from other workers are harmless.
+
+    Args:
+        session: Database session
+        older_than_days: Minimum age of messages to archive
+        batch_size: Rows moved per transaction
+
+    Returns:
+        Number of messages archived
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+    started = time.perf_counter()
+    total = 0
+
+    while True:
+        if not _try_archive_lock(session):
+            session.rollback()
+            logger.info("Message archive already running in another worker; skipping")
+            break
+
+        batch = session.execute(text("""
+            SELECT id, (created_at AT TIME ZONE 'UTC')::date AS day
+            FROM messages
+            WHERE is_summarized = true AND created_at < :cutoff
+            ORDER BY id
+            LIMIT :batch_size
+            FOR UPDATE SKIP LOCKED
+        """), {"cutoff": cutoff, "batch_size": batch_size}).all()
+        if not batch:
+            session.commit()
+            break
+
+        ensure_archive_partitions(session, (row.day for row in batch))
+        moved = session.execute(text("""
+            WITH moved AS (
+                DELETE FROM messages
+                WHERE id = ANY(:ids)
+                RETURNING id, conversation_summary_id, role, content, created_at
+            )
+            INSERT INTO messages_archive (id, conversation_summary_id, role, content, created_at)
+            SELECT id, conversation_summary_id, role, content, created_at FROM moved
+        """), {"ids": [row.id for row in batch]}).rowcount
+        session.commit()
+
+        total += moved
+        if len(batch) < batch_size:
+            break
+
+    metrics.counter("message_archive.archived").inc(total)
+    metrics.histogram("message_archive.run_seconds").observe(time.perf_counter() - started)
+    logger.info(f"Archived {total} summarized messages older than {older_than_days} days")
+    return total
+
+
+def run_message_archive() -> int:
+    """Run one archive pass with a fresh session and configured settings."""
+    session = get_db_session()
+    try:
+        return archive_summarized_messages(
+            session,
+            older_than_days=settings["MESSAGE_ARCHIVE_AFTER_DAYS"],
+            batch_size=settings["MESSAGE_ARCHIVE_BATCH_SIZE"],
+        )
+    finally:
+        session.close()
+
+
+# ------------------------------------------------------------------
+# ⏰ Scheduling
+# ------------------------------------------------------------------
+
+_ARCHIVE_JOB: Optional[PeriodicJob] = None
+
+
+def get_archive_job() -> Optional[PeriodicJob]:
+    """Get the scheduled archive job, or None when archiving is disabled."""
+    global _ARCHIVE_JOB
+    if not settings["MESSAGE_ARCHIVE_ENABLED"]:
+        return None
+    if _ARCHIVE_JOB is None:
+        interval = settings["MESSAGE_ARCHIVE_INTERVAL_MINUTES"] * 60
+        _ARCHIVE_JOB = PeriodicJob(
+            name="message-archive",
+            func=run_message_archive,
+            interval=interval,
+            jitter=interval * 0.1,
+        )
+    return _ARCHIVE_JOB
+
+
+if __name__ == "__main__":
+    # One-off run, e.g. from cron: python -m src.services.message_archive
+    logging.basicConfig(level=logging.INFO)
+    run_message_archive()
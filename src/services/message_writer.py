@@ -0,0 +1,199 @@
+# 📁 services/message_writer.py
+# Write-behind buffer that batches message inserts across requests
+
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from src.core import settings
+from src.core.metrics import metrics
+from src.database import get_db_session
+from src.models.psql import Message
+
+logger = logging.getLogger(__name__)
+
+
+class MessageWriter:
+    """
+    Buffers message rows in memory and flushes them to Postgres in batches.
+
+    Rows become visible to readers of the same process immediately (via
+    `pending_view`) and are written with one multi-row INSERT per flush.
+    A flush runs every `flush_interval` seconds or as soon as `batch_size`
+    rows are waiting. When `max_pending` rows are already buffered,
+    `enqueue` refuses new rows and callers fall back to a synchronous write,
+    which bounds both memory and the loss window on a crash.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        flush_interval: float,
+        batch_size: int,
+        max_pending: int,
+    ):
+        self._session_factory = session_factory
+        self._flush_interval = flush_interval
+        self._batch_size = batch_size
+        self._max_pending = max_pending
+
+        self._pending: List[Dict] = []
+        self._cond = threading.Condition()
+        # Held while a batch is written and removed from the buffer, so
+        # readers never see a row twice (DB + buffer) or not at all
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    # --------------------------------------------------------------
+    # Lifecycle
+    # --------------------------------------------------------------
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="message-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread and flush everything still buffered."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._stopping and len(self._pending) < self._batch_size:
+                    self._cond.wait(self._flush_interval)
+                if self._stopping:
+                    return
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Write-behind flush failed; rows stay buffered for retry")
+
+    # --------------------------------------------------------------
+    # Writes
+    # --------------------------------------------------------------
+
+    def enqueue(self, rows: List[Dict]) -> bool:
+        """
+        Buffer message rows for the next flush.
+
+        Returns:
+            False if the buffer is full (caller must write synchronously)
+        """
+        with self._cond:
+            if self._stopping or len(self._pending) + len(rows) > self._max_pending:
+                metrics.counter("message_writer.sync_fallbacks").inc()
+                return False
+
+            self._pending.extend(rows)
+            metrics.gauge("message_writer.pending").set(len(self._pending))
+            if len(self._pending) >= self._batch_size:
+                self._cond.notify()
+        return True
+
+    def flush(self) -> int:
+        """
+        Write all buffered rows in one multi-row INSERT.
+
+        Returns:
+            Number of rows written
+        """
+        with self._flush_lock:
+            with self._cond:
+                batch = list(self._pending)
+            if not batch:
+                return 0
+
+            started = time.perf_counter()
+            session = self._session_factory()
+            try:
+                session.execute(insert(Message), batch)
+                session.commit()
+            except Exception:
+                session.rollback()
+                metrics.counter("message_writer.flush_failures").inc()
+                raise
+            finally:
+                session.close()
+
+            with self._cond:
+                del self._pending[:len(batch)]
+                metrics.gauge("message_writer.pending").set(len(self._pending))
+
+        metrics.histogram("message_writer.batch_size").observe(len(batch))
+        metrics.histogram("message_writer.flush_seconds").observe(time.perf_counter() - started)
+        return len(batch)
+
+    # --------------------------------------------------------------
+    # Reads
+    # --------------------------------------------------------------
+
+    @contextmanager
+    def pending_view(self, conversation_summary_id: int) -> Iterator[List[Dict]]:
+        """
+        Yield buffered rows for a conversation while blocking flushes.
+
+        Read the database inside the block and append the yielded rows to
+        get a consistent view of the conversation.
+        """
+        with self._cond:
+            has_pending = any(
+                row["conversation_summary_id"] == conversation_summary_id
+                for row in self._pending
+            )
+        if not has_pending:
+            yield []
+            return
+
+        with self._flush_lock:
+            with self._cond:
+                rows = [
+                    row for row in self._pending
+                    if row["conversation_summary_id"] == conversation_summary_id
+                ]
+            yield rows
+
+    def pending_counts(self) -> Dict[int, int]:
+        """Number of buffered rows per conversation."""
+        counts: Dict[int, int] = defaultdict(int)
+        with self._cond:
+            for row in self._pending:
+                counts[row["conversation_summary_id"]] += 1
+        return dict(counts)
+
+
+# ------------------------------------------------------------------
+# 🚀 Lazy singleton
+# ------------------------------------------------------------------
+
+_MESSAGE_WRITER: Optional[MessageWriter] = None
+
+
+def get_message_writer() -> Optional[MessageWriter]:
+    """Get the write-behind writer, or None when write-behind is disabled."""
+    global _MESSAGE_WRITER
+    if not settings["MESSAGE_WRITE_BEHIND"]:
+        return None
+    if _MESSAGE_WRITER is None:
+        _MESSAGE_WRITER = MessageWriter(
+            session_factory=get_db_session,
+            flush_interval=settings["MESSAGE_FLUSH_INTERVAL_MS"] / 1000,
+            batch_size=settings["MESSAGE_FLUSH_BATCH_SIZE"],
+            max_pending=settings["MESSAGE_MAX_PENDING"],
+        )
+    return _MESSAGE_WRITER
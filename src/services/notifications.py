@@ -0,0 +1,106 @@
+# 📁 services/notifications.py
+# Pluggable delivery of price-watch alerts
+
+import importlib
+import json
+import logging
+import urllib.request
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional, Protocol
+
+from src.core import settings
+from src.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PriceAlert:
+    """A watched search's price dropped (or reached the watcher's target)."""
+
+    watch_id: int
+    session_id: str
+    kind: str
+    search_params: Dict
+    previous_price: Optional[float]
+    current_price: float
+    target_price: Optional[float]
+    cheapest: Dict
+    detected_at: str
+
+
+class NotificationSink(Protocol):
+    """Anything with `send(alert)`; errors are logged by the caller."""
+
+    def send(self, alert: PriceAlert) -> None: ...
+
+
+class LogSink:
+    """Writes alerts to the application log (default, for development)."""
+
+    def send(self, alert: PriceAlert) -> None:
+        logger.info(
+            "Price alert for session %s (watch %s): %s now ₹%s (was %s)",
+            alert.session_id, alert.watch_id, alert.kind, alert.current_price, alert.previous_price,
+        )
+
+
+class WebhookSink:
+    """POSTs each alert as JSON to PRICE_WATCH_WEBHOOK_URL."""
+
+    def __init__(self, url: str, timeout: float = 5.0):
+        self._url = url
+        self._timeout = timeout
+
+    def send(self, alert: PriceAlert) -> None:
+        request = urllib.request.Request(
+            self._url,
+            data=json.dumps(asdict(alert)).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self._timeout) as response:
+            response.read()
+
+
+def _load_sink(spec: str) -> NotificationSink:
+    """Build the sink named by PRICE_WATCH_SINK: "log", "webhook" or "module:factory"."""
+    if spec == "log":
+        return LogSink()
+    if spec == "webhook":
+        if not settings["PRICE_WATCH_WEBHOOK_URL"]:
+            raise ValueError("PRICE_WATCH_SINK=webhook requires PRICE_WATCH_WEBHOOK_URL")
+        return WebhookSink(settings["PRICE_WATCH_WEBHOOK_URL"])
+    module_name, _, factory_name = spec.partition(":")
+    if not factory_name:
+        raise ValueError(f"Unknown PRICE_WATCH_SINK '{spec}' (use log, webhook or module:factory)")
+    return getattr(importlib.import_module(module_name), factory_name)()
+
+
+_SINK: Optional[NotificationSink] = None
+
+
+def get_notification_sink() -> NotificationSink:
+    """Get the configured notification sink (created on first use)."""
+    global _SINK
+    if _SINK is None:
+        _SINK = _load_sink(settings["PRICE_WATCH_SINK"])
+    return _SINK
+
+
+def set_notification_sink(sink: NotificationSink) -> None:
+    """Replace the notification sink, e.g. with one that pushes to the frontend."""
+    global _SINK
+    _SINK = sink
+
+
+def notify(alert: PriceAlert) -> bool:
+    """Deliver an alert; returns False (and logs) when the sink fails."""
+    try:
+        get_notification_sink().send(alert)
+    except Exception:
+        logger.exception("Failed to deliver price alert for watch %s", alert.watch_id)
+        metrics.counter("price_watch.notification_errors").inc()
+        return False
+    metrics.counter("price_watch.notifications").inc()
+    return True
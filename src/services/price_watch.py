@@ -0,0 +1,462 @@
+# 📁 services/price_watch.py
+# Price watches: one upstream poll per distinct watched search, within a global budget
+
+import hashlib
+import json
+import logging
+import random
+import zlib
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import exists, func, or_, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from src.core import settings
+from src.core.metrics import metrics
+from src.core.scheduler import PeriodicJob
+from src.database import get_db_session
+from src.exceptions import TravelAgentError
+from src.models.psql import PriceWatch, PriceWatchPoll, PriceWatchSearch, PriceWatchSnapshot
+from src.services.notifications import PriceAlert, notify
+
+logger = logging.getLogger(__name__)
+
+# Advisory lock key so workers claim due searches one at a time
+PRICE_WATCH_LOCK_KEY = zlib.crc32(b"price_watch")
+
+# A claimed poll that has not finished after this long is retried
+CLAIM_TIMEOUT = timedelta(minutes=10)
+
+# Cheapest results kept per snapshot
+SNAPSHOT_ITEMS = 20
+
+# Parameter holding the travel date; watches stop once it has passed
+_TRAVEL_DATE_PARAMS = {"flights": "outbound_date", "hotels": "check_in_date"}
+
+# Parameters that do not change what is searched
+_VOLATILE_PARAMS = {"next_page_token"}
+
+
+# ------------------------------------------------------------------
+# 🔑 Search identity
+# ------------------------------------------------------------------
+
+def normalize_search_params(search_params: Dict) -> Dict:
+    """
+    Canonical form of search parameters, so equivalent searches share a key.
+
+    Drops unset and paging parameters, collapses whitespace, upper-cases
+    airport codes and lower-cases free-text locations.
+    """
+    normalized = {}
+    for name, value in search_params.items():
+        if value is None or name in _VOLATILE_PARAMS:
+            continue
+        if isinstance(value, str):
+            value = " ".join(value.split())
+            if name.endswith("_airport"):
+                value = value.upper()
+            elif name == "q":
+                value = value.lower()
+        normalized[name] = value
+    return normalized
+
+
+def search_key(kind: str, normalized_params: Dict) -> str:
+    """Stable hash of a normalized search."""
+    payload = json.dumps([kind, normalized_params], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _item_label(kind: str, item: Dict) -> str:
+    if kind == "flights":
+        return f"{item.get('airline')} | {item.get('departure')} → {item.get('arrival')}"
+    return str(item.get("name"))
+
+
+def snapshot_prices(kind: str, items: List[Dict]) -> Tuple[Optional[float], Dict[str, float], Optional[Dict]]:
+    """
+    Prices of the cheapest results of one search.
+
+    Returns:
+        Tuple of (lowest price or None, label -> price, cheapest item or None)
+    """
+    # Lazy: importing src.tools loads the agent tool stack
+    from src.tools.parsers import result_columns
+
+    prices = result_columns(kind, items)["price"]
+    # NaN (unknown price) never compares equal to itself
+    priced = sorted(
+        ((price, index) for index, price in enumerate(prices) if price == price),
+    )[:SNAPSHOT_ITEMS]
+    if not priced:
+        return None, {}, None
+
+    labels = {}
+    for price, index in priced:
+        labels.setdefault(_item_label(kind, items[index]), price)
+    return priced[0][0], labels, items[priced[0][1]]
+
+
+# ------------------------------------------------------------------
+# 👀 Watches
+# ------------------------------------------------------------------
+
+def add_watch(
+    session: Session,
+    session_id: UUID,
+    kind: str,
+    search_params: Dict,
+    target_price: Optional[float] = None,
+    items: Optional[List[Dict]] = None,
+) -> PriceWatch:
+    """
+    Watch a search for price drops.
+
+    Watchers of an equivalent search share one polled search row. When the
+    search's current `items` are passed (it just ran), they are stored as
+    the first snapshot so the next poll already has something to compare.
+
+    Args:
+        session: Database session
+        session_id: Conversation session to notify
+        kind: "flights" or "hotels"
+        search_params: Parameters of the search to repeat
+        target_price: Notify once the lowest price is at or below this
+            (None = on any new low)
+        items: Cleaned results of the search, if it just ran
+
+    Returns:
+        The created watch
+
+    Raises:
+        TravelAgentError: 429 when the session has too many active watches
+    """
+    active = session.query(func.count(PriceWatch.id)).filter(
+        PriceWatch.session_id == session_id,
+        PriceWatch.active.is_(True),
+    ).scalar()
+    if active >= settings["PRICE_WATCH_MAX_PER_SESSION"]:
+        raise TravelAgentError(
+            message=f"A conversation can watch at most {settings['PRICE_WATCH_MAX_PER_SESSION']} searches",
+            error_code="TOO_MANY_PRICE_WATCHES",
+            status_code=429,
+        )
+
+    normalized = normalize_search_params(search_params)
+    key = search_key(kind, normalized)
+
+    if session.get(PriceWatchSearch, key) is None:
+        try:
+            with session.begin_nested():
+                session.add(PriceWatchSearch(
+                    search_key=key,
+                    kind=kind,
+                    search_params=normalized,
+                    next_poll_at=_next_poll_time(datetime.now(timezone.utc)),
+                ))
+            if items:
+                min_price, prices, _ = snapshot_prices(kind, items)
+                session.add(PriceWatchSnapshot(search_key=key, min_price=min_price, prices=prices))
+        except IntegrityError:
+            # Another request created it first
+            pass
+
+    watch = PriceWatch(session_id=session_id, search_key=key, target_price=target_price)
+    session.add(watch)
+    session.commit()
+    session.refresh(watch)
+    metrics.counter("price_watch.watches_added").inc()
+    return watch
+
+
+def list_watches(session: Session, session_id: UUID) -> List[Dict]:
+    """Active watches of a conversation with their latest known price."""
+    latest = (
+        session.query(PriceWatchSnapshot.min_price)
+        .filter(PriceWatchSnapshot.search_key == PriceWatch.search_key)
+        .order_by(PriceWatchSnapshot.polled_at.desc(), PriceWatchSnapshot.id.desc())
+        .limit(1)
+        .correlate(PriceWatch)
+        .scalar_subquery()
+    )
+    rows = (
+        session.query(PriceWatch, PriceWatchSearch, latest)
+        .join(PriceWatchSearch, PriceWatchSearch.search_key == PriceWatch.search_key)
+        .filter(PriceWatch.session_id == session_id, PriceWatch.active.is_(True))
+        .order_by(PriceWatch.id)
+        .all()
+    )
+    return [
+        {
+            "watch_id": watch.id,
+            "kind": search.kind,
+            "search_params": search.search_params,
+            "target_price": watch.target_price,
+            "current_price": current_price,
+            "last_notified_price": watch.last_notified_price,
+            "created_at": watch.created_at.isoformat(),
+        }
+        for watch, search, current_price in rows
+    ]
+
+
+def remove_watch(session: Session, session_id: UUID, watch_id: int) -> None:
+    """
+    Stop a watch of this conversation.
+
+    Raises:
+        TravelAgentError: 404 when there is no such active watch
+    """
+    updated = session.query(PriceWatch).filter(
+        PriceWatch.id == watch_id,
+        PriceWatch.session_id == session_id,
+        PriceWatch.active.is_(True),
+    ).update({PriceWatch.active: False}, synchronize_session=False)
+    session.commit()
+    if not updated:
+        raise TravelAgentError(
+            message="Price watch not found",
+            error_code="PRICE_WATCH_NOT_FOUND",
+            status_code=404,
+        )
+
+
+# ------------------------------------------------------------------
+# 📡 Polling
+# ------------------------------------------------------------------
+
+def _next_poll_time(now: datetime) -> datetime:
+    """Next poll after one interval plus random jitter, so polls do not bunch up."""
+    interval = settings["PRICE_WATCH_INTERVAL_MINUTES"]
+    jitter = settings["PRICE_WATCH_JITTER_MINUTES"]
+    return now + timedelta(minutes=interval + random.uniform(0, jitter))
+
+
+def claim_due_searches(session: Session, now: datetime) -> List[Tuple[str, str, Dict]]:
+    """
+    Claim due searches that still have active watchers, within the poll budget.
+
+    The budget (PRICE_WATCH_MAX_POLLS_PER_HOUR) is global: upstream calls
+    made in the last hour (`price_watch_polls`, failed ones included) plus
+    polls in progress are counted in the database, and workers claim one
+    at a time under an advisory lock. Claimed
+    searches are rescheduled immediately, so a failed poll waits for its
+    next interval instead of retrying in a loop.
+
+    Returns:
+        List of (search_key, kind, search_params) to poll
+    """
+    if session.bind.dialect.name == "postgresql":
+        locked = session.execute(
+            text("SELECT pg_try_advisory_xact_lock(:key)"),
+            {"key": PRICE_WATCH_LOCK_KEY},
+        ).scalar()
+        if not locked:
+            session.rollback()
+            return []
+
+    recent = session.query(func.count(PriceWatchPoll.id)).filter(
+        PriceWatchPoll.polled_at > now - timedelta(hours=1)
+    ).scalar()
+    in_progress = session.query(func.count(PriceWatchSearch.search_key)).filter(
+        PriceWatchSearch.claimed_until > now
+    ).scalar()
+    budget = settings["PRICE_WATCH_MAX_POLLS_PER_HOUR"] - recent - in_progress
+
+    if budget <= 0:
+        session.rollback()
+        metrics.counter("price_watch.budget_exhausted").inc()
+        return []
+
+    due = (
+        session.query(PriceWatchSearch)
+        .filter(
+            PriceWatchSearch.next_poll_at <= now,
+            or_(PriceWatchSearch.claimed_until.is_(None), PriceWatchSearch.claimed_until <= now),
+            exists().where(PriceWatch.search_key == PriceWatchSearch.search_key, PriceWatch.active.is_(True)),
+        )
+        .order_by(PriceWatchSearch.next_poll_at)
+        .limit(budget + 1)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    if len(due) > budget:
+        # More is due than the budget allows; the rest waits for a later tick
+        metrics.counter("price_watch.budget_exhausted").inc()
+        due = due[:budget]
+
+    claimed = []
+    for search in due:
+        search.next_poll_at = _next_poll_time(now)
+        search.claimed_until = now + CLAIM_TIMEOUT
+        claimed.append((search.search_key, search.kind, dict(search.search_params)))
+    session.commit()
+    return claimed
+
+
+def _should_alert(watch: PriceWatch, previous_price: Optional[float], current_price: float) -> bool:
+    """Alert on a new low (or on reaching the target), once per new low."""
+    if watch.last_notified_price is not None and current_price >= watch.last_notified_price:
+        return False
+    if watch.target_price is not None:
+        return current_price <= watch.target_price
+    return previous_price is not None and current_price < previous_price
+
+
+def _expire_search(session: Session, key: str) -> None:
+    """Stop every watch of a search whose travel date has passed."""
+    session.query(PriceWatch).filter(
+        PriceWatch.search_key == key, PriceWatch.active.is_(True)
+    ).update({PriceWatch.active: False}, synchronize_session=False)
+    session.query(PriceWatchSearch).filter(PriceWatchSearch.search_key == key).delete(synchronize_session=False)
+    session.commit()
+    metrics.counter("price_watch.expired").inc()
+
+
+def poll_search(key: str, kind: str, search_params: Dict) -> int:
+    """
+    Run one upstream search for a watched search and alert its watchers.
+
+    The search runs outside any transaction. The new snapshot is compared
+    with the previous one, and every watcher gets its own alert decision.
+    Watchers are marked notified before delivery (at most one alert per
+    new low).
+
+    Returns:
+        Number of alerts delivered
+    """
+    from src.tools.tool import run_search
+
+    travel_date = search_params.get(_TRAVEL_DATE_PARAMS[kind])
+    if travel_date and travel_date < date.today().isoformat():
+        session = get_db_session()
+        try:
+            _expire_search(session, key)
+        finally:
+            session.close()
+        return 0
+
+    try:
+        items = run_search(kind, search_params)
+    except Exception:
+        logger.exception("Price watch poll failed for %s search %s", kind, key[:12])
+        metrics.counter("price_watch.poll_errors").inc()
+        items = None
+    metrics.counter("price_watch.polls").inc()
+
+    alerts = []
+    session = get_db_session()
+    try:
+        search = session.get(PriceWatchSearch, key)
+        if search is not None:
+            search.claimed_until = None
+        # Counted against the poll budget whether or not it succeeded
+        session.add(PriceWatchPoll(search_key=key, succeeded=items is not None))
+
+        if items is not None:
+            current_price, prices, cheapest = snapshot_prices(kind, items)
+            previous_price = (
+                session.query(PriceWatchSnapshot.min_price)
+                .filter(PriceWatchSnapshot.search_key == key)
+                .order_by(PriceWatchSnapshot.polled_at.desc(), PriceWatchSnapshot.id.desc())
+                .limit(1)
+                .scalar()
+            )
+            session.add(PriceWatchSnapshot(search_key=key, min_price=current_price, prices=prices))
+
+            if current_price is not None and current_price != previous_price:
+                metrics.counter("price_watch.changes").inc()
+                watches = session.query(PriceWatch).filter(
+                    PriceWatch.search_key == key, PriceWatch.active.is_(True)
+                ).all()
+                detected_at = datetime.now(timezone.utc).isoformat()
+                for watch in watches:
+                    if not _should_alert(watch, previous_price, current_price):
+                        continue
+                    watch.last_notified_price = current_price
+                    alerts.append(PriceAlert(
+                        watch_id=watch.id,
+                        session_id=str(watch.session_id),
+                        kind=kind,
+                        search_params=search_params,
+                        previous_price=previous_price,
+                        current_price=current_price,
+                        target_price=watch.target_price,
+                        cheapest=cheapest,
+                        detected_at=detected_at,
+                    ))
+        session.commit()
+    finally:
+        session.close()
+
+    return sum(notify(alert) for alert in alerts)
+
+
+def prune_price_watches(session: Session, now: datetime) -> None:
+    """Drop old snapshots, poll records outside the budget window and searches nobody watches any more."""
+    retention = timedelta(days=settings["PRICE_WATCH_SNAPSHOT_RETENTION_DAYS"])
+    session.query(PriceWatchPoll).filter(
+        PriceWatchPoll.polled_at < now - timedelta(hours=1)
+    ).delete(synchronize_session=False)
+    session.query(PriceWatchSnapshot).filter(
+        PriceWatchSnapshot.polled_at < now - retention
+    ).delete(synchronize_session=False)
+    session.query(PriceWatchSearch).filter(
+        ~exists().where(PriceWatch.search_key == PriceWatchSearch.search_key, PriceWatch.active.is_(True))
+    ).delete(synchronize_session=False)
+    session.commit()
+
+
+def run_price_watch_tick() -> int:
+    """Claim due searches and poll each once; returns the number polled."""
+    now = datetime.now(timezone.utc)
+    session = get_db_session()
+    try:
+        claimed = claim_due_searches(session, now)
+        prune_price_watches(session, now)
+
+        metrics.gauge("price_watch.watchers").set(
+            session.query(func.count(PriceWatch.id)).filter(PriceWatch.active.is_(True)).scalar()
+        )
+        metrics.gauge("price_watch.searches").set(
+            session.query(func.count(PriceWatchSearch.search_key)).scalar()
+        )
+    finally:
+        session.close()
+
+    for key, kind, search_params in claimed:
+        poll_search(key, kind, search_params)
+    return len(claimed)
+
+
+# ------------------------------------------------------------------
+# ⏰ Scheduling
+# ------------------------------------------------------------------
+
+_PRICE_WATCH_JOB: Optional[PeriodicJob] = None
+
+
+def get_price_watch_job() -> Optional[PeriodicJob]:
+    """Get the scheduled price-watch poller, or None when price watching is disabled."""
+    global _PRICE_WATCH_JOB
+    if not settings["PRICE_WATCH_ENABLED"]:
+        return None
+    if _PRICE_WATCH_JOB is None:
+        interval = settings["PRICE_WATCH_TICK_SECONDS"]
+        _PRICE_WATCH_JOB = PeriodicJob(
+            name="price-watch",
+            func=run_price_watch_tick,
+            interval=interval,
+            jitter=interval * 0.1,
+        )
+    return _PRICE_WATCH_JOB
+
+
+if __name__ == "__main__":
+    # One-off tick, e.g. from cron: python -m src.services.price_watch
+    logging.basicConfig(level=logging.INFO)
+    run_price_watch_tick()
@@ -2,21 +2,35 @@
 # Service layer for managing messages and conversation summaries
 
 import json
+import logging
+import time
 import uuid
+from contextlib import nullcontext
+from datetime import datetime, timezone
 from typing import List, Dict, Tuple, Optional
 from uuid import UUID
+from sqlalchemy import select, union_all, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
-from langchain_core.messages import HumanMessage, AIMessage
 
-from src.models.psql import Message, ConversationSummary
-from src.agents import build_travel_agent
-from src.agents.summarize_agent import update_summary
+from src.models.psql import Message, MessageArchive, ConversationSummary
 from src.core import settings
+from src.core.bulkhead import bulkhead, bulkheaded
+from src.core.deadline import request_deadline, time_remaining
+from src.core.locks import session_locks
+from src.core.metrics import metrics
+from src.exceptions import TravelAgentError
+from src.services.memory import recall_facts, schedule_fact_extraction
+from src.services.message_writer import get_message_writer
+
+logger = logging.getLogger(__name__)
 
 
 # ------------------------------------------------------------------
 # 🚀 Lazy Agent Initialization
 # ------------------------------------------------------------------
+# LangGraph/LangChain and the OpenAI SDK are imported on first use (or by
+# the warm-up), so importing the app stays fast.
 
 _TRAVEL_AGENT = None
 
@@ -25,18 +39,51 @@ def get_travel_agent():
     """Get or create the travel agent (lazy initialization)."""
     global _TRAVEL_AGENT
     if _TRAVEL_AGENT is None:
-        _TRAVEL_AGENT = build_travel_agent()
+        from src.agents import build_travel_agent
+        from src.agents.checkpointer import get_checkpointer
+        _TRAVEL_AGENT = build_travel_agent(checkpointer=get_checkpointer())
     return _TRAVEL_AGENT
 
 
+def drop_agent_thread(session_id: UUID) -> None:
+    """
+    Forget the session's checkpointed agent state.
+    
+    The next turn rebuilds it from the summary and unsummarized messages.
+    Called once those messages are folded into the summary, so checkpoints
+    never outlive the history they duplicate.
+    """
+    if not settings["AGENT_CHECKPOINTS_ENABLED"]:
+        return
+    from src.agents.checkpointer import get_checkpointer
+    get_checkpointer().delete_thread(str(session_id))
+
+
+# ------------------------------------------------------------------
+# 🔌 Connection Handling
+# ------------------------------------------------------------------
+
+def release_connection(session: Session) -> None:
+    """
+    End the session's current transaction so its pooled connection is
+    returned to the pool. The session stays usable and checks out a new
+    connection on its next query.
+    """
+    session.commit()
+
+
 # ------------------------------------------------------------------
 # 📝 Conversation Summary Management
 # ------------------------------------------------------------------
 
+@bulkheaded("db")
 def get_or_create_summary(session: Session, session_id: UUID) -> ConversationSummary:
     """
     Get existing conversation summary or create new one.
     
+    Creation is an atomic INSERT ... ON CONFLICT DO NOTHING, so concurrent
+    first messages for the same session cannot fail on the unique constraint.
+    
     Args:
         session: Database session
         session_id: UUID of the conversation session
@@ -44,38 +91,65 @@ def get_or_create_summary(session: Session, session_id: UUID) -> ConversationSum
     Returns:
         ConversationSummary object
     """
-    summary = session.query(ConversationSummary).filter(
+    query = session.query(ConversationSummary).filter(
         ConversationSummary.session_id == session_id
-    ).first()
+    )
+    
+    summary = query.first()
     
     if not summary:
-        summary = ConversationSummary(
+        stmt = insert(ConversationSummary).values(
             session_id=session_id,
             summary=""
+        ).on_conflict_do_nothing(
+            index_elements=[ConversationSummary.session_id]
         )
-        session.add(summary)
+        session.execute(stmt)
         session.commit()
-        session.refresh(summary)
+        summary = query.one()
     
     return summary
 
 
 def update_conversation_summary(
     session: Session, 
-    summary_record: ConversationSummary
+    conversation_summary_id: int
 ) -> None:
     """
     Update conversation summary with unsummarized messages.
     
+    Runs as two short transactions around the summarizer LLM call, so no
+    pooled connection is held while the model runs. The write is a
+    compare-and-set on the summary version: if another worker summarized
+    the same conversation in the meantime, this update is dropped instead
+    of double-summarizing.
+    
     Args:
         session: Database session
-        summary_record: ConversationSummary to update
+        conversation_summary_id: ID of the ConversationSummary to update
     """
-    # Get all unsummarized messages for this conversation
-    unsummarized_messages = session.query(Message).filter(
-        Message.conversation_summary_id == summary_record.id,
-        Message.is_summarized == False
-    ).order_by(Message.created_at.asc()).all()
+    # Make buffered (write-behind) messages part of this summary
+    writer = get_message_writer()
+    if writer is not None:
+        writer.flush()
+    
+    # Load the current summary and all unsummarized messages
+    with bulkhead("db"):
+        summary_record = session.get(
+            ConversationSummary, conversation_summary_id, populate_existing=True
+        )
+        current_summary = summary_record.summary
+        version = summary_record.version
+        session_id = summary_record.session_id
+        
+        unsummarized_messages = session.query(
+            Message.id, Message.role, Message.content
+        ).filter(
+            Message.conversation_summary_id == conversation_summary_id,
+            Message.is_summarized == False
+        ).order_by(Message.created_at.asc(), Message.id.asc()).all()
+        
+        release_connection(session)
     
     if not unsummarized_messages:
         return
@@ -87,25 +161,53 @@ def update_conversation_summary(
     ]
     
     # Update summary using summarize agent
-    new_summary = update_summary(
-        current_summary=summary_record.summary,
+    from src.agents.summarize_agent import update_summary
+    new_summary, covered = update_summary(
+        current_summary=current_summary,
         new_messages=messages_dict
     )
+    # A backlog too large for one update is summarized oldest first; the
+    # rest stays unsummarized for the next update
+    summarized_messages = unsummarized_messages[:covered]
+    messages_dict = messages_dict[:covered]
+    
+    # Update summary in database, only if nobody else did meanwhile
+    with bulkhead("db"):
+        updated = session.execute(
+            update(ConversationSummary)
+            .where(
+                ConversationSummary.id == conversation_summary_id,
+                ConversationSummary.version == version
+            )
+            .values(summary=new_summary, version=version + 1)
+        ).rowcount
+        
+        if not updated:
+            # Summary changed underneath us; the newer summary wins
+            session.rollback()
+            return
+        
+        # Mark the messages the new summary covers as summarized
+        session.execute(
+            update(Message)
+            .where(Message.id.in_([msg.id for msg in summarized_messages]))
+            .values(is_summarized=True)
+        )
+        
+        session.commit()
+        
+        # The summary now carries those turns; restart the agent thread from it
+        drop_agent_thread(session_id)
     
-    # Update summary in database
-    summary_record.summary = new_summary
-    
-    # Mark all those messages as summarized
-    for msg in unsummarized_messages:
-        msg.is_summarized = True
-    
-    session.commit()
+    # Details the 150-word summary drops live on as recallable facts
+    schedule_fact_extraction(session_id, messages_dict)
 
 
 # ------------------------------------------------------------------
 # 💬 Message Management
 # ------------------------------------------------------------------
 
+@bulkheaded("db")
 def save_messages(
     session: Session, 
     user_message: str, 
@@ -115,31 +217,51 @@ def save_messages(
     """
     Save both user and AI messages to the database.
     
+    With MESSAGE_WRITE_BEHIND enabled the rows are buffered and flushed in
+    batches; they fall back to a synchronous insert when the buffer is full.
+    
     Args:
         session: Database session
         user_message: User's message content
         ai_message: AI's response content
         conversation_summary_id: ID of the conversation summary
     """
-    user_msg = Message(
-        role="user",
-        content=user_message,
-        conversation_summary_id=conversation_summary_id,
-        is_summarized=False
-    )
+    # Timestamps are taken now so ordering survives a deferred flush
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            "role": "user",
+            "content": user_message,
+            "conversation_summary_id": conversation_summary_id,
+            "is_summarized": False,
+            "created_at": now,
+        },
+        {
+            "role": "ai",
+            "content": ai_message,
+            "conversation_summary_id": conversation_summary_id,
+            "is_summarized": False,
+            "created_at": now,
+        },
+    ]
     
-    ai_msg = Message(
-        role="ai",
-        content=ai_message,
-        conversation_summary_id=conversation_summary_id,
-        is_summarized=False
-    )
+    writer = get_message_writer()
+    if writer is not None and writer.enqueue(rows):
+        return
     
-    session.add(user_msg)
-    session.add(ai_msg)
+    session.add_all([Message(**row) for row in rows])
     session.commit()
 
 
+def _pending_messages(conversation_summary_id: int):
+    """Context yielding buffered write-behind rows for a conversation."""
+    writer = get_message_writer()
+    if writer is None:
+        return nullcontext([])
+    return writer.pending_view(conversation_summary_id)
+
+
+@bulkheaded("db")
 def get_unsummarized_messages(
     session: Session, 
     conversation_summary_id: int
@@ -154,17 +276,22 @@ def get_unsummarized_messages(
     Returns:
         List of message dictionaries with 'role' and 'content'
     """
-    messages = session.query(Message).filter(
-        Message.conversation_summary_id == conversation_summary_id,
-        Message.is_summarized == False
-    ).order_by(Message.created_at.asc()).all()
+    with _pending_messages(conversation_summary_id) as pending:
+        messages = session.query(Message).filter(
+            Message.conversation_summary_id == conversation_summary_id,
+            Message.is_summarized == False
+        ).order_by(Message.created_at.asc(), Message.id.asc()).all()
     
     return [
         {"role": msg.role, "content": msg.content}
         for msg in messages
+    ] + [
+        {"role": row["role"], "content": row["content"]}
+        for row in pending
     ]
 
 
+@bulkheaded("db")
 def count_unsummarized_messages(
     session: Session, 
     conversation_summary_id: int
@@ -179,16 +306,23 @@ def count_unsummarized_messages(
     Returns:
         Count of unsummarized messages
     """
-    return session.query(Message).filter(
-        Message.conversation_summary_id == conversation_summary_id,
-        Message.is_summarized == False
-    ).count()
+    with _pending_messages(conversation_summary_id) as pending:
+        count = session.query(Message).filter(
+            Message.conversation_summary_id == conversation_summary_id,
+            Message.is_summarized == False
+        ).count()
+    
+    return count + len(pending)
 
 
+@bulkheaded("db")
 def get_all_messages(session: Session, conversation_summary_id: int) -> List[Dict[str, str]]:
     """
     Get all messages for a conversation.
     
+    Reads both the hot `messages` table and the `messages_archive` cold
+    tier, so archiving is invisible to callers.
+    
     Args:
         session: Database session
         conversation_summary_id: ID of the conversation summary
@@ -196,13 +330,27 @@ def get_all_messages(session: Session, conversation_summary_id: int) -> List[Dic
     Returns:
         List of message dictionaries with 'role' and 'content'
     """
-    messages = session.query(Message).filter(
-        Message.conversation_summary_id == conversation_summary_id
-    ).order_by(Message.created_at.asc()).all()
+    hot = select(
+        Message.id, Message.role, Message.content, Message.created_at
+    ).where(Message.conversation_summary_id == conversation_summary_id)
+    
+    cold = select(
+        MessageArchive.id, MessageArchive.role, MessageArchive.content, MessageArchive.created_at
+    ).where(MessageArchive.conversation_summary_id == conversation_summary_id)
+    
+    both = union_all(hot, cold).subquery()
+    
+    with _pending_messages(conversation_summary_id) as pending:
+        messages = session.execute(
+            select(both.c.role, both.c.content).order_by(both.c.created_at.asc(), both.c.id.asc())
+        ).all()
     
     return [
         {"role": msg.role, "content": msg.content}
         for msg in messages
+    ] + [
+        {"role": row["role"], "content": row["content"]}
+        for row in pending
     ]
 
 
@@ -210,22 +358,22 @@ def get_all_messages(session: Session, conversation_summary_id: int) -> List[Dic
 # 🤖 Agent Runner
 # ------------------------------------------------------------------
 
-def run_travel_agent(
-    user_message: str, 
-    conversation_summary: str = "",
-    unsummarized_messages: List[Dict[str, str]] = None
-) -> str:
+def build_agent_messages(
+    user_message: str,
+    unsummarized_messages: Optional[List[Dict[str, str]]] = None
+) -> list:
     """
-    Run the travel agent with summary and recent messages.
+    Convert stored message dicts plus the new user message to LangChain messages.
     
     Args:
         user_message: Current user message
-        conversation_summary: Compressed summary of old messages
         unsummarized_messages: Recent unsummarized messages
         
     Returns:
-        AI response as string
+        List of HumanMessage/AIMessage
     """
+    from langchain_core.messages import HumanMessage, AIMessage
+    
     # Build messages list
     messages = []
     
@@ -240,15 +388,70 @@ def run_travel_agent(
     # Add current user message
     messages.append(HumanMessage(content=user_message))
     
-    # Initialize agent state with summary and messages
-    initial_state = {
-        "conversation_summary": conversation_summary,
-        "messages": messages
-    }
+    return messages
+
+
+def run_travel_agent(
+    user_message: str, 
+    conversation_summary: str = "",
+    unsummarized_messages: List[Dict[str, str]] = None,
+    session_id: Optional[UUID] = None,
+    memories: Optional[List[str]] = None
+) -> str:
+    """
+    Run the travel agent with summary and recent messages.
     
-    # Get agent and invoke
+    With agent checkpoints enabled and a session id, a session that already
+    has a thread resumes from its checkpoint and only the new user message
+    is sent; the summary and stored messages seed a new thread.
+    
+    Args:
+        user_message: Current user message
+        conversation_summary: Compressed summary of old messages
+        unsummarized_messages: Recent unsummarized messages
+        session_id: Session whose checkpointed thread to resume
+        memories: Long-term facts recalled for this message
+        
+    Returns:
+        AI response as string
+    """
     agent = get_travel_agent()
-    result = agent.invoke(initial_state)
+    
+    # Keep part of the request budget for saving the answer
+    remaining = time_remaining()
+    agent_deadline = None
+    if remaining is not None:
+        agent_deadline = time.monotonic() + remaining - settings["AGENT_DEADLINE_RESERVE_S"]
+    
+    config = None
+    resume = False
+    if agent.checkpointer is not None and session_id is not None:
+        config = {"configurable": {"thread_id": str(session_id)}}
+        resume = agent.checkpointer.has_thread(str(session_id))
+    
+    # Initialize agent state with summary, messages and the agent's deadline
+    if resume:
+        # Appended to the checkpointed history; the summary is unchanged
+        # until summarization drops the thread
+        initial_state = {"messages": build_agent_messages(user_message)}
+        metrics.counter("checkpoint.resumed").inc()
+    else:
+        initial_state = {
+            "conversation_summary": conversation_summary,
+            "messages": build_agent_messages(user_message, unsummarized_messages),
+        }
+    initial_state.update(memories=memories or [], deadline=agent_deadline, budget_exhausted=None)
+    
+    if config is None:
+        result = agent.invoke(initial_state)
+    else:
+        try:
+            # One checkpoint per turn, written when the run ends
+            result = agent.invoke(initial_state, config, durability="exit")
+        except Exception:
+            # Never resume from a half-finished turn
+            drop_agent_thread(session_id)
+            raise
     
     # Extract final AI response
     final_message = result["messages"][-1]
@@ -268,6 +471,11 @@ def process_chat_message(
     """
     Main workflow for processing a chat message with summarization.
     
+    Turns for the same session are serialized in arrival order, so each
+    turn sees the messages saved by the previous one. Database work is
+    split into short transactions (load state, then persist) so no pooled
+    connection is held while the agent runs.
+    
     Args:
         session: Database session
         user_message: User's message
@@ -281,32 +489,94 @@ def process_chat_message(
     if session_id is None:
         session_id = uuid.uuid4()
     
-    # Step 2: Get or create conversation summary
-    summary_record = get_or_create_summary(session, session_id)
+    from src.tools.results_cache import search_session
     
-    # Step 3: Get unsummarized messages (recent context)
-    unsummarized_messages = get_unsummarized_messages(session, summary_record.id)
+    with request_deadline(settings["REQUEST_TIMEOUT_S"]), \
+            session_locks.hold(session_id, timeout=settings["SESSION_LOCK_TIMEOUT"]), \
+            search_session(session_id):
+        # Step 2: Get or create conversation summary
+        summary_record = get_or_create_summary(session, session_id)
+        conversation_summary_id = summary_record.id
+        conversation_summary = summary_record.summary
     
-    # Step 4: Run agent with summary + unsummarized messages + new message
-    ai_response = run_travel_agent(
-        user_message=user_message,
-        conversation_summary=summary_record.summary,
-        unsummarized_messages=unsummarized_messages
-    )
+        # Step 3: Get unsummarized messages (recent context)
+        unsummarized_messages = get_unsummarized_messages(session, conversation_summary_id)
     
-    # Step 5: Save new messages
-    save_messages(session, user_message, ai_response, summary_record.id)
+        # Give the connection back before the slow part
+        release_connection(session)
     
-    # Step 6: Check if we should update summary
-    threshold = settings["SUMMARY_UPDATE_THRESHOLD"]
-    unsummarized_count = count_unsummarized_messages(session, summary_record.id)
+        # Step 4: Recall long-term facts relevant to this message
+        memories = recall_facts(session_id, user_message)
     
-    if unsummarized_count >= threshold:
-        update_conversation_summary(session, summary_record)
+        # Step 5: Run agent with summary + memories + unsummarized messages + new message
+        ai_response = run_travel_agent(
+            user_message=user_message,
+            conversation_summary=conversation_summary,
+            unsummarized_messages=unsummarized_messages,
+            session_id=session_id,
+            memories=memories
+        )
     
-    # Step 7: Parse and return response
+        # Step 6: Save new messages
+        save_messages(session, user_message, ai_response, conversation_summary_id)
+    
+        # Step 7: Check if we should update summary
+        threshold = settings["SUMMARY_UPDATE_THRESHOLD"]
+        unsummarized_count = count_unsummarized_messages(session, conversation_summary_id)
+        release_connection(session)
+    
+        if unsummarized_count >= threshold:
+            try:
+                update_conversation_summary(session, conversation_summary_id)
+            except Exception as e:
+                # The answer is saved; the next turn summarizes instead
+                session.rollback()
+                metrics.counter("summary.deferred").inc()
+                if isinstance(e, TravelAgentError) and e.error_code == "DEADLINE_EXCEEDED":
+                    logger.info("Summary update deferred for session %s: out of time", session_id)
+                else:
+                    logger.exception("Summary update failed for session %s; deferred to the next turn", session_id)
+    
+    # Step 8: Parse and return response
     try:
         response_data = json.loads(ai_response)
         return {"response": response_data}, session_id
     except (json.JSONDecodeError, TypeError):
         return {"response": ai_response}, session_id
+
+
+# ------------------------------------------------------------------
+# ➕ Show More
+# ------------------------------------------------------------------
+
+def get_more_results(session_id: UUID, count: int) -> Dict:
+    """
+    Next results of the session's last search, without the LLM.
+    
+    Serves the next slice of the cached result set, or fetches only the
+    next upstream page (see src.tools.tool.next_results_page).
+    
+    Args:
+        session_id: UUID of the conversation session
+        count: Number of results to return
+        
+    Returns:
+        Response in the chat format: {"response_type": ..., "data": [...]}
+        
+    Raises:
+        TravelAgentError: 404 when the session has no cached search
+    """
+    from src.tools.tool import next_results_page
+    
+    with request_deadline(settings["REQUEST_TIMEOUT_S"]):
+        kind, page = next_results_page(str(session_id), count)
+    
+    if kind is None:
+        raise TravelAgentError(
+            message="No recent search results for this session",
+            error_code="NO_PREVIOUS_SEARCH",
+            status_code=404,
+        )
+    if isinstance(page, dict):
+        return {"response_type": "message", "message": page["details"][0]}
+    return {"response_type": kind, "data": page}
@@ -0,0 +1,186 @@
+# 📁 services/warmup.py
+# Start-up warm-up steps and the readiness state behind /ready
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import text
+
+from src.core import settings
+from src.core.metrics import metrics
+from src.database import create_db_engine
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WarmupStep:
+    """One warm-up action; optional steps never block readiness."""
+
+    name: str
+    func: Callable[[], Any]
+    required: bool = True
+
+
+class Warmup:
+    """
+    Run warm-up steps on a background thread and track readiness.
+
+    Steps run in order. A failed required step is retried every
+    `retry_interval` seconds (e.g. the database is still starting); an
+    optional step (external APIs) is attempted once and only logged.
+    `ready` flips once every required step has passed, so the worker
+    accepts traffic only with a filled pool and a compiled agent graph.
+    """
+
+    def __init__(self, steps: List[WarmupStep], retry_interval: float):
+        self._steps = steps
+        self._retry_interval = retry_interval
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._status: Dict[str, Dict[str, Any]] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="warmup", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self._retry_interval)
+            self._thread = None
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until ready (used by scripts and benchmarks)."""
+        return self._ready.wait(timeout)
+
+    def status(self) -> Dict[str, Any]:
+        return {"ready": self.ready, "steps": dict(self._status)}
+
+    def _run_step(self, step: WarmupStep) -> bool:
+        started = time.perf_counter()
+        try:
+            step.func()
+        except Exception as e:
+            elapsed = time.perf_counter() - started
+            self._status[step.name] = {"ok": False, "seconds": round(elapsed, 3), "error": str(e)}
+            metrics.counter(f"warmup.{step.name}.failures").inc()
+            log = logger.warning if step.required else logger.info
+            log(f"Warm-up step '{step.name}' failed: {e}")
+            return False
+
+        elapsed = time.perf_counter() - started
+        self._status[step.name] = {"ok": True, "seconds": round(elapsed, 3)}
+        metrics.gauge(f"warmup.{step.name}.seconds").set(elapsed)
+        return True
+
+    def _run(self) -> None:
+        started = time.perf_counter()
+        pending = list(self._steps)
+
+        while pending and not self._stop.is_set():
+            pending = [
+                step for step in pending
+                if not self._run_step(step) and step.required
+            ]
+            if pending:
+                self._stop.wait(self._retry_interval)
+
+        if pending:
+            return
+
+        elapsed = time.perf_counter() - started
+        metrics.gauge("warmup.total_seconds").set(elapsed)
+        self._ready.set()
+        logger.info(f"Warm-up finished in {elapsed:.2f}s; worker is ready")
+
+
+# ------------------------------------------------------------------
+# 🔥 Steps (heavy modules are imported here, not at app import)
+# ------------------------------------------------------------------
+
+def create_schema() -> None:
+    """Create missing tables (DB_AUTO_CREATE, local development only)."""
+    from src.database.migrate import create_tables
+    create_tables()
+
+
+def prefill_db_pool() -> None:
+    """Open the pool's connections up front."""
+    engine = create_db_engine(settings["DATABASE_URL"])
+    pool_size = getattr(engine.pool, "size", lambda: 1)()
+    connections = []
+    try:
+        # Hold them all at once, otherwise the pool would hand back the same one
+        for _ in range(min(settings["WARMUP_DB_CONNECTIONS"], pool_size)):
+            connection = engine.connect()
+            connection.execute(text("SELECT 1"))
+            connections.append(connection)
+    finally:
+        for connection in connections:
+            connection.close()
+
+
+def build_agent_graph() -> None:
+    """Import LangGraph/LangChain and compile the travel agent graph."""
+    from src.services.travel_service import get_travel_agent
+    get_travel_agent()
+
+
+def open_llm_connections() -> None:
+    """Build the routed chat models and open a connection per model."""
+    from src.llms.factory import LLM_TASKS, get_llm_route, get_task_model
+
+    pinged = set()
+    for task in LLM_TASKS:
+        model = get_task_model(task)
+        route = get_llm_route(task)
+        if route.model in pinged:
+            continue
+        # Cheap metadata call: establishes TLS and checks the API key
+        model.root_client.with_options(timeout=settings["WARMUP_TIMEOUT_S"]).models.retrieve(route.model)
+        pinged.add(route.model)
+
+
+def open_serpapi_connection() -> None:
+    """Open the shared SerpAPI client's HTTPS connection."""
+    from src.tools.tool import get_serpapi_client
+
+    client = get_serpapi_client()
+    client.session.head(client.BASE_DOMAIN, timeout=settings["WARMUP_TIMEOUT_S"])
+
+
+# ------------------------------------------------------------------
+# 🚀 Lazy singleton
+# ------------------------------------------------------------------
+
+_WARMUP: Optional[Warmup] = None
+
+
+def get_warmup() -> Warmup:
+    """Get the worker's warm-up runner (no steps when WARMUP_ENABLED is false)."""
+    global _WARMUP
+    if _WARMUP is None:
+        steps = []
+        if settings["DB_AUTO_CREATE"]:
+            steps.append(WarmupStep("schema", create_schema))
+        if settings["WARMUP_ENABLED"]:
+            steps += [
+                WarmupStep("database", prefill_db_pool),
+                WarmupStep("agent_graph", build_agent_graph),
+                WarmupStep("llm", open_llm_connections, required=False),
+                WarmupStep("serpapi", open_serpapi_connection, required=False),
+            ]
+        _WARMUP = Warmup(steps, retry_interval=settings["WARMUP_RETRY_INTERVAL_S"])
+    return _WARMUP
@@ -1,2 +1,3 @@
-from .tool import flights_finder, hotels_finder
-_all__ = ["flights_finder", "hotels_finder"]
\ No newline at end of file
+from .tool import flights_finder, hotels_finder, more_results, refine_results, watch_price, start_speculative_search
+from .registry import ALL_TOOLS, select_tools
+_all__ = ["flights_finder", "hotels_finder", "more_results", "refine_results", "watch_price", "start_speculative_search", "ALL_TOOLS", "select_tools"]
\ No newline at end of file
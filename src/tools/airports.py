@@ -0,0 +1,250 @@
+# 📁 tools/airports.py
+# Offline airport lookup: resolves city / airport names to IATA codes
+
+import csv
+import difflib
+import unicodedata
+from bisect import bisect_left
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.tools.spatial import KDTree
+
+
+AIRPORTS_CSV = Path(__file__).parent / "data" / "airports.csv"
+
+
+# ------------------------------------------------------------------
+# ✈️ Airport record
+# ------------------------------------------------------------------
+
+@dataclass(frozen=True, slots=True)
+class Airport:
+    """A single airport from the bundled dataset."""
+
+    iata: str
+    name: str
+    city: str
+    country: str
+    lat: float
+    lon: float
+
+
+def normalize_key(text: str) -> str:
+    """
+    Normalize free text for index lookups.
+
+    Strips accents, punctuation and extra whitespace and lower-cases the
+    result, so "Zürich", "zurich " and "ZURICH" map to the same key.
+    """
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = "".join(ch if ch.isalnum() else " " for ch in text.lower())
+    return " ".join(text.split())
+
+
+# ------------------------------------------------------------------
+# 🗂️ Prefix / fuzzy index
+# ------------------------------------------------------------------
+
+class AirportIndex:
+    """
+    Compact in-memory index over the airport dataset.
+
+    Every airport is reachable by IATA code, city, city aliases and airport
+    name. Names are stored once in a sorted key list, so prefix lookups are
+    a binary search and fuzzy lookups only run when nothing else matched.
+    """
+
+    def __init__(self, airports: List[Airport], aliases: Dict[str, List[str]] | None = None):
+        self._by_iata: Dict[str, Airport] = {a.iata: a for a in airports}
+
+        # key -> IATA codes, in dataset order (first code is the primary airport)
+        key_codes: Dict[str, List[str]] = {}
+        for airport in airports:
+            names = [airport.city, airport.name, *(aliases or {}).get(airport.iata, [])]
+            for name in names:
+                key = normalize_key(name)
+                if key and airport.iata not in key_codes.setdefault(key, []):
+                    key_codes[key].append(airport.iata)
+
+        self._keys: List[str] = sorted(key_codes)
+        self._codes: List[Tuple[str, ...]] = [tuple(key_codes[k]) for k in self._keys]
+
+        # Spatial index for nearby-airport lookups
+        self._airports: List[Airport] = list(airports)
+        self._tree = KDTree([(a.lat, a.lon) for a in self._airports])
+
+    def __len__(self) -> int:
+        return len(self._by_iata)
+
+    def get(self, code: str) -> Optional[Airport]:
+        """Return the airport for an IATA code, or None if unknown."""
+        return self._by_iata.get(code.strip().upper())
+
+    def all(self) -> List[Airport]:
+        """Return every airport in dataset order."""
+        return list(self._by_iata.values())
+
+    def _exact(self, key: str) -> Tuple[str, ...]:
+        i = bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            return self._codes[i]
+        return ()
+
+    def _prefix(self, key: str) -> List[str]:
+        codes: List[str] = []
+        i = bisect_left(self._keys, key)
+        while i < len(self._keys) and self._keys[i].startswith(key):
+            codes.extend(c for c in self._codes[i] if c not in codes)
+            i += 1
+        return codes
+
+    def search(self, query: str, limit: int = 5) -> List[Airport]:
+        """
+        Find airports matching a code, city or airport name.
+
+        Tries, in order: exact IATA code, exact name, name prefix, and
+        finally fuzzy matching to absorb typos.
+
+        Args:
+            query: Free text typed by the user (e.g. "bangalore", "LHR")
+            limit: Maximum number of airports to return
+
+        Returns:
+            Matching airports, best match first
+        """
+        key = normalize_key(query)
+        if not key:
+            return []
+
+        codes: List[str] = []
+        if len(key) == 3 and key.upper() in self._by_iata:
+            codes.append(key.upper())
+
+        for code in self._exact(key) or self._prefix(key):
+            if code not in codes:
+                codes.append(code)
+
+        if not codes:
+            for match in difflib.get_close_matches(key, self._keys, n=limit, cutoff=0.8):
+                codes.extend(c for c in self._exact(match) if c not in codes)
+
+        return [self._by_iata[c] for c in codes[:limit]]
+
+    def resolve(self, query: str) -> Optional[str]:
+        """
+        Resolve free text to a single IATA code.
+
+        Returns a code only when the match is unambiguous: a known IATA
+        code, or a name whose candidates all belong to one city (the
+        city's primary airport is returned). Returns None otherwise.
+        """
+        airport = self.get(query) if len(query.strip()) == 3 else None
+        if airport:
+            return airport.iata
+
+        candidates = self.search(query, limit=10)
+        if not candidates:
+            return None
+
+        if len({(a.city, a.country) for a in candidates}) == 1:
+            return candidates[0].iata
+        return None
+
+    def nearby(self, code: str, radius_km: float) -> List[Tuple[Airport, float]]:
+        """
+        Find other airports within a radius of the given airport.
+
+        Args:
+            code: IATA code of the reference airport
+            radius_km: Search radius in km
+
+        Returns:
+            List of (airport, distance in km), nearest first, excluding
+            the reference airport itself. Empty if the code is unknown.
+        """
+        origin = self.get(code)
+        if origin is None:
+            return []
+
+        return [
+            (self._airports[i], distance)
+            for i, distance in self._tree.query_radius(origin.lat, origin.lon, radius_km)
+            if self._airports[i].iata != origin.iata
+        ]
+
+
+def nearby_routes(
+    index: AirportIndex,
+    departure: str,
+    arrival: str,
+    radius_km: float,
+    max_routes: int,
+) -> List[Tuple[str, str]]:
+    """
+    Plan alternative (departure, arrival) pairs using neighbouring airports.
+
+    The requested route always comes first; alternatives follow ordered by
+    the total distance from the requested airports, capped at max_routes.
+
+    Args:
+        index: Airport index
+        departure: Requested departure IATA code
+        arrival: Requested arrival IATA code
+        radius_km: Radius around each airport to consider
+        max_routes: Upstream search budget (including the requested route)
+
+    Returns:
+        List of (departure, arrival) IATA code pairs
+    """
+    departures = [(departure, 0.0)] + [(a.iata, d) for a, d in index.nearby(departure, radius_km)]
+    arrivals = [(arrival, 0.0)] + [(a.iata, d) for a, d in index.nearby(arrival, radius_km)]
+
+    candidates = sorted(
+        ((dep_d + arr_d, dep, arr) for dep, dep_d in departures for arr, arr_d in arrivals if dep != arr),
+        key=lambda item: item[0],
+    )
+    return [(dep, arr) for _, dep, arr in candidates[:max(max_routes, 1)]]
+
+
+# ------------------------------------------------------------------
+# 🚀 Lazy singleton
+# ------------------------------------------------------------------
+
+_AIRPORT_INDEX: Optional[AirportIndex] = None
+
+
+def load_airports(path: Path = AIRPORTS_CSV) -> Tuple[List[Airport], Dict[str, List[str]]]:
+    """
+    Load airports and their name aliases from the bundled CSV.
+
+    Returns:
+        Tuple of (airports, aliases keyed by IATA code)
+    """
+    airports: List[Airport] = []
+    aliases: Dict[str, List[str]] = {}
+
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            airports.append(Airport(
+                iata=row["iata"],
+                name=row["name"],
+                city=row["city"],
+                country=row["country"],
+                lat=float(row["lat"]),
+                lon=float(row["lon"]),
+            ))
+            if row["aliases"]:
+                aliases[row["iata"]] = row["aliases"].split("|")
+
+    return airports, aliases
+
+
+def get_airport_index() -> AirportIndex:
+    """Get or build the airport index (lazy initialization)."""
+    global _AIRPORT_INDEX
+    if _AIRPORT_INDEX is None:
+        _AIRPORT_INDEX = AirportIndex(*load_airports())
+    return _AIRPORT_INDEX
@@ -1,9 +1,54 @@
 # 📁 tools/parsers.py
 # Parsers for cleaning SerpAPI responses
 
+import math
+from array import array
 from typing import Dict, List
 
 
+def clean_flight(flight_option: Dict) -> Dict | None:
+    """
+    Extract the essential fields of one SerpAPI flight option.
+    
+    Args:
+        flight_option: One entry of best_flights / other_flights
+        
+    Returns:
+        Cleaned flight dictionary, or None if the option has no legs
+    """
+    # Get flight legs
+    flight_legs = flight_option.get("flights", [])
+    if not flight_legs:
+        return None
+    
+    # Get first leg (outbound)
+    first_leg = flight_legs[0]
+    
+    # Extract departure info
+    dep_airport = first_leg.get("departure_airport", {})
+    dep_name = dep_airport.get("name", "Unknown")
+    dep_id = dep_airport.get("id", "")
+    dep_time = dep_airport.get("time", "")
+    
+    # Extract arrival info (from last leg for multi-leg flights)
+    last_leg = flight_legs[-1]
+    arr_airport = last_leg.get("arrival_airport", {})
+    arr_name = arr_airport.get("name", "Unknown")
+    arr_id = arr_airport.get("id", "")
+    arr_time = arr_airport.get("time", "")
+    
+    # Build cleaned flight object
+    return {
+        "airline": first_leg.get("airline", "Unknown"),
+        "departure": f"{dep_name} ({dep_id}) on {dep_time}",
+        "arrival": f"{arr_name} ({arr_id}) on {arr_time}",
+        "duration": f"{flight_option.get('total_duration', 0)} minutes",
+        "stops": len(flight_legs) - 1,
+        "price": f"₹{flight_option.get('price', 0)}",
+        "airline_logo": flight_option.get("airline_logo", "")
+    }
+
+
 def parse_flight_response(raw_response: Dict) -> List[Dict]:
     """
     Parse raw SerpAPI flight response and extract essential fields.
@@ -15,8 +60,6 @@ def parse_flight_response(raw_response: Dict) -> List[Dict]:
     Returns:
         List of cleaned flight dictionaries (max 5)
     """
-    flights = []
-    
     # Try best_flights first, fallback to other_flights if empty
     flight_options = raw_response.get("best_flights", [])
     
@@ -24,45 +67,66 @@ def parse_flight_response(raw_response: Dict) -> List[Dict]:
         flight_options = raw_response.get("other_flights", [])
     
     # Limit to top 5
-    top_flights = flight_options[:5]
+    flights = []
+    for flight_option in flight_options[:5]:
+        cleaned_flight = clean_flight(flight_option)
+        if cleaned_flight is not None:
+            flights.append(cleaned_flight)
     
-    for flight_option in top_flights:
-        # Get flight legs
-        flight_legs = flight_option.get("flights", [])
-        if not flight_legs:
-            continue
-        
-        # Get first leg (outbound)
-        first_leg = flight_legs[0]
-        
-        # Extract departure info
-        dep_airport = first_leg.get("departure_airport", {})
-        dep_name = dep_airport.get("name", "Unknown")
-        dep_id = dep_airport.get("id", "")
-        dep_time = dep_airport.get("time", "")
-        
-        # Extract arrival info (from last leg for multi-leg flights)
-        last_leg = flight_legs[-1]
-        arr_airport = last_leg.get("arrival_airport", {})
-        arr_name = arr_airport.get("name", "Unknown")
-        arr_id = arr_airport.get("id", "")
-        arr_time = arr_airport.get("time", "")
-        
-        # Build cleaned flight object
-        cleaned_flight = {
-            "airline": first_leg.get("airline", "Unknown"),
-            "departure": f"{dep_name} ({dep_id}) on {dep_time}",
-            "arrival": f"{arr_name} ({arr_id}) on {arr_time}",
-            "duration": f"{flight_option.get('total_duration', 0)} minutes",
-            "price": f"₹{flight_option.get('price', 0)}",
-            "airline_logo": flight_option.get("airline_logo", "")
-        }
-        
-        flights.append(cleaned_flight)
+    return flights
+
+
+def parse_all_flights(raw_response: Dict) -> List[Dict]:
+    """
+    Parse every flight in a SerpAPI response (best_flights, then other_flights).
     
+    Used to keep the full result set for "show more" without a new search.
+    """
+    flights = []
+    for flight_option in raw_response.get("best_flights", []) + raw_response.get("other_flights", []):
+        cleaned_flight = clean_flight(flight_option)
+        if cleaned_flight is not None:
+            flights.append(cleaned_flight)
     return flights
 
 
+def clean_hotel(hotel: Dict) -> Dict:
+    """
+    Extract the essential fields of one SerpAPI hotel property.
+    
+    Args:
+        hotel: One entry of properties
+        
+    Returns:
+        Cleaned hotel dictionary
+    """
+    # Extract rate information
+    rate_per_night = hotel.get("rate_per_night", {})
+    rate_amount = rate_per_night.get("extracted_lowest")
+    rate_display = rate_per_night.get("lowest", "Not Provided")
+    
+    total_rate = hotel.get("total_rate", {})
+    total_amount = total_rate.get("extracted_lowest")
+    total_display = total_rate.get("lowest", "Not Provided")
+    
+    # Extract hotel logo/image
+    images = hotel.get("images", [])
+    hotel_logo = images[0].get("thumbnail", "") if images else ""
+    
+    # Build cleaned hotel object
+    return {
+        "name": hotel.get("name", "Unknown Hotel"),
+        "description": hotel.get("description", "No description available"),
+        "rate_per_night": rate_display if rate_amount else "Not Provided",
+        "total_rate_for_stay": total_display if total_amount else "Not Provided",
+        "rating": hotel.get("overall_rating", "N/A"),
+        "check_in_time": hotel.get("check_in_time", "Not specified"),
+        "check_out_time": hotel.get("check_out_time", "Not specified"),
+        "hotel_class": hotel.get("hotel_class", "Not specified"),
+        "hotel_logo": hotel_logo
+    }
+
+
 def parse_hotel_response(raw_response: Dict) -> List[Dict]:
     """
     Parse raw SerpAPI hotel response and extract essential fields.
@@ -74,41 +138,87 @@ def parse_hotel_response(raw_response: Dict) -> List[Dict]:
     Returns:
         List of cleaned hotel dictionaries (max 5)
     """
-    hotels = []
-    
-    # Get properties from response
+    # Get properties from response, limit to top 5
     properties = raw_response.get("properties", [])
+    return [clean_hotel(hotel) for hotel in properties[:5]]
+
+
+def parse_all_hotels(raw_response: Dict) -> List[Dict]:
+    """Parse every property in a SerpAPI hotels response page."""
+    return [clean_hotel(hotel) for hotel in raw_response.get("properties", [])]
+
+
+def next_page_token(raw_response: Dict) -> str | None:
+    """SerpAPI token for the next page of results, if there is one."""
+    return (raw_response.get("serpapi_pagination") or {}).get("next_page_token")
+
+
+def _price_value(flight: Dict) -> float:
+    """Numeric price of a cleaned flight (unknown prices sort last)."""
+    digits = "".join(ch for ch in flight.get("price", "") if ch.isdigit() or ch == ".")
+    try:
+        price = float(digits)
+    except ValueError:
+        return float("inf")
+    return price if price > 0 else float("inf")
+
+
+def rank_flights(flight_lists: List[List[Dict]], limit: int | None = 5) -> List[Dict]:
+    """
+    Merge cleaned flights from several searches into one list, cheapest first.
     
-    # Limit to top 5
-    top_properties = properties[:5]
-    
-    for hotel in top_properties:
-        # Extract rate information
-        rate_per_night = hotel.get("rate_per_night", {})
-        rate_amount = rate_per_night.get("extracted_lowest")
-        rate_display = rate_per_night.get("lowest", "Not Provided")
-        
-        total_rate = hotel.get("total_rate", {})
-        total_amount = total_rate.get("extracted_lowest")
-        total_display = total_rate.get("lowest", "Not Provided")
-        
-        # Extract hotel logo/image
-        images = hotel.get("images", [])
-        hotel_logo = images[0].get("thumbnail", "") if images else ""
-        
-        # Build cleaned hotel object
-        cleaned_hotel = {
-            "name": hotel.get("name", "Unknown Hotel"),
-            "description": hotel.get("description", "No description available"),
-            "rate_per_night": rate_display if rate_amount else "Not Provided",
-            "total_rate_for_stay": total_display if total_amount else "Not Provided",
-            "rating": hotel.get("overall_rating", "N/A"),
-            "check_in_time": hotel.get("check_in_time", "Not specified"),
-            "check_out_time": hotel.get("check_out_time", "Not specified"),
-            "hotel_class": hotel.get("hotel_class", "Not specified"),
-            "hotel_logo": hotel_logo
-        }
+    Args:
+        flight_lists: Cleaned flight lists, one per searched route
+        limit: Maximum number of flights to return (None for all)
         
-        hotels.append(cleaned_hotel)
+    Returns:
+        Merged list of cleaned flight dictionaries (max `limit`)
+    """
+    merged = [flight for flights in flight_lists for flight in flights]
+    merged.sort(key=_price_value)
+    return merged[:limit]
+
+
+# ------------------------------------------------------------------
+# 📊 Columns for local refinement
+# ------------------------------------------------------------------
+
+# Numeric columns kept per result kind; missing values are NaN
+RESULT_COLUMNS = {
+    "flights": {"price": "price", "duration": "duration", "stops": "stops"},
+    "hotels": {"price": "rate_per_night", "rating": "rating", "hotel_class": "hotel_class"},
+}
+
+
+def _number(value) -> float:
+    """Numeric value of a cleaned field ("₹40,206", "725 minutes", "4-star hotel", 4.6); NaN if unknown."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if not isinstance(value, str):
+        return math.nan
+    digits = "".join(ch for ch in value if ch.isdigit() or ch == ".")
+    try:
+        number = float(digits)
+    except ValueError:
+        return math.nan
+    return number
+
+
+def result_columns(kind: str, items: List[Dict]) -> Dict[str, array]:
+    """
+    Columnar numeric view of cleaned results, aligned with `items`.
     
-    return hotels
+    Args:
+        kind: "flights" or "hotels"
+        items: Cleaned result dictionaries
+        
+    Returns:
+        Column name -> array of doubles (NaN where a value is unknown)
+    """
+    columns = {
+        column: array("d", [_number(item.get(field)) for item in items])
+        for column, field in RESULT_COLUMNS[kind].items()
+    }
+    # A zero price means SerpAPI had none
+    columns["price"] = array("d", [price if price > 0 else math.nan for price in columns["price"]])
+    return columns
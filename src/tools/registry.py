@@ -0,0 +1,58 @@
+# 📁 tools/registry.py
+# Which tools to bind for a turn, by the intent of the user's message
+
+import re
+from typing import List, Optional, Set, Tuple
+
+from langchain_core.tools import BaseTool
+
+from src.tools.results_cache import search_results_cache
+from src.tools.tool import flights_finder, hotels_finder, more_results, refine_results, watch_price
+
+
+# Every tool the agent can run, in binding order (bound subsets keep this order)
+ALL_TOOLS: Tuple[BaseTool, ...] = (flights_finder, hotels_finder, more_results, refine_results, watch_price)
+
+SEARCH_TOOLS = {"flights": flights_finder, "hotels": hotels_finder}
+
+# Only useful once the session has a search to page, refine or watch
+RESULT_TOOLS: Tuple[BaseTool, ...] = (more_results, refine_results, watch_price)
+
+_INTENTS = {
+    "flights": re.compile(
+        r"\b(flights?|fly|flying|airlines?|airports?|fares?|non-?stop|layovers?|one-?way|round-?trip)\b",
+        re.I,
+    ),
+    "hotels": re.compile(
+        r"\b(hotels?|stays?|rooms?|resorts?|hostels?|accommodation|check[\s-]?(?:in|out)|nights?)\b",
+        re.I,
+    ),
+}
+
+
+def detect_intents(message: str) -> Set[str]:
+    """Search kinds ("flights", "hotels") the message explicitly mentions."""
+    return {kind for kind, pattern in _INTENTS.items() if pattern.search(message)}
+
+
+def select_tools(message: Optional[str], session_id: Optional[str]) -> List[BaseTool]:
+    """
+    Tools to bind for a turn.
+
+    A message that names only flights or only hotels gets that search
+    tool; anything else (no keyword, both, not a text message) keeps both.
+    more_results / refine_results / watch_price are added only when the
+    session has a cached search for them to act on.
+
+    Args:
+        message: Latest user message of the turn
+        session_id: Chat session (for the cached search)
+
+    Returns:
+        Subset of ALL_TOOLS, in ALL_TOOLS order
+    """
+    kinds = detect_intents(message) if message else set()
+    selected = {SEARCH_TOOLS[kind].name for kind in kinds or SEARCH_TOOLS}
+    if search_results_cache.get(session_id) is not None:
+        selected.update(tool.name for tool in RESULT_TOOLS)
+    return [tool for tool in ALL_TOOLS if tool.name in selected]
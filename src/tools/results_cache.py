@@ -0,0 +1,183 @@
+# 📁 tools/results_cache.py
+# Per-session cache of the last search results, for "show more" and
+# refinements (filter / re-sort) without a new search
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from array import array
+from dataclasses import dataclass, field
+from itertools import compress
+from typing import Dict, Iterator, List, Optional
+
+from src.core import settings
+from src.core.metrics import metrics
+from src.tools.parsers import result_columns
+
+
+# Session of the chat turn being processed, so tools can find its results
+_search_session: ContextVar[Optional[str]] = ContextVar("search_session", default=None)
+
+
+@contextmanager
+def search_session(session_id: object) -> Iterator[None]:
+    """Make `session_id` the owner of search results cached inside the block."""
+    token = _search_session.set(str(session_id))
+    try:
+        yield
+    finally:
+        _search_session.reset(token)
+
+
+def current_search_session() -> Optional[str]:
+    return _search_session.get()
+
+
+@dataclass
+class SearchResults:
+    """
+    Full parsed result set of one search.
+
+    `columns` holds the numeric fields of `items` column-wise for local
+    refinement. `view` is the item order of the last refinement (None for
+    the search's own order) and `shown` is how many entries of it the user
+    has seen; `next_page_token` lets the next upstream page be fetched with
+    the original `search_params`.
+    """
+
+    kind: str
+    search_params: Dict
+    items: List[Dict]
+    shown: int
+    next_page_token: Optional[str] = None
+    columns: Dict[str, array] = field(default_factory=dict, repr=False)
+    view: Optional[List[int]] = None
+    expires_at: float = 0.0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def extend(self, items: List[Dict], next_page_token: Optional[str]) -> None:
+        """Append the next upstream page, keeping `columns` aligned."""
+        self.items.extend(items)
+        for column, values in result_columns(self.kind, items).items():
+            self.columns[column].extend(values)
+        self.next_page_token = next_page_token
+
+    def select(
+        self,
+        max_values: Dict[str, float],
+        min_values: Dict[str, float],
+        sort_by: Optional[str] = None,
+        descending: bool = False,
+    ) -> List[int]:
+        """
+        Indices of the items passing every bound, optionally re-sorted.
+        
+        Each bound is one pass over a column; unknown (NaN) values never
+        pass a bound and sort last.
+        
+        Args:
+            max_values: Column -> inclusive upper bound
+            min_values: Column -> inclusive lower bound
+            sort_by: Column to sort by (None keeps the search's order)
+            descending: Sort highest first
+            
+        Returns:
+            Item indices in display order
+        """
+        mask = [True] * len(self.items)
+        for column, bound in max_values.items():
+            mask = [keep and value <= bound for keep, value in zip(mask, self.columns[column])]
+        for column, bound in min_values.items():
+            mask = [keep and value >= bound for keep, value in zip(mask, self.columns[column])]
+        indices = list(compress(range(len(mask)), mask))
+        
+        if sort_by is not None:
+            values = self.columns[sort_by]
+            sign = -1.0 if descending else 1.0
+            indices.sort(key=lambda i: (math.isnan(values[i]), sign * values[i]))
+        return indices
+
+    def remaining(self) -> int:
+        """Entries of the current order the user has not seen yet."""
+        total = len(self.items) if self.view is None else len(self.view)
+        return total - self.shown
+
+    def take(self, count: int) -> List[Dict]:
+        """Next `count` unseen items in the current order."""
+        if self.view is None:
+            page = self.items[self.shown:self.shown + count]
+        else:
+            page = [self.items[i] for i in self.view[self.shown:self.shown + count]]
+        self.shown += len(page)
+        return page
+
+
+class SearchResultsCache:
+    """
+    LRU + TTL map of session id -> last search results (per worker).
+
+    A miss (expired, evicted, or served by another worker) only means the
+    caller has to search again.
+    """
+
+    def __init__(self, ttl: float, max_sessions: int):
+        self._ttl = ttl
+        self._max_sessions = max_sessions
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, SearchResults]" = OrderedDict()
+
+    def put(self, session_id: Optional[str], results: SearchResults) -> None:
+        if session_id is None:
+            return
+        results.expires_at = time.monotonic() + self._ttl
+        with self._lock:
+            self._entries[session_id] = results
+            self._entries.move_to_end(session_id)
+            while len(self._entries) > self._max_sessions:
+                self._entries.popitem(last=False)
+                metrics.counter("search_cache.evictions").inc()
+        metrics.gauge("search_cache.sessions").set(len(self._entries))
+
+    def get(self, session_id: Optional[str]) -> Optional[SearchResults]:
+        if session_id is None:
+            return None
+        with self._lock:
+            results = self._entries.get(session_id)
+            if results is None:
+                return None
+            if results.expires_at < time.monotonic():
+                del self._entries[session_id]
+                return None
+            self._entries.move_to_end(session_id)
+            results.expires_at = time.monotonic() + self._ttl
+            return results
+
+
+search_results_cache = SearchResultsCache(
+    ttl=settings["SEARCH_RESULTS_TTL_S"],
+    max_sessions=settings["SEARCH_RESULTS_MAX_SESSIONS"],
+)
+
+
+def remember_results(
+    kind: str,
+    search_params: Dict,
+    items: List[Dict],
+    shown: int,
+    next_page_token: Optional[str] = None,
+) -> None:
+    """Cache a search's full results for the current chat session."""
+    search_results_cache.put(
+        current_search_session(),
+        SearchResults(
+            kind=kind,
+            search_params=search_params,
+            items=items,
+            shown=min(shown, len(items)),
+            next_page_token=next_page_token,
+            columns=result_columns(kind, items),
+        ),
+    )
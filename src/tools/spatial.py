@@ -0,0 +1,116 @@
+# 📁 tools/spatial.py
+# KD-tree over airport coordinates for radius queries
+
+import math
+from typing import List, Optional, Sequence, Tuple
+
+
+EARTH_RADIUS_KM = 6371.0088
+
+Point = Tuple[float, float, float]
+
+
+def to_unit_vector(lat: float, lon: float) -> Point:
+    """Convert latitude/longitude (degrees) to a point on the unit sphere."""
+    phi = math.radians(lat)
+    lam = math.radians(lon)
+    return (
+        math.cos(phi) * math.cos(lam),
+        math.cos(phi) * math.sin(lam),
+        math.sin(phi),
+    )
+
+
+def chord_for_distance(distance_km: float) -> float:
+    """Straight-line (chord) length on the unit sphere for a great-circle distance."""
+    angle = min(distance_km / EARTH_RADIUS_KM, math.pi)
+    return 2 * math.sin(angle / 2)
+
+
+def distance_for_chord(chord: float) -> float:
+    """Great-circle distance in km for a chord length on the unit sphere."""
+    return 2 * math.asin(min(chord / 2, 1.0)) * EARTH_RADIUS_KM
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two coordinates in km."""
+    a = to_unit_vector(lat1, lon1)
+    b = to_unit_vector(lat2, lon2)
+    return distance_for_chord(math.dist(a, b))
+
+
+# ------------------------------------------------------------------
+# 🌳 KD-tree
+# ------------------------------------------------------------------
+
+class _Node:
+    __slots__ = ("index", "axis", "left", "right")
+
+    def __init__(self, index: int, axis: int, left: "Optional[_Node]", right: "Optional[_Node]"):
+        self.index = index
+        self.axis = axis
+        self.left = left
+        self.right = right
+
+
+class KDTree:
+    """
+    Static 3-d tree over points on the unit sphere.
+
+    Coordinates are stored as unit vectors, so Euclidean chord distance is
+    monotonic with great-circle distance and no trigonometry is needed while
+    walking the tree.
+    """
+
+    def __init__(self, coordinates: Sequence[Tuple[float, float]]):
+        self._points: List[Point] = [to_unit_vector(lat, lon) for lat, lon in coordinates]
+        self._root = self._build(list(range(len(self._points))), depth=0)
+
+    def _build(self, indices: List[int], depth: int) -> Optional[_Node]:
+        if not indices:
+            return None
+        axis = depth % 3
+        indices.sort(key=lambda i: self._points[i][axis])
+        mid = len(indices) // 2
+        return _Node(
+            index=indices[mid],
+            axis=axis,
+            left=self._build(indices[:mid], depth + 1),
+            right=self._build(indices[mid + 1:], depth + 1),
+        )
+
+    def query_radius(self, lat: float, lon: float, radius_km: float) -> List[Tuple[int, float]]:
+        """
+        Find all points within a great-circle radius.
+
+        Args:
+            lat: Latitude of the query point (degrees)
+            lon: Longitude of the query point (degrees)
+            radius_km: Search radius in km
+
+        Returns:
+            List of (point index, distance in km), nearest first
+        """
+        target = to_unit_vector(lat, lon)
+        max_chord = chord_for_distance(radius_km)
+        found: List[Tuple[int, float]] = []
+
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+
+            point = self._points[node.index]
+            chord = math.dist(point, target)
+            if chord <= max_chord:
+                found.append((node.index, distance_for_chord(chord)))
+
+            diff = target[node.axis] - point[node.axis]
+            near, far = (node.left, node.right) if diff < 0 else (node.right, node.left)
+            stack.append(near)
+            if abs(diff) <= max_chord:
+                stack.append(far)
+
+        found.sort(key=lambda item: item[1])
+        return found
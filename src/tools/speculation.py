@@ -0,0 +1,223 @@
+# 📁 tools/speculation.py
+# Speculative searches: start the likely next search while the planning
+# LLM call is still running, and hand the result to the tool if it asks
+# for exactly that search
+
+import contextvars
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from src.core import settings
+from src.core.deadline import time_remaining
+from src.core.metrics import metrics
+from src.tools.airports import get_airport_index
+from src.tools.results_cache import SearchResults
+
+
+# ------------------------------------------------------------------
+# 🔮 Prediction
+# ------------------------------------------------------------------
+
+# Tool arguments of a hotels search (the cached parameters also hold SerpAPI's)
+HOTEL_TOOL_FIELDS = ("q", "check_in_date", "check_out_date", "adults", "children", "rooms", "sort_by", "hotel_class")
+
+_DATE = re.compile(r"\b\d{4}-\d{2}-\d{2}\b")
+_COUNTS = {
+    "adults": re.compile(r"\b(\d{1,2})\s*(?:adults?|people|persons|travell?ers|guests)\b", re.I),
+    "children": re.compile(r"\b(\d{1,2})\s*(?:child(?:ren)?|kids?)\b", re.I),
+    "rooms": re.compile(r"\b(\d{1,2})\s*rooms?\b", re.I),
+}
+_STARS = re.compile(r"\b([1-5])[\s-]*star\b", re.I)
+# Direction word required: a bare code could be either end of the route
+_IATA = re.compile(r"\b(from|to)\s+([A-Z]{3})\b", re.I)
+_SECOND_DATE = re.compile(r"\b(?:return|back|check[\s-]?out|until|till)\b", re.I)
+
+
+def _date_slots(kind: str, message: str) -> Dict[str, str]:
+    first, second = ("outbound_date", "return_date") if kind == "flights" else ("check_in_date", "check_out_date")
+    dates = _DATE.findall(message)
+    if len(dates) >= 2:
+        return {first: dates[0], second: dates[1]}
+    if len(dates) == 1:
+        return {second if _SECOND_DATE.search(message) else first: dates[0]}
+    return {}
+
+
+def _airport_slots(message: str) -> Dict[str, str]:
+    index = get_airport_index()
+    slots: Dict[str, str] = {}
+    for direction, code in _IATA.findall(message):
+        # Only upper-case codes, so "to the" is not read as an airport
+        if not code.isupper() or index.get(code) is None:
+            continue
+        slots["departure_airport" if direction.lower() == "from" else "arrival_airport"] = code
+    return slots
+
+
+def predict_search(results: SearchResults, message: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """
+    Predict the search a follow-up message will ask for.
+
+    Only tweaks of the last search are predicted: new dates, passenger or
+    room counts, star class or (flights) an airport given as "from/to <IATA code>".
+    Every other argument is carried over from the cached search.
+
+    Args:
+        results: The session's last search
+        message: The new user message
+
+    Returns:
+        Tuple of (kind, tool arguments), or None when the message does not
+        recognizably change the last search
+    """
+    if results.kind == "flights":
+        current = dict(results.search_params)
+    else:
+        current = {name: results.search_params.get(name) for name in HOTEL_TOOL_FIELDS}
+
+    slots = _date_slots(results.kind, message)
+    for name, pattern in _COUNTS.items():
+        if name in current and (match := pattern.search(message)):
+            slots[name] = int(match.group(1))
+    if results.kind == "flights":
+        slots.update(_airport_slots(message))
+    elif match := _STARS.search(message):
+        slots["hotel_class"] = match.group(1)
+
+    changed = {name: value for name, value in slots.items() if current.get(name) != value}
+    if not changed:
+        return None
+    return results.kind, {**current, **changed}
+
+
+def search_key(kind: str, search_params: Dict[str, Any]) -> str:
+    """Identity of a search: its kind and normalized upstream parameters."""
+    return json.dumps([kind, search_params], sort_keys=True, default=str)
+
+
+# ------------------------------------------------------------------
+# 🏃 In-flight speculations
+# ------------------------------------------------------------------
+
+@dataclass
+class _Speculation:
+    key: str
+    future: Future
+    started: float
+    expires_at: float
+    finished: Optional[float] = None
+
+
+class SpeculativeSearches:
+    """
+    At most one speculative search per session, bounded in total.
+
+    A speculation is used by the first tool call that asks for the same
+    search (a hit). An unused one stays available until `ttl` expires, so
+    a later identical search still skips the upstream call; when replaced
+    or expired unused it counts as a miss.
+    """
+
+    def __init__(self, max_in_flight: int, ttl: float, max_sessions: int):
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, _Speculation]" = OrderedDict()
+        self._ttl = ttl
+        self._max_sessions = max_sessions
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._executor = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="speculative-search")
+
+    def _record_miss(self) -> None:
+        metrics.counter("speculation.misses").inc()
+        self._update_hit_rate()
+
+    def _update_hit_rate(self) -> None:
+        hits = metrics.counter("speculation.hits").value
+        settled = hits + metrics.counter("speculation.misses").value
+        if settled:
+            metrics.gauge("speculation.hit_rate").set(hits / settled)
+
+    def start(self, session_id: str, key: str, func: Callable[..., Any], *args: Any) -> bool:
+        """
+        Run `func(*args)` in the background for `session_id`, in a copy of the caller's context.
+
+        Returns:
+            False when the same search is already running or cached, or
+            every speculation slot is busy
+        """
+        now = time.monotonic()
+        with self._lock:
+            existing = self._entries.get(session_id)
+            if existing is not None and existing.key == key and existing.expires_at > now:
+                return False
+            if not self._slots.acquire(blocking=False):
+                metrics.counter("speculation.skipped").inc()
+                return False
+
+            if existing is not None:
+                del self._entries[session_id]
+                self._record_miss()
+            while len(self._entries) >= self._max_sessions:
+                self._entries.popitem(last=False)
+                self._record_miss()
+
+            context = contextvars.copy_context()
+            future = self._executor.submit(context.run, func, *args)
+            entry = _Speculation(key=key, future=future, started=time.perf_counter(), expires_at=now + self._ttl)
+            self._entries[session_id] = entry
+
+        def finished(_: Future) -> None:
+            entry.finished = time.perf_counter()
+            self._slots.release()
+
+        future.add_done_callback(finished)
+        metrics.counter("speculation.started").inc()
+        return True
+
+    def claim(self, session_id: Optional[str], key: str) -> Optional[Any]:
+        """
+        Result of the session's speculation if it ran exactly this search.
+
+        Waits for a speculation still in flight (within the request
+        deadline). A failed speculation returns None, so the caller runs
+        the search itself.
+        """
+        if session_id is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.monotonic():
+                del self._entries[session_id]
+                self._record_miss()
+                return None
+            if entry.key != key:
+                return None
+            del self._entries[session_id]
+
+        claimed = time.perf_counter()
+        try:
+            result = entry.future.result(timeout=time_remaining())
+        except Exception:
+            metrics.counter("speculation.failed").inc()
+            return None
+
+        # Search time that overlapped the LLM call instead of following it
+        saved = min(claimed, entry.finished or claimed) - entry.started
+        metrics.counter("speculation.hits").inc()
+        metrics.histogram("speculation.saved_seconds").observe(max(saved, 0.0))
+        self._update_hit_rate()
+        return result
+
+
+speculative_searches = SpeculativeSearches(
+    max_in_flight=settings["SPECULATIVE_SEARCH_MAX_IN_FLIGHT"],
+    ttl=settings["SPECULATIVE_SEARCH_TTL_S"],
+    max_sessions=settings["SEARCH_RESULTS_MAX_SESSIONS"],
+)
@@ -1,39 +1,82 @@
-from typing import Dict, List
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
 
 from langchain_core.tools import tool
 from serpapi import Client
 
 from src.core import settings
+from src.core.bulkhead import bulkhead
+from src.core.deadline import check_deadline
+from src.core.metrics import metrics
+from src.exceptions import TravelAgentError
 from src.models import (
     FlightsInput,
-    FlightsInputSchema,
     HotelsInput,
-    HotelsInputSchema,
+    MoreResultsInput,
+    RefineResultsInput,
+    WatchPriceInput,
+)
+from src.tools.airports import get_airport_index, nearby_routes
+from src.tools.parsers import next_page_token, parse_all_flights, parse_all_hotels, rank_flights
+from src.tools.results_cache import (
+    SearchResults,
+    current_search_session,
+    remember_results,
+    search_results_cache,
+)
+from src.tools.speculation import predict_search, search_key, speculative_searches
+from src.tools.validators import (
+    validate_flights_input,
+    validate_hotels_input,
+    validation_error,
 )
-from src.tools.parsers import parse_flight_response, parse_hotel_response
 
 
 # ------------------------------------------------------------------
-# ✈️ Flights Finder Tool
+# 🔌 SerpAPI client
 # ------------------------------------------------------------------
 
-@tool(
-    args_schema=FlightsInputSchema,
-    description=(
-        "Search for flights via SerpAPI. "
-        "Returns list of flights with airline, departure, arrival, duration, price, and airline logo."
-    ),
-)
-def flights_finder(params: FlightsInput) -> List[Dict]:
-    client = Client(api_key=settings["SERPAPI_API_KEY"])
+_SERPAPI_CLIENT: Optional[Client] = None
+
+
+def get_serpapi_client() -> Client:
+    """Shared SerpAPI client, so searches reuse pooled HTTPS connections."""
+    global _SERPAPI_CLIENT
+    if _SERPAPI_CLIENT is None:
+        _SERPAPI_CLIENT = Client(api_key=settings["SERPAPI_API_KEY"])
+    return _SERPAPI_CLIENT
+
+
+def _serpapi_search(search_params: Dict, operation: str) -> Dict:
+    """
+    One SerpAPI call, with its timeout shrunk to the request's remaining budget.
     
+    Runs in the "serpapi" bulkhead, so a slow SerpAPI cannot take threads
+    from LLM- or DB-only work.
+    """
+    with bulkhead("serpapi"):
+        remaining = check_deadline(operation)
+        timeout = settings["SERPAPI_TIMEOUT_S"]
+        if remaining is not None:
+            timeout = min(timeout, remaining)
+        return get_serpapi_client().search(dict(search_params), timeout=timeout).as_dict()
+
+
+# ------------------------------------------------------------------
+# ✈️ Flights Finder Tool
+# ------------------------------------------------------------------
+
+def _search_flights(params: FlightsInput, departure: str, arrival: str) -> List[Dict]:
+    """Run a single Google Flights search for one route and parse every result."""
     search_params = {
         "engine": "google_flights",
         "hl": "en",
         "gl": "in",
         "currency": "INR",
-        "departure_id": params.departure_airport,
-        "arrival_id": params.arrival_airport,
+        "departure_id": departure,
+        "arrival_id": arrival,
         "outbound_date": params.outbound_date,
         "return_date": params.return_date,
         "adults": params.adults,
@@ -42,11 +85,84 @@ def flights_finder(params: FlightsInput) -> List[Dict]:
         "infants_on_lap": params.infants_on_lap,
     }
 
-    results = client.search(search_params)
-    raw_response = results.as_dict()
+    raw_response = _serpapi_search(search_params, "flights search")
     
     # Parse and return clean flight data
-    return parse_flight_response(raw_response)
+    return parse_all_flights(raw_response)
+
+
+def _search_nearby_flights(params: FlightsInput) -> List[Dict]:
+    """Search the requested route plus neighbouring airports concurrently."""
+    routes = nearby_routes(
+        get_airport_index(),
+        params.departure_airport,
+        params.arrival_airport,
+        radius_km=settings["NEARBY_AIRPORTS_RADIUS_KM"],
+        max_routes=settings["NEARBY_AIRPORTS_MAX_SEARCHES"],
+    )
+
+    with ThreadPoolExecutor(max_workers=len(routes)) as executor:
+        # Each search runs in a copy of this context so it keeps the request deadline
+        futures = [
+            executor.submit(contextvars.copy_context().run, _search_flights, params, departure, arrival)
+            for departure, arrival in routes
+        ]
+
+    flight_lists = []
+    for (departure, arrival), future in zip(routes, futures):
+        try:
+            flights = future.result()
+        except Exception:
+            # A failing alternative should not sink the requested route
+            if (departure, arrival) == routes[0]:
+                raise
+            continue
+
+        for flight in flights:
+            flight["searched_route"] = f"{departure}-{arrival}"
+        flight_lists.append(flights)
+
+    return rank_flights(flight_lists, limit=None)
+
+
+@tool(
+    args_schema=FlightsInput,
+    description="Search round-trip flights. Returns airline, times, duration, stops and price per flight.",
+)
+def flights_finder(
+    departure_airport: str,
+    arrival_airport: str,
+    outbound_date: str,
+    return_date: str,
+    adults: int = 1,
+    children: int = 0,
+    infants_in_seat: int = 0,
+    infants_on_lap: int = 0,
+    include_nearby_airports: bool = False,
+) -> List[Dict] | Dict:
+    params = FlightsInput(
+        departure_airport=departure_airport,
+        arrival_airport=arrival_airport,
+        outbound_date=outbound_date,
+        return_date=return_date,
+        adults=adults,
+        children=children,
+        infants_in_seat=infants_in_seat,
+        infants_on_lap=infants_on_lap,
+        include_nearby_airports=include_nearby_airports,
+    )
+    # Resolve city names and reject bad arguments before spending a search
+    params, errors = validate_flights_input(params)
+    if errors:
+        return validation_error(errors)
+
+    search_params = params.model_dump()
+    flights, _ = _claim_or_search("flights", search_params)
+
+    # Keep the full set so "show more" needs no new search
+    page_size = settings["SEARCH_PAGE_SIZE"]
+    remember_results("flights", search_params, flights, shown=page_size)
+    return flights[:page_size]
 
 
 
@@ -55,15 +171,45 @@ def flights_finder(params: FlightsInput) -> List[Dict]:
 # ------------------------------------------------------------------
 
 @tool(
-    args_schema=HotelsInputSchema,
-    description=(
-        "Search for hotels via SerpAPI. "
-        "Returns list of hotels with name, description, rates, rating, check-in/out times, hotel class, and logo."
-    ),
+    args_schema=HotelsInput,
+    description="Search hotels. Returns name, nightly rate, rating, star class and check-in/out times per hotel.",
 )
-def hotels_finder(params: HotelsInput) -> List[Dict]:
-    client = Client(api_key=settings["SERPAPI_API_KEY"])
-    
+def hotels_finder(
+    q: str,
+    check_in_date: str,
+    check_out_date: str,
+    adults: int = 1,
+    children: int = 0,
+    rooms: int = 1,
+    sort_by: Optional[int] = None,
+    hotel_class: Optional[str] = None,
+) -> List[Dict] | Dict:
+    params = HotelsInput(
+        q=q,
+        check_in_date=check_in_date,
+        check_out_date=check_out_date,
+        adults=adults,
+        children=children,
+        rooms=rooms,
+        sort_by=sort_by,
+        hotel_class=hotel_class,
+    )
+    # Reject bad arguments before spending a search
+    params, errors = validate_hotels_input(params)
+    if errors:
+        return validation_error(errors)
+
+    search_params = _hotels_search_params(params)
+    hotels, page_token = _claim_or_search("hotels", search_params)
+
+    # Keep the full page and the next-page token so "show more" needs no new search
+    page_size = settings["SEARCH_PAGE_SIZE"]
+    remember_results("hotels", search_params, hotels, shown=page_size, next_page_token=page_token)
+    return hotels[:page_size]
+
+
+def _hotels_search_params(params: HotelsInput) -> Dict:
+    """SerpAPI parameters of a hotels search (unset sort order / class left out)."""
     search_params = {
         "engine": "google_hotels",
         "hl": "en",
@@ -75,12 +221,306 @@ def hotels_finder(params: HotelsInput) -> List[Dict]:
         "adults": params.adults,
         "children": params.children,
         "rooms": params.rooms,
-        "sort_by": params.sort_by,
-        "hotel_class": params.hotel_class,
     }
+    if params.sort_by is not None:
+        search_params["sort_by"] = params.sort_by
+    if params.hotel_class:
+        search_params["hotel_class"] = params.hotel_class
+    return search_params
 
-    results = client.search(search_params)
-    raw_response = results.as_dict()
+
+def _search_hotels(search_params: Dict) -> Tuple[List[Dict], Optional[str]]:
+    """Run one Google Hotels search (or next-page fetch) and parse every property."""
+    raw_response = _serpapi_search(search_params, "hotels search")
     
     # Parse and return clean hotel data
-    return parse_hotel_response(raw_response)
+    return parse_all_hotels(raw_response), next_page_token(raw_response)
+
+
+def _execute_search(kind: str, search_params: Dict) -> Tuple[List[Dict], Optional[str]]:
+    """Run a search from its cached parameters; returns (results, next-page token)."""
+    if kind == "flights":
+        params = FlightsInput(**search_params)
+        if params.include_nearby_airports:
+            return _search_nearby_flights(params), None
+        return _search_flights(params, params.departure_airport, params.arrival_airport), None
+    return _search_hotels(search_params)
+
+
+def _claim_or_search(kind: str, search_params: Dict) -> Tuple[List[Dict], Optional[str]]:
+    """Take the result of a matching speculative search, or run the search now."""
+    claimed = speculative_searches.claim(current_search_session(), search_key(kind, search_params))
+    if claimed is not None:
+        return claimed
+    return _execute_search(kind, search_params)
+
+
+def run_search(kind: str, search_params: Dict) -> List[Dict]:
+    """
+    Repeat a search from its stored parameters (used by price watches).
+    
+    Args:
+        kind: "flights" (FlightsInput fields) or "hotels" (SerpAPI parameters)
+        search_params: Parameters as cached by flights_finder / hotels_finder
+        
+    Returns:
+        Every cleaned result of the first upstream page
+    """
+    items, _ = _execute_search(kind, search_params)
+    return items
+
+
+# ------------------------------------------------------------------
+# 🔮 Speculative Search
+# ------------------------------------------------------------------
+
+def start_speculative_search(message: str) -> bool:
+    """
+    Start the search a follow-up message most likely leads to, in the background.
+    
+    Called by the agent next to its planning LLM call. The prediction
+    tweaks the session's last search (see predict_search) and is validated
+    like a tool call; flights_finder / hotels_finder use the result only if
+    the model asks for exactly the same search.
+    
+    Args:
+        message: The new user message
+        
+    Returns:
+        True if a speculative search was started
+    """
+    if not settings["SPECULATIVE_SEARCH_ENABLED"]:
+        return False
+    session_id = current_search_session()
+    results = search_results_cache.get(session_id)
+    if results is None:
+        return False
+    
+    prediction = predict_search(results, message)
+    if prediction is None:
+        return False
+    kind, arguments = prediction
+    
+    if kind == "flights":
+        params, errors = validate_flights_input(FlightsInput(**arguments))
+        search_params = params.model_dump()
+    else:
+        params, errors = validate_hotels_input(HotelsInput(**arguments))
+        search_params = _hotels_search_params(params)
+    if errors:
+        return False
+    
+    return speculative_searches.start(
+        session_id, search_key(kind, search_params), _execute_search, kind, search_params
+    )
+
+
+# ------------------------------------------------------------------
+# ➕ More Results Tool
+# ------------------------------------------------------------------
+
+def _fetch_next_page(results: SearchResults) -> None:
+    """Append the next upstream page of a cached search (caller holds `results.lock`)."""
+    # Only the next page, with the original search parameters
+    items, page_token = _search_hotels(
+        {**results.search_params, "next_page_token": results.next_page_token}
+    )
+    results.extend(items, page_token)
+    metrics.counter("search_cache.upstream_pages").inc()
+
+
+def next_results_page(session_id: Optional[str], count: int) -> Tuple[Optional[str], List[Dict] | Dict]:
+    """
+    Next slice of the session's last search.
+    
+    Served from the cached result set; when that is used up and SerpAPI
+    returned a next-page token, only the next upstream page is fetched.
+    
+    Args:
+        session_id: Chat session the search belongs to
+        count: Number of results to return
+        
+    Returns:
+        Tuple of (result kind or None, results list or error dict)
+    """
+    results = search_results_cache.get(session_id)
+    if results is None:
+        return None, {
+            "error": "NO_PREVIOUS_SEARCH",
+            "details": ["There are no recent search results for this conversation; run a new search."],
+        }
+    
+    with results.lock:
+        # A refined order only covers what is cached; the search's own order can continue upstream
+        if results.view is None and results.remaining() < count and results.next_page_token:
+            _fetch_next_page(results)
+        else:
+            metrics.counter("search_cache.local_pages").inc()
+        
+        page = results.take(count)
+    
+    if not page:
+        if results.view is not None:
+            details = [f"All {len(results.view)} matching {results.kind} have been shown; refine differently or run a new search."]
+        else:
+            details = [f"All {len(results.items)} {results.kind} from the last search have been shown."]
+        return results.kind, {"error": "NO_MORE_RESULTS", "details": details}
+    return results.kind, page
+
+
+@tool(
+    args_schema=MoreResultsInput,
+    description="Show more results of the last search (e.g. 'show more'). Use instead of repeating the search.",
+)
+def more_results(count: int = 5) -> List[Dict] | Dict:
+    _, page = next_results_page(current_search_session(), count)
+    return page
+
+
+
+# ------------------------------------------------------------------
+# 🔎 Refine Results Tool
+# ------------------------------------------------------------------
+
+# Refinement argument -> (result kind, column) it applies to
+_MAX_FILTERS = {"max_price": (None, "price"), "max_stops": ("flights", "stops")}
+_MIN_FILTERS = {"min_rating": ("hotels", "rating"), "min_hotel_class": ("hotels", "hotel_class")}
+_SORT_DESCENDING = {"rating", "hotel_class"}
+
+
+def _needs_new_search(detail: str) -> Dict:
+    return {"error": "NEEDS_NEW_SEARCH", "details": [detail]}
+
+
+def refine_search_results(
+    session_id: Optional[str], refinement: RefineResultsInput
+) -> Tuple[Optional[str], List[Dict] | Dict]:
+    """
+    Filter and re-sort the session's last search results in-process.
+    
+    Bounds apply to the whole cached result set (not to an earlier
+    refinement). When fewer than `count` results match and SerpAPI has a
+    next page, that one page is fetched and the refinement repeated; a
+    NEEDS_NEW_SEARCH error tells the agent the cache cannot answer it.
+    
+    Args:
+        session_id: Chat session the search belongs to
+        refinement: Bounds, sort order and number of results
+        
+    Returns:
+        Tuple of (result kind or None, results list or error dict)
+    """
+    results = search_results_cache.get(session_id)
+    if results is None:
+        metrics.counter("search_cache.refine_misses").inc()
+        return None, _needs_new_search("There are no recent search results for this conversation; run a new search.")
+    
+    requested = refinement.model_dump(exclude_none=True)
+    max_values, min_values = {}, {}
+    for filters, bounds in ((_MAX_FILTERS, max_values), (_MIN_FILTERS, min_values)):
+        for name, (kind, column) in filters.items():
+            if name not in requested:
+                continue
+            if kind not in (None, results.kind):
+                metrics.counter("search_cache.refine_misses").inc()
+                return results.kind, _needs_new_search(
+                    f"'{name}' applies to {kind}, but the last search was for {results.kind}; search {kind} first."
+                )
+            bounds[column] = requested[name]
+    
+    sort_by = refinement.sort_by
+    if sort_by is not None and sort_by not in results.columns:
+        metrics.counter("search_cache.refine_misses").inc()
+        return results.kind, _needs_new_search(f"{results.kind.capitalize()} cannot be sorted by {sort_by}.")
+    
+    with results.lock:
+        view = results.select(max_values, min_values, sort_by, descending=sort_by in _SORT_DESCENDING)
+        if len(view) < refinement.count and results.next_page_token:
+            _fetch_next_page(results)
+            view = results.select(max_values, min_values, sort_by, descending=sort_by in _SORT_DESCENDING)
+        
+        if not view:
+            metrics.counter("search_cache.refine_misses").inc()
+            return results.kind, _needs_new_search(
+                f"None of the {len(results.items)} cached {results.kind} match; run a new search with these requirements."
+            )
+        
+        # "Show more" continues through the refined order
+        results.view = view
+        results.shown = 0
+        page = results.take(refinement.count)
+    
+    metrics.counter("search_cache.refinements").inc()
+    return results.kind, page
+
+
+@tool(
+    args_schema=RefineResultsInput,
+    description=(
+        "Filter or re-sort the last search's results (e.g. non-stop, under ₹8000, 4-star+, by rating) "
+        "without a new search. Bounds apply to the whole last search; repeat earlier ones to keep them. "
+        "Search again only if this returns NEEDS_NEW_SEARCH."
+    ),
+)
+def refine_results(
+    max_price: Optional[float] = None,
+    max_stops: Optional[int] = None,
+    min_rating: Optional[float] = None,
+    min_hotel_class: Optional[int] = None,
+    sort_by: Optional[str] = None,
+    count: int = 5,
+) -> List[Dict] | Dict:
+    refinement = RefineResultsInput(
+        max_price=max_price,
+        max_stops=max_stops,
+        min_rating=min_rating,
+        min_hotel_class=min_hotel_class,
+        sort_by=sort_by,
+        count=count,
+    )
+    _, page = refine_search_results(current_search_session(), refinement)
+    return page
+
+
+
+# ------------------------------------------------------------------
+# 🔔 Watch Price Tool
+# ------------------------------------------------------------------
+
+@tool(
+    args_schema=WatchPriceInput,
+    description="Notify the user when the last search's price drops (or reaches target_price), if they ask for it.",
+)
+def watch_price(target_price: Optional[float] = None) -> Dict:
+    from src.database import get_db_session
+    from src.services.price_watch import add_watch
+    
+    session_id = current_search_session()
+    results = search_results_cache.get(session_id)
+    if results is None:
+        return {
+            "error": "NO_PREVIOUS_SEARCH",
+            "details": ["Run the flights or hotels search to watch first."],
+        }
+    
+    session = get_db_session()
+    try:
+        watch = add_watch(
+            session,
+            UUID(session_id),
+            results.kind,
+            results.search_params,
+            target_price=target_price,
+            items=results.items,
+        )
+    except TravelAgentError as e:
+        return {"error": e.error_code, "details": [e.message]}
+    finally:
+        session.close()
+    
+    return {
+        "watch_id": watch.id,
+        "kind": results.kind,
+        "target_price": target_price,
+        "status": "watching",
+    }
@@ -0,0 +1,156 @@
+# 📁 tools/validators.py
+# Pre-flight validation of tool arguments before calling SerpAPI
+
+from datetime import date
+from typing import List, Optional, Tuple
+
+from src.models import FlightsInput, HotelsInput
+from src.tools.airports import get_airport_index
+
+
+MAX_FLIGHT_PASSENGERS = 9  # Google Flights limit per booking
+
+
+# ------------------------------------------------------------------
+# 🧰 Helpers
+# ------------------------------------------------------------------
+
+def _parse_date(value: str, field: str, errors: List[str]) -> Optional[date]:
+    """Parse a YYYY-MM-DD date, recording an error if it is malformed."""
+    try:
+        return date.fromisoformat(value.strip())
+    except (ValueError, AttributeError):
+        errors.append(f"{field} '{value}' is not a valid date in YYYY-MM-DD format.")
+        return None
+
+
+def _check_not_past(value: Optional[date], field: str, today: date, errors: List[str]) -> None:
+    if value and value < today:
+        errors.append(f"{field} {value.isoformat()} is in the past (today is {today.isoformat()}).")
+
+
+def _resolve_airport(value: str, field: str, errors: List[str]) -> str:
+    """Resolve a code or city name to an IATA code, recording an error if impossible."""
+    index = get_airport_index()
+    code = index.resolve(value)
+    if code:
+        return code
+
+    # Unknown to the bundled dataset but shaped like a code: let SerpAPI decide
+    if len(value.strip()) == 3 and value.strip().isalpha():
+        return value.strip().upper()
+
+    candidates = index.search(value)
+    if candidates:
+        options = ", ".join(f"{a.iata} ({a.name}, {a.city})" for a in candidates)
+        errors.append(f"{field} '{value}' is ambiguous. Did you mean one of: {options}?")
+    else:
+        errors.append(f"{field} '{value}' is not a known airport or city.")
+    return value
+
+
+# ------------------------------------------------------------------
+# ✈️ Flights
+# ------------------------------------------------------------------
+
+def validate_flights_input(
+    params: FlightsInput,
+    today: Optional[date] = None,
+) -> Tuple[FlightsInput, List[str]]:
+    """
+    Validate and normalize flight search parameters.
+
+    City or airport names are resolved to IATA codes via the offline
+    airport index, so the search can go ahead without another LLM turn.
+
+    Args:
+        params: Flight search parameters from the LLM
+        today: Reference date (defaults to today)
+
+    Returns:
+        Tuple of (normalized params, list of error messages)
+    """
+    today = today or date.today()
+    errors: List[str] = []
+
+    departure = _resolve_airport(params.departure_airport, "departure_airport", errors)
+    arrival = _resolve_airport(params.arrival_airport, "arrival_airport", errors)
+    if not errors and departure == arrival:
+        errors.append(f"departure_airport and arrival_airport are both {departure}.")
+
+    outbound = _parse_date(params.outbound_date, "outbound_date", errors)
+    inbound = _parse_date(params.return_date, "return_date", errors)
+    _check_not_past(outbound, "outbound_date", today, errors)
+    if outbound and inbound and inbound < outbound:
+        errors.append(
+            f"return_date {inbound.isoformat()} is before outbound_date {outbound.isoformat()}."
+        )
+
+    if params.adults < 1:
+        errors.append("At least one adult passenger is required.")
+    if min(params.children, params.infants_in_seat, params.infants_on_lap) < 0:
+        errors.append("Passenger counts cannot be negative.")
+    if params.infants_on_lap > params.adults:
+        errors.append("Each infant on lap must travel with a separate adult.")
+
+    total = params.adults + params.children + params.infants_in_seat + params.infants_on_lap
+    if total > MAX_FLIGHT_PASSENGERS:
+        errors.append(f"A single search supports at most {MAX_FLIGHT_PASSENGERS} passengers (got {total}).")
+
+    normalized = params.model_copy(update={
+        "departure_airport": departure,
+        "arrival_airport": arrival,
+    })
+    return normalized, errors
+
+
+# ------------------------------------------------------------------
+# 🏨 Hotels
+# ------------------------------------------------------------------
+
+def validate_hotels_input(
+    params: HotelsInput,
+    today: Optional[date] = None,
+) -> Tuple[HotelsInput, List[str]]:
+    """
+    Validate hotel search parameters.
+
+    Args:
+        params: Hotel search parameters from the LLM
+        today: Reference date (defaults to today)
+
+    Returns:
+        Tuple of (params, list of error messages)
+    """
+    today = today or date.today()
+    errors: List[str] = []
+
+    if not params.q.strip():
+        errors.append("q (the city or location to search) is empty.")
+
+    check_in = _parse_date(params.check_in_date, "check_in_date", errors)
+    check_out = _parse_date(params.check_out_date, "check_out_date", errors)
+    _check_not_past(check_in, "check_in_date", today, errors)
+    if check_in and check_out and check_out <= check_in:
+        errors.append(
+            f"check_out_date {check_out.isoformat()} must be after check_in_date {check_in.isoformat()}."
+        )
+
+    if params.adults < 1:
+        errors.append("At least one adult guest is required.")
+    if params.children < 0:
+        errors.append("Number of children cannot be negative.")
+    if params.rooms < 1:
+        errors.append("At least one room is required.")
+    elif params.rooms > params.adults:
+        errors.append(f"{params.rooms} rooms requested for only {params.adults} adult(s).")
+
+    return params, errors
+
+
+def validation_error(errors: List[str]) -> dict:
+    """Build the tool result returned to the LLM when validation fails."""
+    return {
+        "error": "INVALID_SEARCH_PARAMS",
+        "details": errors,
+    }
@@ -1,3 +1,4 @@
 from .pinecone import get_pinecone_index
+from .memory import get_memory_store
 
-__all__ = ["get_pinecone_index"]
\ No newline at end of file
+__all__ = ["get_pinecone_index", "get_memory_store"]
\ No newline at end of file
@@ -0,0 +1,184 @@
+# vectorstore/memory.py
+# Per-session fact stores for long-term memory
+
+import hashlib
+import heapq
+import operator
+from array import array
+from typing import Any, Dict, List, Optional, Protocol, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+
+from src.core import settings
+from src.database import get_db_session
+from src.models.psql import MemoryFact
+
+
+def fact_key(fact: str) -> str:
+    """Stable id of a fact: SHA-256 of its case- and whitespace-normalized text."""
+    return hashlib.sha256(" ".join(fact.lower().split()).encode("utf-8")).hexdigest()
+
+
+def _dot(a: Sequence[float], b: Sequence[float]) -> float:
+    return sum(map(operator.mul, a, b))
+
+
+class MemoryStore(Protocol):
+    """Stores facts with unit-length embeddings; `search` ranks by cosine similarity."""
+
+    def add(self, session_id: UUID, facts: List[str], vectors: List[List[float]]) -> int: ...
+
+    def has_facts(self, session_id: UUID) -> bool: ...
+
+    def search(self, session_id: UUID, vector: List[float], top_k: int, min_score: float) -> List[Tuple[str, float]]: ...
+
+
+# ------------------------------------------------------------------
+# 🗄️ Local backend (application database)
+# ------------------------------------------------------------------
+
+class LocalMemoryStore:
+    """
+    Facts in the `memory_facts` table, ranked in process.
+
+    A session holds at most `max_facts` facts (oldest dropped first), so a
+    search scores a bounded number of short vectors.
+    """
+
+    def __init__(self, max_facts: int):
+        self._max_facts = max_facts
+
+    def add(self, session_id: UUID, facts: List[str], vectors: List[List[float]]) -> int:
+        rows: Dict[str, Dict[str, Any]] = {}
+        for fact, vector in zip(facts, vectors):
+            key = fact_key(fact)
+            rows.setdefault(key, {
+                "session_id": session_id,
+                "fact_key": key,
+                "text": fact,
+                "embedding": array("f", vector).tobytes(),
+            })
+        if not rows:
+            return 0
+
+        session = get_db_session()
+        try:
+            # Facts already stored (also by a concurrent extraction) are skipped
+            added = session.execute(
+                insert(MemoryFact).values(list(rows.values())).on_conflict_do_nothing(
+                    index_elements=[MemoryFact.session_id, MemoryFact.fact_key]
+                )
+            ).rowcount
+
+            # Keep the newest max_facts
+            overflow = session.execute(
+                select(MemoryFact.id)
+                .where(MemoryFact.session_id == session_id)
+                .order_by(MemoryFact.id.desc())
+                .offset(self._max_facts)
+            ).scalars().all()
+            if overflow:
+                session.execute(delete(MemoryFact).where(MemoryFact.id.in_(overflow)))
+            session.commit()
+            return added
+        finally:
+            session.close()
+
+    def has_facts(self, session_id: UUID) -> bool:
+        session = get_db_session()
+        try:
+            return session.execute(
+                select(MemoryFact.id).where(MemoryFact.session_id == session_id).limit(1)
+            ).first() is not None
+        finally:
+            session.close()
+
+    def search(self, session_id: UUID, vector: List[float], top_k: int, min_score: float) -> List[Tuple[str, float]]:
+        session = get_db_session()
+        try:
+            rows = session.execute(
+                select(MemoryFact.text, MemoryFact.embedding).where(MemoryFact.session_id == session_id)
+            ).all()
+        finally:
+            session.close()
+
+        scored = []
+        for row in rows:
+            stored = array("f")
+            stored.frombytes(row.embedding)
+            if len(stored) != len(vector):
+                # Written with other MEMORY_EMBEDDING_DIMENSIONS
+                continue
+            score = _dot(stored, vector)
+            if score >= min_score:
+                scored.append((row.text, score))
+        return heapq.nlargest(top_k, scored, key=operator.itemgetter(1))
+
+
+# ------------------------------------------------------------------
+# 🌲 Pinecone backend
+# ------------------------------------------------------------------
+
+class PineconeMemoryStore:
+    """
+    Facts in a Pinecone index, one namespace per session.
+
+    Vector ids are fact keys, so storing a fact again overwrites it. The
+    per-session cap is not enforced here.
+    """
+
+    def __init__(self, index):
+        self._index = index
+
+    def add(self, session_id: UUID, facts: List[str], vectors: List[List[float]]) -> int:
+        self._index.upsert(
+            vectors=[
+                {"id": fact_key(fact), "values": vector, "metadata": {"text": fact}}
+                for fact, vector in zip(facts, vectors)
+            ],
+            namespace=str(session_id),
+        )
+        return len(facts)
+
+    def has_facts(self, session_id: UUID) -> bool:
+        # Checking would cost a request of its own; the query answers it
+        return True
+
+    def search(self, session_id: UUID, vector: List[float], top_k: int, min_score: float) -> List[Tuple[str, float]]:
+        result = self._index.query(
+            vector=vector,
+            top_k=top_k,
+            namespace=str(session_id),
+            include_metadata=True,
+        )
+        return [
+            (match.metadata["text"], match.score)
+            for match in result.matches
+            if match.score >= min_score and match.metadata
+        ]
+
+
+# ------------------------------------------------------------------
+# 🧠 Lazy singleton
+# ------------------------------------------------------------------
+
+_MEMORY_STORE: Optional[MemoryStore] = None
+
+
+def get_memory_store() -> MemoryStore:
+    """Get the store selected by MEMORY_BACKEND ("local" or "pinecone")."""
+    global _MEMORY_STORE
+    if _MEMORY_STORE is None:
+        backend = settings["MEMORY_BACKEND"]
+        if backend == "local":
+            _MEMORY_STORE = LocalMemoryStore(settings["MEMORY_MAX_FACTS_PER_SESSION"])
+        elif backend == "pinecone":
+            from src.vectorstore.pinecone import get_pinecone_index
+            _MEMORY_STORE = PineconeMemoryStore(
+                get_pinecone_index(settings["MEMORY_PINECONE_INDEX"], dimension=settings["MEMORY_EMBEDDING_DIMENSIONS"])
+            )
+        else:
+            raise ValueError(f"Unknown MEMORY_BACKEND '{backend}' (use local or pinecone)")
+    return _MEMORY_STORE
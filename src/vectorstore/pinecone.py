@@ -11,10 +11,10 @@ logger = logging.getLogger(__name__)
 EMBEDDING_DIMENSION = 1536  # text-embedding-3-small
 
 
-def get_pinecone_index(index_name: str):
+def get_pinecone_index(index_name: str, dimension: int = EMBEDDING_DIMENSION):
     """
     Connects to Pinecone and returns an index.
-    If the index does not exist, it will be created.
+    If the index does not exist, it will be created with `dimension`.
     """
 
     logger.info("Connecting to Pinecone...")
@@ -29,7 +29,7 @@ def get_pinecone_index(index_name: str):
 
         pc.create_index(
             name=index_name,
-            dimension=EMBEDDING_DIMENSION,
+            dimension=dimension,
             metric="cosine",
             spec={
                 "serverless": {
@@ -0,0 +1,57 @@
+# 📁 tests/test_llm_hedging.py
+# Hedged LLM requests: the first success answers
+
+import itertools
+import threading
+import time
+import unittest
+from unittest import mock
+
+from src.core import settings
+from src.core.metrics import metrics
+from src.llms.resilience import invoke_llm
+
+HEDGE_DELAY = 0.2
+HEDGE_LATENCY = 0.1
+PRIMARY_LATENCY = 3.0
+
+
+class SlowThenFastLLM:
+    """First call (the primary) takes PRIMARY_LATENCY, later ones HEDGE_LATENCY."""
+
+    def __init__(self):
+        self._calls = itertools.count()
+        self.release = threading.Event()
+
+    def invoke(self, messages, timeout=None, **kwargs):
+        if next(self._calls) == 0:
+            self.release.wait(PRIMARY_LATENCY)
+            return "primary"
+        time.sleep(HEDGE_LATENCY)
+        return "hedge"
+
+
+class HedgingTest(unittest.TestCase):
+    def test_fast_hedge_answers_before_slow_primary(self):
+        llm = SlowThenFastLLM()
+        with mock.patch.dict(settings, {"LLM_HEDGE_MIN_DELAY_MS": HEDGE_DELAY * 1000}):
+            started = time.perf_counter()
+            response = invoke_llm(llm, [], name="test_hedge", hedge=True)
+            elapsed = time.perf_counter() - started
+
+        self.assertEqual(response, "hedge")
+        self.assertAlmostEqual(elapsed, HEDGE_DELAY + HEDGE_LATENCY, delta=0.15)
+        self.assertEqual(metrics.counter("llm.test_hedge.hedge_wins").value, 1)
+
+        # The losing primary reports the latency the hedge saved when it ends
+        llm.release.set()
+        saved = metrics.histogram("llm.test_hedge.hedge_saved_seconds")
+        for _ in range(50):
+            if saved.percentile(50) is not None:
+                break
+            time.sleep(0.01)
+        self.assertIsNotNone(saved.percentile(50))
+
+
+if __name__ == "__main__":
+    unittest.main()
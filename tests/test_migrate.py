@@ -0,0 +1,43 @@
+# 📁 tests/test_migrate.py
+# Smoke test for the schema deploy step (python -m src.database.migrate)
+
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from sqlalchemy import create_engine, inspect
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+
+class MigrateTest(unittest.TestCase):
+    def test_migrate_imports_first(self):
+        # A fresh interpreter, so nothing else has imported src.core yet
+        result = subprocess.run(
+            [sys.executable, "-c", "import src.database.migrate"],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+    def test_create_tables_is_idempotent(self):
+        from src.database.migrate import create_tables
+        from src.models.psql import Base
+
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = create_engine(f"sqlite:///{tmp}/scratch.db")
+            try:
+                create_tables(engine)
+                create_tables(engine)
+                tables = set(inspect(engine).get_table_names())
+            finally:
+                engine.dispose()
+
+        self.assertTrue(set(Base.metadata.tables) <= tables)
+
+
+if __name__ == "__main__":
+    unittest.main()